@@ -0,0 +1,211 @@
+import asyncio
+import os
+import re
+from datetime import datetime, time
+from dotenv import load_dotenv
+from api.cache import ResultCache
+
+# Load environment variables
+load_dotenv()
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SQL_DIR = os.path.join(project_root, 'sql')
+
+# Queries in sql/*.sql are introduced by headers such as "-- 1. Total Revenue"
+QUERY_HEADER = re.compile(r'^--\s*\d+\.\s*(.+?)\s*$', re.MULTILINE)
+
+# Date filtering shadows the tables with CTEs of the same name, restricted to
+# orders purchased in the requested range, so the library queries run unchanged
+DATE_RANGE_CTES = """
+orders AS (
+    SELECT * FROM public.orders
+    WHERE (CAST(:start_date AS timestamp) IS NULL OR order_purchase_timestamp >= CAST(:start_date AS timestamp))
+      AND (CAST(:end_date AS timestamp) IS NULL OR order_purchase_timestamp < CAST(:end_date AS timestamp))
+),
+order_items AS (
+    SELECT * FROM public.order_items WHERE order_id IN (SELECT order_id FROM orders)
+),
+order_payments AS (
+    SELECT * FROM public.order_payments WHERE order_id IN (SELECT order_id FROM orders)
+),
+order_reviews AS (
+    SELECT * FROM public.order_reviews WHERE order_id IN (SELECT order_id FROM orders)
+),
+customers AS (
+    SELECT * FROM public.customers WHERE customer_id IN (SELECT customer_id FROM orders)
+)"""
+
+# Tables the date range CTEs shadow; a query reading none of them cannot be filtered by them
+DATE_RANGE_TABLES = {'orders', 'order_items', 'order_payments', 'order_reviews', 'customers'}
+
+# Tables read by a query, for cache invalidation
+TABLE_REFERENCE = re.compile(r'\b(?:FROM|JOIN)\s+(?:public\.)?([a-z_]+)', re.IGNORECASE)
+
+# The rollup tables are derived from these and change whenever they are loaded
+ROLLUP_SOURCES = {'customers', 'orders', 'order_items', 'order_payments', 'order_reviews', 'products', 'sellers'}
+
+def source_tables(sql):
+    """
+    Base tables a query depends on, with rollup tables resolved to their sources.
+    """
+    tables = set()
+    for table in TABLE_REFERENCE.findall(sql):
+        table = table.lower()
+        if table.startswith('rollup_'):
+            tables |= ROLLUP_SOURCES
+        else:
+            tables.add(table)
+    return tables
+
+def supports_date_range(sql):
+    """
+    Whether a query can be restricted to a purchase date range: it takes
+    :start_date and :end_date itself, or reads only tables the date range
+    CTEs shadow or filter through them. The rollup tables are not shadowed.
+    """
+    if ':start_date' in sql:
+        return True
+    tables = {table.lower() for table in TABLE_REFERENCE.findall(sql)}
+    return bool(tables & DATE_RANGE_TABLES) and not any(table.startswith('rollup_') for table in tables)
+
+class DateRangeNotSupported(ValueError):
+    """
+    Raised when a date range is given for a query that cannot apply it.
+    """
+
+def slugify(title):
+    return re.sub(r'[^a-z0-9]+', '_', title.lower()).strip('_')
+
+def parse_queries(sql):
+    """
+    Split a query file into its numbered queries.
+
+    Arguments:
+        sql (str): Contents of a sql/*.sql file.
+
+    Returns:
+        dict: Query SQL keyed by the slug of its header title, in file order.
+    """
+    queries = {}
+    headers = list(QUERY_HEADER.finditer(sql))
+    for i, header in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(sql)
+        body = sql[header.end():end].strip().rstrip(';').strip()
+        if body:
+            queries[slugify(header.group(1))] = body
+    return queries
+
+def load_library(sql_dir=SQL_DIR):
+    """
+    Load every query file in `sql_dir`, keyed by file name without extension.
+    Files without queries are skipped.
+    """
+    library = {}
+    for name in sorted(os.listdir(sql_dir)):
+        if not name.endswith('.sql'):
+            continue
+        with open(os.path.join(sql_dir, name)) as f:
+            queries = parse_queries(f.read())
+        if queries:
+            library[name[:-4]] = queries
+    return library
+
+def with_date_range(sql):
+    """
+    Restrict a library query to orders purchased between :start_date and :end_date.
+    """
+    if re.match(r'\s*WITH\b', sql, re.IGNORECASE):
+        return re.sub(r'^\s*WITH\b', f"WITH {DATE_RANGE_CTES},", sql, count=1, flags=re.IGNORECASE)
+    return f"WITH {DATE_RANGE_CTES}\n{sql}"
+
+class AnalyticsService:
+    """
+    Runs the sql/ query library against the database and returns only the
+    aggregated rows, so clients no longer download whole tables to compute
+    KPIs themselves. Results are cached per query and parameters, tagged
+    with the tables they read, until a load touches one of those tables.
+    Queries run on the API's async connection pool (api.db.Database).
+    """
+    def __init__(self, db, sql_dir=SQL_DIR, cache=None):
+        self.db = db
+        self.library = load_library(sql_dir)
+        self.tables = {
+            group: {name: source_tables(sql) for name, sql in queries.items()}
+            for group, queries in self.library.items()
+        }
+        self.date_ranged = {
+            group: {name for name, sql in queries.items() if supports_date_range(sql)}
+            for group, queries in self.library.items()
+        }
+        self.cache = cache or ResultCache()
+
+    def catalog(self):
+        return {group: list(queries) for group, queries in self.library.items()}
+
+    async def run(self, group, name, start_date=None, end_date=None, limit=None):
+        """
+        Execute one library query.
+
+        Arguments:
+            group (str): Query file name, e.g. "executive_overview".
+            name (str): Query slug within the file, e.g. "total_revenue".
+            start_date (date): Only include orders purchased on or after this date.
+            end_date (date): Only include orders purchased before this date.
+            limit (int): Maximum number of rows to return.
+
+        Returns:
+            list: Result rows as dictionaries.
+
+        Raises:
+            DateRangeNotSupported: A date range was given for a query that cannot apply it.
+        """
+        if (start_date or end_date) and name not in self.date_ranged[group]:
+            raise DateRangeNotSupported(f"{group}/{name} cannot be restricted to a date range")
+        tags = self.tables[group][name]
+        if start_date or end_date:
+            # The date range filters through the orders table
+            tags = tags | {'orders'}
+        key = (group, name, start_date, end_date, limit)
+        found, rows = self.cache.get(key)
+        if not found:
+            rows = await self._execute(group, name, start_date, end_date, limit)
+            self.cache.set(key, rows, tags)
+        return rows
+
+    async def _execute(self, group, name, start_date, end_date, limit):
+        sql = self.library[group][name]
+        params = {}
+        if ':start_date' in sql:
+            # Queries that take the range themselves, e.g. those over the rollup tables
+            params.update(start_date=start_date, end_date=end_date)
+        elif start_date or end_date:
+            sql = with_date_range(sql)
+            # Bound as timestamps: asyncpg does not coerce dates
+            params.update(
+                start_date=datetime.combine(start_date, time()) if start_date else None,
+                end_date=datetime.combine(end_date, time()) if end_date else None
+            )
+        if limit is not None:
+            sql = f"SELECT * FROM (\n{sql}\n) AS result LIMIT :limit"
+            params['limit'] = limit
+
+        return await self.db.fetch_all(sql, params)
+
+    async def run_group(self, group, start_date=None, end_date=None, limit=None):
+        """
+        Execute every query of a file concurrently, returning rows keyed by query slug.
+        """
+        names = list(self.library[group])
+        if start_date or end_date:
+            # Checked up front, so no query runs for a request that is rejected
+            unsupported = [name for name in names if name not in self.date_ranged[group]]
+            if unsupported:
+                raise DateRangeNotSupported(f"{group} queries cannot be restricted to a date range: {', '.join(unsupported)}")
+        results = await asyncio.gather(*(self.run(group, name, start_date, end_date, limit) for name in names))
+        return dict(zip(names, results))
+
+    def invalidate(self, tables):
+        """
+        Drop cached results that read any of `tables`.
+        """
+        return self.cache.invalidate(tables)
@@ -0,0 +1,110 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+class ResultCache:
+    """
+    In-process TTL/LRU cache for query results.
+
+    Entries expire after `ttl` seconds, the least recently used entries are
+    evicted once either `max_entries` or `max_bytes` is exceeded, and every
+    entry carries tags (the tables it was computed from) so a load can drop
+    just the results it made stale. Sizes are estimated from the JSON
+    encoding of the value, which is what the API sends anyway.
+    """
+    def __init__(self, ttl=300, max_entries=512, max_bytes=64 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (expires_at, size, tags, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        """
+        Returns:
+            tuple: (found, value)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            if entry[0] < time.monotonic():
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[3]
+
+    def set(self, key, value, tags=()):
+        size = len(json.dumps(value, default=str))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl, size, frozenset(tags), value)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute, tags=()):
+        found, value = self.get(key)
+        if found:
+            return value
+        value = compute()
+        self.set(key, value, tags)
+        return value
+
+    def invalidate(self, tags):
+        """
+        Drop every entry computed from any of `tags`.
+
+        Returns:
+            int: Number of entries dropped.
+        """
+        tags = set(tags)
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry[2] & tags]
+            for key in stale:
+                self._drop(key)
+            self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+
+    def _drop(self, key):
+        # Called with self._lock held
+        entry = self._entries.pop(key)
+        self._bytes -= entry[1]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
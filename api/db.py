@@ -0,0 +1,49 @@
+import os
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+
+def async_url(database_url):
+    """
+    Point a postgres URL (as used by the sync code) at the asyncpg driver.
+    """
+    url = make_url(database_url)
+    if url.drivername in ('postgres', 'postgresql') or url.drivername.startswith('postgresql+'):
+        url = url.set(drivername='postgresql+asyncpg')
+        # libpq's sslmode (common in Supabase connection strings) is spelled ssl for asyncpg
+        if 'sslmode' in url.query:
+            url = url.update_query_dict({'ssl': url.query['sslmode']}).difference_update_query(['sslmode'])
+    return url
+
+class Database:
+    """
+    Pooled async connections for the API's read endpoints.
+
+    Created once at startup and disposed at shutdown, so requests borrow an
+    open connection from the pool instead of connecting per call, and await
+    their queries instead of blocking the event loop.
+    """
+    def __init__(self, database_url=None, pool_size=5, max_overflow=5, pool_timeout=30):
+        self.engine = create_async_engine(
+            async_url(database_url or os.environ['DATABASE_URL']),
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_pre_ping=True
+        )
+
+    async def connect(self):
+        # Open one connection up front so a bad URL fails at startup, not on the first request
+        async with self.engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def fetch_all(self, sql, params=None):
+        """
+        Run a query and return its rows as dictionaries.
+        """
+        async with self.engine.connect() as conn:
+            result = await conn.execute(text(sql), params or {})
+            return [dict(row) for row in result.mappings()]
+
+    async def dispose(self):
+        await self.engine.dispose()
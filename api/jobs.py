@@ -0,0 +1,384 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from etl_core.utils import log_message, error_message, success_message
+from instrumentation import counter, histogram
+
+JOBS_FINISHED = counter('api_jobs_total', 'Finished jobs, per type and final state.')
+JOB_SECONDS = histogram('api_job_seconds', 'Job run time, per type.')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    params TEXT NOT NULL,
+    dedupe_key TEXT NOT NULL,
+    state TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    error TEXT,
+    progress TEXT,
+    owner TEXT,
+    heartbeat_at TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_state_created ON jobs (state, created_at);
+CREATE INDEX IF NOT EXISTS jobs_dedupe ON jobs (dedupe_key, state);
+"""
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+def _ago(seconds):
+    return (datetime.now(timezone.utc) - timedelta(seconds=seconds)).isoformat()
+
+@contextmanager
+def connect(db_path):
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        yield conn
+    finally:
+        conn.close()
+
+def write_progress(db_path, job_id, progress):
+    with connect(db_path) as conn:
+        conn.execute("UPDATE jobs SET progress = ? WHERE id = ?", (json.dumps(progress), job_id))
+
+def parse_concurrency(spec):
+    """
+    Parse a per-type concurrency spec such as "etl=1,order_gen=2".
+    """
+    caps = {}
+    for part in (spec or '').split(','):
+        if '=' in part:
+            job_type, cap = part.split('=', 1)
+            caps[job_type.strip()] = int(cap)
+    return caps
+
+class JobContext:
+    """
+    Progress handle passed to a running job as its `job` argument.
+
+    Records rows processed per table and wall-clock seconds per stage, and
+    persists both to the job's row so /jobs can report them while the job runs.
+    Safe to use from the job's helper threads, and picklable so a job can
+    hand it to a worker process that reports progress directly.
+    """
+    def __init__(self, db_path, job_id):
+        self.db_path = db_path
+        self.job_id = job_id
+        self.rows = {}
+        self.stages = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _save(self):
+        write_progress(self.db_path, self.job_id, {'rows': dict(self.rows), 'stages': dict(self.stages)})
+
+    def add_rows(self, table, rows):
+        with self._lock:
+            self.rows[table] = self.rows.get(table, 0) + rows
+            self._save()
+
+    def add_stage_time(self, name, seconds):
+        with self._lock:
+            self.stages[name] = round(self.stages.get(name, 0.0) + seconds, 4)
+            self._save()
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Time a block of work; repeated stages accumulate.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage_time(name, time.perf_counter() - start)
+
+    def timed_iter(self, name, iterable):
+        """
+        Yield from `iterable`, charging the time spent producing each item to `name`.
+        """
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.add_stage_time(name, time.perf_counter() - start)
+            yield item
+
+class JobQueue:
+    """
+    SQLite-backed job queue drained by a pool of worker threads.
+
+    Jobs survive restarts: anything still pending, or interrupted while
+    running, is picked up again. Each running job is owned by the queue that
+    claimed it, which refreshes its heartbeat every `heartbeat_seconds`;
+    only jobs whose heartbeat is older than `stale_after` seconds are taken
+    to be interrupted and requeued, so several processes (or an overlapping
+    restart) can share one database without running a job twice.
+    Submitting a job identical to one that is still pending returns the
+    pending job instead of queueing a duplicate, and each job type is
+    limited to a number of concurrently running jobs per queue.
+    """
+    def __init__(self, db_path, handlers, workers=2, concurrency=None, on_success=None,
+                 heartbeat_seconds=10, stale_after=60):
+        self.db_path = db_path
+        self.handlers = handlers
+        self.on_success = on_success
+        self.workers = workers
+        self.concurrency = concurrency or {}
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stale_after = stale_after
+        # Process ID plus a per-boot token, as PIDs are reused across restarts
+        self.owner = f"{os.getpid()}:{uuid.uuid4().hex[:12]}"
+        self.running = {job_type: 0 for job_type in handlers}
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._threads = []
+        self._wake = threading.Event()
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            # Queues created before progress tracking or ownership lack the columns
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column in ('progress', 'owner', 'heartbeat_at'):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} TEXT")
+
+    def _connect(self):
+        return connect(self.db_path)
+
+    def submit(self, job_type, params):
+        """
+        Queue a job, or return the identical job that is already pending.
+
+        Returns:
+            tuple: (job_id, deduplicated)
+        """
+        if job_type not in self.handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+        params_json = json.dumps(params, sort_keys=True)
+        dedupe_key = f"{job_type}:{params_json}"
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE dedupe_key = ? AND state = 'pending' ORDER BY created_at LIMIT 1",
+                (dedupe_key,)
+            ).fetchone()
+            if row:
+                conn.execute("COMMIT")
+                return row['id'], True
+
+            job_id = str(uuid.uuid4())
+            conn.execute(
+                "INSERT INTO jobs (id, type, params, dedupe_key, state, created_at) VALUES (?, ?, ?, ?, 'pending', ?)",
+                (job_id, job_type, params_json, dedupe_key, _now())
+            )
+            conn.execute("COMMIT")
+
+        with self._cond:
+            self._cond.notify()
+        return job_id, False
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _describe(row) if row else None
+
+    def list(self, state=None, job_type=None, limit=50):
+        """
+        Most recent jobs first, optionally filtered by state and type.
+        """
+        query = "SELECT * FROM jobs"
+        clauses, args = [], []
+        if state:
+            clauses.append("state = ?")
+            args.append(state)
+        if job_type:
+            clauses.append("type = ?")
+            args.append(job_type)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        args.append(limit)
+        with self._connect() as conn:
+            rows = conn.execute(query, args).fetchall()
+        return [_describe(row) for row in rows]
+
+    def update_progress(self, job_id, progress):
+        write_progress(self.db_path, job_id, progress)
+
+    def _claim(self):
+        # Called with self._cond held: pick the oldest pending job whose type has capacity
+        open_types = [t for t in self.handlers if self.running[t] < self.concurrency.get(t, self.workers)]
+        if not open_types:
+            return None
+        placeholders = ','.join('?' * len(open_types))
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                f"SELECT * FROM jobs WHERE state = 'pending' AND type IN ({placeholders}) ORDER BY created_at LIMIT 1",
+                open_types
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            # Conditional, so a job another process claimed first is never taken twice
+            now = _now()
+            claimed = conn.execute(
+                "UPDATE jobs SET state = 'running', started_at = ?, progress = NULL, owner = ?, heartbeat_at = ? "
+                "WHERE id = ? AND state = 'pending'",
+                (now, self.owner, now, row['id'])
+            ).rowcount
+            conn.execute("COMMIT")
+        if not claimed:
+            return None
+        self.running[row['type']] += 1
+        return dict(row)
+
+    def _finish(self, job, error=None):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET state = ?, finished_at = ?, error = ? WHERE id = ? AND owner = ?",
+                ('failed' if error else 'succeeded', _now(), error, job['id'], self.owner)
+            )
+        with self._cond:
+            self.running[job['type']] -= 1
+            self._cond.notify_all()
+
+    def _work(self):
+        while True:
+            with self._cond:
+                job = None
+                while not self._stopping:
+                    job = self._claim()
+                    if job:
+                        break
+                    # Also poll, so jobs queued by another process are noticed
+                    self._cond.wait(timeout=5)
+                if self._stopping:
+                    return
+
+            log_message(f"Job {job['id']} ({job['type']}) started.", job_id=job['id'], job_type=job['type'])
+            start = time.perf_counter()
+            try:
+                self.handlers[job['type']](job=JobContext(self.db_path, job['id']), **json.loads(job['params']))
+            except Exception as e:
+                error_message(f"Job {job['id']} ({job['type']}) failed: {e}", job_id=job['id'], job_type=job['type'])
+                self._finish(job, error=str(e))
+                JOBS_FINISHED.inc(type=job['type'], state='failed')
+                JOB_SECONDS.observe(time.perf_counter() - start, type=job['type'])
+            else:
+                success_message(f"Job {job['id']} ({job['type']}) succeeded.", job_id=job['id'], job_type=job['type'])
+                self._finish(job)
+                JOBS_FINISHED.inc(type=job['type'], state='succeeded')
+                JOB_SECONDS.observe(time.perf_counter() - start, type=job['type'])
+                if self.on_success:
+                    try:
+                        self.on_success(job['type'], json.loads(job['params']))
+                    except Exception as e:
+                        error_message(f"Job {job['id']} ({job['type']}) success hook failed: {e}")
+
+    def _requeue_stale(self):
+        """
+        Return running jobs whose owner stopped sending heartbeats to pending.
+        Rows from before ownership was tracked have no heartbeat and count as stale.
+        """
+        with self._connect() as conn:
+            requeued = conn.execute(
+                "UPDATE jobs SET state = 'pending', started_at = NULL, owner = NULL, heartbeat_at = NULL "
+                "WHERE state = 'running' AND (owner IS NULL OR owner != ?) "
+                "AND (heartbeat_at IS NULL OR heartbeat_at < ?)",
+                (self.owner, _ago(self.stale_after))
+            ).rowcount
+        if requeued:
+            log_message(f"Requeued {requeued} interrupted job(s).")
+            with self._cond:
+                self._cond.notify_all()
+        return requeued
+
+    def _heartbeat(self):
+        # Runs until the queue is stopped and its last job has finished
+        while True:
+            with self._cond:
+                if self._stopping and not any(self.running.values()):
+                    return
+            try:
+                with self._connect() as conn:
+                    conn.execute(
+                        "UPDATE jobs SET heartbeat_at = ? WHERE owner = ? AND state = 'running'",
+                        (_now(), self.owner)
+                    )
+                self._requeue_stale()
+            except sqlite3.Error as e:
+                error_message(f"Job heartbeat failed: {e}")
+            self._wake.wait(self.heartbeat_seconds)
+            self._wake.clear()
+
+    def start(self):
+        """
+        Requeue jobs interrupted by a previous shutdown and start the workers.
+        """
+        self._requeue_stale()
+        self._stopping = False
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        self._beat = threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True)
+        self._beat.start()
+
+    def stop(self, timeout=None):
+        """
+        Stop taking new jobs. Jobs already running are left to finish, and
+        keep their heartbeat until they do.
+        """
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+def _describe(row):
+    """
+    Public view of a job row, with JSON columns decoded.
+    """
+    job = dict(row)
+    job.pop('dedupe_key', None)
+    job['params'] = json.loads(job['params'])
+    progress = json.loads(job.pop('progress') or '{}')
+    job['rows'] = progress.get('rows', {})
+    job['stages'] = progress.get('stages', {})
+    if job['started_at']:
+        end = datetime.fromisoformat(job['finished_at']) if job['finished_at'] else datetime.now(timezone.utc)
+        job['duration_seconds'] = round((end - datetime.fromisoformat(job['started_at'])).total_seconds(), 3)
+    else:
+        job['duration_seconds'] = None
+    return job
+
+def default_db_path():
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.environ.get("JOBS_DB_PATH", os.path.join(project_root, '.jobs.sqlite'))
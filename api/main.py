@@ -1,39 +1,159 @@
+from api.startup import report
+import asyncio
 import os
 import sys
+import threading
+import time
 # The main imports
-from fastapi import FastAPI, BackgroundTasks, HTTPException
-from pydantic import BaseModel
+with report.step('import_fastapi'):
+    from fastapi import FastAPI, HTTPException, Request
+    from fastapi.responses import PlainTextResponse
+    from starlette.concurrency import run_in_threadpool
+    from pydantic import BaseModel
 from typing import Optional, List
+from datetime import date
 
 # Add project root to path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
-from etl_prod.main import extract_and_transform, load_all_data, load_incremental
-from ordergen.generator import OrderGenerator
-from etl_prod.transform.customers import transform_customers
-from etl_prod.transform.orders import transform_orders
-from etl_prod.transform.orders_items import transform_order_items
-from etl_prod.transform.order_payments import transform_order_payments
-from etl_prod.transform.order_reviews import transform_order_reviews
-from etl_prod.utils import log_message, success_message, error_message
+# Only light modules are imported here. pandas, numpy, faker, supabase,
+# SQLAlchemy, the ETL and the generator load on first use, so a cold
+# instance can answer /health as soon as the server is up.
+with report.step('import_api'):
+    from etl_core.utils import log_message, success_message, error_message
+    from api.jobs import JobQueue, default_db_path, parse_concurrency
+    from api import workers
+    from api.analytics import AnalyticsService, DateRangeNotSupported
+    from api.cache import ResultCache
+    from instrumentation import REGISTRY, counter, histogram
 
 app = FastAPI(title="Brazil Retail Intelligence API")
 
-# Global Generator Instance
+REQUESTS = counter('api_requests_total', 'HTTP requests, per method, route and status.')
+REQUEST_SECONDS = histogram('api_request_seconds', 'HTTP request latency, per route.')
+
+# Global Generator Instance, trained on first use
 gen = None
+gen_lock = threading.Lock()
 
-@app.on_event("startup")
-async def startup_event():
+# Background job queue and process pool, created on startup
+jobs = None
+pool = None
+
+# Async connection pool and server-side KPI queries from sql/, available when DATABASE_URL is set.
+# Set up in the background after startup; analytics requests wait for it.
+db = None
+analytics = None
+analytics_init = None
+
+# Tables written by a generation job (ordergen.schema.GENERATED_SCHEMA)
+GENERATED_TABLES = ['customers', 'orders', 'order_items', 'order_payments', 'order_reviews']
+
+# Tables an ETL job can load (etl_core.pipeline.TRANSFORMS)
+ETL_TABLES = ['customers', 'geolocation', 'geolocation_points', 'order_items', 'order_payments', 'order_reviews', 'orders', 'products', 'sellers']
+
+# Generation jobs at least this large run in the process pool
+LARGE_GENERATION_THRESHOLD = int(os.environ.get("LARGE_GENERATION_THRESHOLD", "5000"))
+
+def get_generator():
+    """
+    The trained generator, trained by whichever caller needs it first.
+    """
     global gen
-    log_message("Initializing Order Generator...")
+    with gen_lock:
+        if gen is None:
+            log_message("Initializing Order Generator...")
+            with report.step('generator_training', lazy=True):
+                from ordergen.generator import OrderGenerator
+                trained = OrderGenerator()
+                trained.train()
+            gen = trained
+            success_message("Order Generator initialized and trained.")
+    return gen
+
+def preload_generator():
     try:
-        gen = OrderGenerator()
-        gen.train()
-        success_message("Order Generator initialized and trained.")
+        get_generator()
     except Exception as e:
         error_message(f"Failed to initialize Order Generator: {e}")
 
+async def init_analytics():
+    global db, analytics
+    # SQLAlchemy's import is slow enough to matter; keep it off the event loop
+    def build():
+        with report.step('analytics_setup', lazy=True):
+            from api.db import Database
+            return Database(
+                pool_size=int(os.environ.get("DB_POOL_SIZE", "5")),
+                max_overflow=int(os.environ.get("DB_POOL_OVERFLOW", "5"))
+            )
+    db = await run_in_threadpool(build)
+    try:
+        with report.step('database_connect', lazy=True):
+            await db.connect()
+        success_message("Database connection pool ready.")
+    except Exception as e:
+        error_message(f"Database connection check failed: {e}")
+    analytics = AnalyticsService(db, cache=ResultCache(
+        ttl=int(os.environ.get("ANALYTICS_CACHE_TTL", "300")),
+        max_entries=int(os.environ.get("ANALYTICS_CACHE_MAX_ENTRIES", "512")),
+        max_bytes=int(os.environ.get("ANALYTICS_CACHE_MAX_MB", "64")) * 1024 * 1024
+    ))
+    success_message(f"Loaded analytics queries: {sum(len(q) for q in analytics.library.values())}")
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    # Label by route template, not raw path, to keep job IDs out of the label set
+    route = request.scope.get('route')
+    path = route.path if route else 'unmatched'
+    REQUESTS.inc(method=request.method, path=path, status=response.status_code)
+    REQUEST_SECONDS.observe(time.perf_counter() - start, path=path)
+    return response
+
+@app.on_event("startup")
+async def startup_event():
+    global jobs, pool, analytics_init
+    if os.environ.get("DATABASE_URL"):
+        analytics_init = asyncio.create_task(init_analytics())
+    else:
+        error_message("DATABASE_URL is not set; /analytics endpoints are disabled.")
+
+    # Worker processes for CPU-bound jobs start warming in the background;
+    # each imports the pipeline and trains its own generator on first use
+    with report.step('process_pool'):
+        pool = workers.WorkerPool(max_workers=int(os.environ.get("PROCESS_WORKERS", "1")))
+
+    # One job of each type at a time by default, so overlapping scheduler
+    # calls queue up instead of sharing the generator and client
+    with report.step('job_queue'):
+        jobs = JobQueue(
+            default_db_path(),
+            handlers={'etl': run_etl_task, 'order_gen': run_order_gen_task},
+            workers=int(os.environ.get("JOB_WORKERS", "2")),
+            concurrency={'etl': 1, 'order_gen': 1, **parse_concurrency(os.environ.get("JOB_CONCURRENCY"))},
+            on_success=invalidate_analytics
+        )
+        jobs.start()
+
+    # Optionally train the generator now, without holding up startup
+    if os.environ.get("PRELOAD_GENERATOR", "0") == "1":
+        threading.Thread(target=preload_generator, name="generator-preload", daemon=True).start()
+
+    report.ready()
+    log_message(f"API ready in {report.ready_after:.3f}s: {report.boot}")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if jobs:
+        jobs.stop(timeout=5)
+    if pool:
+        pool.shutdown()
+    if db:
+        await db.dispose()
+
 class OrderGenRequest(BaseModel):
     count: int = 10
 
@@ -41,53 +161,126 @@ class ETLRequest(BaseModel):
     full_reload: bool = False
     tables: Optional[List[str]] = None
 
-def run_etl_task(full_reload: bool, tables: Optional[List[str]]):
-    log_message(f"Starting ETL Task. Full Reload: {full_reload}, Tables: {tables}")
+def run_etl_task(job, full_reload: bool, tables: Optional[List[str]]):
+    # Extract and transform are CPU-bound; keep them off the API process
+    pool.run_etl(job, full_reload, tables)
+
+def run_order_gen_task(job, count: int):
+    if count >= LARGE_GENERATION_THRESHOLD:
+        pool.run_order_gen(job, count)
+    else:
+        workers.run_order_gen_task(job, get_generator(), count)
+
+def invalidate_analytics(job_type, params):
+    # Loads make cached analytics for the tables they wrote stale
+    if analytics is None:
+        return
+    if job_type == 'order_gen':
+        dropped = analytics.invalidate(GENERATED_TABLES)
+    elif params.get('full_reload') or not params.get('tables'):
+        dropped = analytics.cache.stats()['entries']
+        analytics.cache.clear()
+    else:
+        dropped = analytics.invalidate(params['tables'])
+    log_message(f"Invalidated {dropped} cached analytics result(s) after {job_type} job.")
+
+@app.post("/etl/run")
+async def trigger_etl(request: ETLRequest):
+    tables = request.tables
+    if tables is not None:
+        unknown = sorted(set(tables) - set(ETL_TABLES))
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown tables: {', '.join(unknown)}; expected some of {', '.join(ETL_TABLES)}")
+        # Only the requested tables are extracted and transformed; their order does not matter
+        tables = sorted(set(tables))
+    job_id, deduplicated = jobs.submit('etl', {'full_reload': request.full_reload, 'tables': tables})
+    message = "Identical ETL task already queued" if deduplicated else "ETL task queued"
+    return {"message": message, "job_id": job_id}
+
+@app.post("/orders/generate")
+async def trigger_order_gen(request: OrderGenRequest):
+    job_id, deduplicated = jobs.submit('order_gen', {'count': request.count})
+    message = "Identical order generation task already queued" if deduplicated else f"Order generation task for {request.count} orders queued"
+    return {"message": message, "job_id": job_id}
+
+@app.get("/jobs")
+async def list_jobs(state: Optional[str] = None, type: Optional[str] = None, limit: int = 50):
+    return {"jobs": await run_in_threadpool(jobs.list, state=state, job_type=type, limit=limit)}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = await run_in_threadpool(jobs.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+async def require_analytics(group=None, name=None):
+    if analytics_init is None:
+        raise HTTPException(status_code=503, detail="Analytics database is not configured")
+    # A request arriving right after a cold start waits for the pool to come up
     try:
-        transformed_data = extract_and_transform()
-        if full_reload:
-            load_all_data(transformed_data)
-        else:
-            load_incremental(transformed_data, tables)
-        success_message("ETL Task Completed Successfully.")
+        await asyncio.shield(analytics_init)
     except Exception as e:
-        error_message(f"ETL Task Failed: {e}")
+        raise HTTPException(status_code=503, detail=f"Analytics failed to initialize: {e}")
+    if group is None:
+        return
+    if group not in analytics.library or (name is not None and name not in analytics.library[group]):
+        raise HTTPException(status_code=404, detail=f"Unknown analytics query: {group}/{name or ''}")
 
-def run_order_gen_task(count: int):
-    log_message(f"Starting Order Generation Task. Count: {count}")
+async def run_or_400(query):
     try:
-        if not gen:
-            raise Exception("Order Generator not initialized.")
-            
-        raw_data = gen.generate_orders(count)
-        
-        transformed_data = {}
-        if not raw_data['customers'].empty:
-            transformed_data['customers'] = transform_customers(raw_data['customers'])
-        if not raw_data['orders'].empty:
-            transformed_data['orders'] = transform_orders(raw_data['orders'])
-        if not raw_data['order_items'].empty:
-            transformed_data['order_items'] = transform_order_items(raw_data['order_items'])
-        if not raw_data['order_payments'].empty:
-            transformed_data['order_payments'] = transform_order_payments(raw_data['order_payments'])
-        if not raw_data['order_reviews'].empty:
-            transformed_data['order_reviews'] = transform_order_reviews(raw_data['order_reviews'])
-            
-        load_incremental(transformed_data)
-        success_message(f"Generated and loaded {count} orders.")
-    except Exception as e:
-        error_message(f"Order Generation Task Failed: {e}")
+        return await query
+    except DateRangeNotSupported as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-@app.post("/etl/run")
-async def trigger_etl(request: ETLRequest, background_tasks: BackgroundTasks):
-    background_tasks.add_task(run_etl_task, request.full_reload, request.tables)
-    return {"message": "ETL task started in background"}
+@app.get("/analytics")
+async def list_analytics():
+    await require_analytics()
+    return {"queries": analytics.catalog()}
 
-@app.post("/orders/generate")
-async def trigger_order_gen(request: OrderGenRequest, background_tasks: BackgroundTasks):
-    background_tasks.add_task(run_order_gen_task, request.count)
-    return {"message": f"Order generation task for {request.count} orders started in background"}
+@app.get("/analytics/cache")
+async def analytics_cache_stats():
+    await require_analytics()
+    return analytics.cache.stats()
+
+@app.get("/analytics/{group}")
+async def run_analytics_group(group: str, start_date: Optional[date] = None, end_date: Optional[date] = None, limit: Optional[int] = None):
+    await require_analytics(group)
+    return {
+        "group": group,
+        "start_date": start_date,
+        "end_date": end_date,
+        "results": await run_or_400(analytics.run_group(group, start_date, end_date, limit))
+    }
+
+@app.get("/analytics/{group}/{name}")
+async def run_analytics_query(group: str, name: str, start_date: Optional[date] = None, end_date: Optional[date] = None, limit: Optional[int] = None):
+    await require_analytics(group, name)
+    return {
+        "group": group,
+        "query": name,
+        "start_date": start_date,
+        "end_date": end_date,
+        "rows": await run_or_400(analytics.run(group, name, start_date, end_date, limit))
+    }
 
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Counters and histograms in the Prometheus text format: rows and bytes
+    loaded, upsert batch latency, orders generated, jobs and HTTP requests.
+    """
+    text = REGISTRY.render()
+    if analytics is not None:
+        for key, value in analytics.cache.stats().items():
+            if isinstance(value, (int, float)):
+                text += f"analytics_cache_{key} {value}\n"
+    return text
+
+@app.get("/startup")
+async def startup_report():
+    return {**report.summary(), "generator_trained": gen is not None, "analytics_ready": analytics is not None}
@@ -0,0 +1,42 @@
+import threading
+import time
+from contextlib import contextmanager
+
+class StartupReport:
+    """
+    Wall-clock cost of bringing the API up.
+
+    `boot` steps are the imports and initialisation done before the first
+    request can be served; `lazy` steps are the heavy pieces deferred until
+    something first needs them (or warmed in the background). Both are
+    measured from process-level import of this module.
+    """
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.boot = {}
+        self.lazy = {}
+        self.ready_after = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def step(self, name, lazy=False):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                (self.lazy if lazy else self.boot)[name] = round(time.perf_counter() - start, 4)
+
+    def ready(self):
+        self.ready_after = round(time.perf_counter() - self.started, 4)
+
+    def summary(self):
+        with self._lock:
+            return {
+                'ready_after_seconds': self.ready_after,
+                'boot_seconds': dict(self.boot),
+                'lazy_seconds': dict(self.lazy),
+            }
+
+# Created as early as possible: api.main imports this before anything heavy
+report = StartupReport()
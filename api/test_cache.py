@@ -0,0 +1,70 @@
+import types
+import pytest
+from api import cache as cache_module
+from api.cache import ResultCache
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module, 'time', types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+def test_entries_expire_after_ttl(clock):
+    cache = ResultCache(ttl=10)
+    cache.set('a', [1, 2])
+    clock[0] += 9
+    assert cache.get('a') == (True, [1, 2])
+    clock[0] += 2
+    assert cache.get('a') == (False, None)
+    stats = cache.stats()
+    assert stats['entries'] == 0 and stats['bytes'] == 0
+    assert (stats['hits'], stats['misses'], stats['expirations']) == (1, 1, 1)
+
+def test_least_recently_used_is_evicted_first(clock):
+    cache = ResultCache(max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    # Reading 'a' makes 'b' the least recently used
+    cache.get('a')
+    cache.set('c', 3)
+    assert cache.get('b') == (False, None)
+    assert cache.get('a') == (True, 1) and cache.get('c') == (True, 3)
+    assert cache.stats()['evictions'] == 1
+
+def test_byte_budget_evicts_and_skips_oversized_values(clock):
+    cache = ResultCache(max_bytes=20)
+    cache.set('a', 'x' * 8)  # 10 bytes as JSON
+    cache.set('b', 'y' * 8)
+    cache.set('c', 'z' * 8)
+    assert cache.get('a') == (False, None)
+    assert cache.stats()['bytes'] == 20
+    # Larger than the whole budget: not cached, and nothing is evicted for it
+    cache.set('big', 'w' * 100)
+    assert cache.get('big') == (False, None)
+    assert cache.stats()['entries'] == 2
+
+def test_replacing_a_key_keeps_the_byte_count(clock):
+    cache = ResultCache()
+    cache.set('a', 'x' * 8)
+    cache.set('a', 'x' * 18)
+    assert (cache.stats()['entries'], cache.stats()['bytes']) == (1, 20)
+
+def test_invalidate_drops_only_tagged_entries(clock):
+    cache = ResultCache()
+    cache.set('sales', 1, tags=['orders', 'order_items'])
+    cache.set('reviews', 2, tags=['order_reviews'])
+    cache.set('static', 3)
+    assert cache.invalidate(['order_items', 'sellers']) == 1
+    assert cache.get('sales') == (False, None)
+    assert cache.get('reviews') == (True, 2) and cache.get('static') == (True, 3)
+    cache.clear()
+    assert cache.stats()['entries'] == 0
+    assert cache.stats()['invalidations'] == 3
+
+def test_get_or_compute_computes_once(clock):
+    cache = ResultCache()
+    calls = []
+    compute = lambda: calls.append(1) or 'value'
+    assert cache.get_or_compute('k', compute) == 'value'
+    assert cache.get_or_compute('k', compute) == 'value'
+    assert len(calls) == 1
@@ -0,0 +1,107 @@
+import threading
+import time
+from api.jobs import JobQueue, connect, parse_concurrency, _ago
+
+def make_queue(tmp_path, **kwargs):
+    handlers = kwargs.pop('handlers', {'etl': lambda job, **params: None, 'order_gen': lambda job, **params: None})
+    return JobQueue(str(tmp_path / 'jobs.sqlite'), handlers=handlers, **kwargs)
+
+def set_heartbeat(queue, job_id, heartbeat_at):
+    with connect(queue.db_path) as conn:
+        conn.execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ?", (heartbeat_at, job_id))
+
+def wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return predicate()
+
+def test_parse_concurrency():
+    assert parse_concurrency("etl=1, order_gen=3") == {'etl': 1, 'order_gen': 3}
+    assert parse_concurrency(None) == {}
+
+def test_submit_deduplicates_pending_jobs(tmp_path):
+    queue = make_queue(tmp_path)
+    first, deduplicated = queue.submit('etl', {'tables': ['orders'], 'full_reload': False})
+    assert not deduplicated
+    # Same parameters in another order are the same job
+    assert queue.submit('etl', {'full_reload': False, 'tables': ['orders']}) == (first, True)
+    assert queue.submit('etl', {'full_reload': True, 'tables': ['orders']})[0] != first
+
+def test_claim_is_oldest_first_and_capped_per_type(tmp_path):
+    queue = make_queue(tmp_path, concurrency={'etl': 1})
+    etl_1, _ = queue.submit('etl', {'n': 1})
+    etl_2, _ = queue.submit('etl', {'n': 2})
+    gen, _ = queue.submit('order_gen', {'count': 5})
+
+    assert queue._claim()['id'] == etl_1
+    # The etl cap is reached, so the next claim skips etl_2 for the order_gen job
+    assert queue._claim()['id'] == gen
+    job = queue.get(etl_1)
+    assert job['state'] == 'running' and job['owner'] == queue.owner and job['heartbeat_at']
+
+    queue._finish({'id': etl_1, 'type': 'etl'})
+    assert queue.get(etl_1)['state'] == 'succeeded'
+    assert queue._claim()['id'] == etl_2
+
+def test_a_job_is_claimed_by_one_queue_only(tmp_path):
+    first = make_queue(tmp_path)
+    second = make_queue(tmp_path)
+    job_id, _ = first.submit('etl', {})
+    assert first._claim()['id'] == job_id
+    assert second._claim() is None
+
+def test_requeue_only_jobs_with_a_stale_heartbeat(tmp_path):
+    owner = make_queue(tmp_path, stale_after=60)
+    other = make_queue(tmp_path, stale_after=60)
+    fresh, _ = owner.submit('etl', {'n': 1})
+    stale, _ = owner.submit('etl', {'n': 2})
+    owner._claim()
+    owner._claim()
+    set_heartbeat(owner, stale, _ago(120))
+
+    # A live owner's jobs stay with it; only the silent one is requeued
+    assert other._requeue_stale() == 1
+    assert owner.get(fresh)['state'] == 'running'
+    requeued = owner.get(stale)
+    assert requeued['state'] == 'pending' and requeued['owner'] is None
+
+    # The original owner finishing late does not overwrite the requeued job
+    owner._finish({'id': stale, 'type': 'etl'}, error='interrupted')
+    assert owner.get(stale)['state'] == 'pending'
+
+def test_requeue_never_takes_own_jobs(tmp_path):
+    queue = make_queue(tmp_path)
+    job_id, _ = queue.submit('etl', {})
+    queue._claim()
+    set_heartbeat(queue, job_id, _ago(3600))
+    assert queue._requeue_stale() == 0
+
+def test_heartbeat_refreshes_running_jobs(tmp_path):
+    release = threading.Event()
+    queue = make_queue(tmp_path, handlers={'etl': lambda job: release.wait(10)}, heartbeat_seconds=0.05)
+    job_id, _ = queue.submit('etl', {})
+    queue.start()
+    try:
+        assert wait_for(lambda: queue.get(job_id)['state'] == 'running')
+        set_heartbeat(queue, job_id, _ago(3600))
+        queue._wake.set()
+        assert wait_for(lambda: queue.get(job_id)['heartbeat_at'] > _ago(60))
+    finally:
+        release.set()
+        queue.stop(timeout=5)
+    assert queue.get(job_id)['state'] == 'succeeded'
+
+def test_failed_job_records_the_error(tmp_path):
+    def fail(job):
+        raise RuntimeError("boom")
+    done = threading.Event()
+    queue = make_queue(tmp_path, handlers={'etl': fail}, workers=1, on_success=lambda *args: done.set())
+    job_id, _ = queue.submit('etl', {})
+    queue.start()
+    try:
+        assert wait_for(lambda: queue.get(job_id)['state'] == 'failed')
+    finally:
+        queue.stop(timeout=5)
+    assert queue.get(job_id)['error'] == 'boom'
+    assert not done.is_set()
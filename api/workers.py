@@ -0,0 +1,137 @@
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, List
+
+# Add project root to path (worker processes import this module directly)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from etl_core.utils import log_message, success_message, error_message
+from instrumentation import REGISTRY, trace_run
+
+# The pipeline modules are imported by the tasks themselves, so the API
+# process only pays for them once a job actually runs there
+
+def run_etl_task(job, full_reload: bool, tables: Optional[List[str]]):
+    from etl_core.backends import get_backend
+    from etl_core.pipeline import run_pipeline
+    backend = get_backend()
+    log_message(f"Starting ETL Task. Full Reload: {full_reload}, Tables: {tables}")
+
+    def step_done(step, seconds, cached):
+        # Steps of different tables overlap, so each stage is the sum over tables
+        job.add_stage_time(step.split(':')[0], seconds)
+
+    try:
+        with trace_run(f"etl-{job.job_id}"):
+            if full_reload:
+                run_pipeline(backend.Loader(full_reload=True), on_table_loaded=job.add_rows, on_step_done=step_done)
+            else:
+                run_pipeline(backend.Loader(incremental=True), tables, on_table_loaded=job.add_rows, on_step_done=step_done)
+        success_message("ETL Task Completed Successfully.")
+    except Exception as e:
+        error_message(f"ETL Task Failed: {e}")
+        raise
+
+def run_order_gen_task(job, gen, count: int):
+    from etl_core.backends import get_backend
+    from ordergen.schema import validate_generated
+    from ordergen.utils import prefetch
+    backend = get_backend()
+    log_message(f"Starting Order Generation Task. Count: {count}")
+    try:
+        if not gen:
+            raise Exception("Order Generator not initialized.")
+
+        with trace_run(f"order_gen-{job.job_id}"):
+            # Upsert each batch while the next one is generated in the background;
+            # generation time is measured on the producer thread
+            batches = job.timed_iter('generate', gen.iter_orders(count, batch_size=1000))
+            for raw_data in prefetch(batches, maxsize=1):
+                # Generated frames are already typed; validate instead of re-transforming
+                with job.stage('validate'):
+                    transformed_data = validate_generated(raw_data)
+                with job.stage('load'):
+                    backend.load_incremental(transformed_data, on_table_loaded=job.add_rows)
+        success_message(f"Generated and loaded {count} orders.")
+    except Exception as e:
+        error_message(f"Order Generation Task Failed: {e}")
+        raise
+
+# Trained generator owned by a worker process, trained on its first generation job
+_worker_gen = None
+
+def _warm_worker():
+    # Pay for the heavy imports while the worker is idle, not inside its first job
+    import etl_core.pipeline
+    import ordergen.generator
+    from etl_core.backends import get_backend
+    get_backend()
+
+def _get_worker_gen():
+    global _worker_gen
+    if _worker_gen is None:
+        from ordergen.generator import OrderGenerator
+        gen = OrderGenerator()
+        gen.train()
+        _worker_gen = gen
+    return _worker_gen
+
+def _ping():
+    return os.getpid()
+
+def _with_metrics(task, *args):
+    # Hand the metrics recorded in this worker back to the API process,
+    # on the exception too when the task fails
+    try:
+        task(*args)
+    except Exception as e:
+        e.metrics = REGISTRY.drain()
+        raise
+    return REGISTRY.drain()
+
+def _etl_in_worker(job, full_reload, tables):
+    return _with_metrics(run_etl_task, job, full_reload, tables)
+
+def _order_gen_in_worker(job, count):
+    return _with_metrics(lambda: run_order_gen_task(job, _get_worker_gen(), count))
+
+class WorkerPool:
+    """
+    Dedicated process pool for CPU-bound jobs.
+
+    Heavy pandas work in the API process holds the GIL and slows every
+    request, so ETL and large generation jobs run here instead. Workers are
+    spawned (the API process is multi-threaded, which makes fork unsafe)
+    and start importing the pipeline in the background as soon as the pool
+    is created, so the first job does not pay for that. Each worker trains
+    its own generator on its first generation job.
+    """
+    def __init__(self, max_workers=1):
+        self.max_workers = max_workers
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_warm_worker
+        )
+        for _ in range(max_workers):
+            self.executor.submit(_ping)
+
+    def _run(self, fn, *args):
+        try:
+            metrics = self.executor.submit(fn, *args).result()
+        except Exception as e:
+            REGISTRY.merge(getattr(e, 'metrics', {}))
+            raise
+        REGISTRY.merge(metrics)
+
+    def run_etl(self, job, full_reload, tables):
+        self._run(_etl_in_worker, job, full_reload, tables)
+
+    def run_order_gen(self, job, count):
+        self._run(_order_gen_in_worker, job, count)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,169 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from ordergen.generator import OrderGenerator
+from ordergen.schema import STATE_NAMES
+
+# Row counts of the public Olist dataset, i.e. scale 1
+OLIST_ROWS = {
+    'orders': 99441,
+    'products': 32951,
+    'sellers': 3095,
+    'geolocation': 1000163,
+    'zip_prefixes': 19015,
+}
+
+# Olist CSV file for each dataset key, as read by the ETL
+DATASET_FILES = {
+    'customers': 'olist_customers_dataset.csv',
+    'geolocation': 'olist_geolocation_dataset.csv',
+    'order_items': 'olist_order_items_dataset.csv',
+    'order_payments': 'olist_order_payments_dataset.csv',
+    'order_reviews': 'olist_order_reviews_dataset.csv',
+    'orders': 'olist_orders_dataset.csv',
+    'products': 'olist_products_dataset.csv',
+    'sellers': 'olist_sellers_dataset.csv',
+}
+
+# Purchase window of the Olist orders
+OLIST_START = datetime(2016, 9, 4)
+OLIST_END = datetime(2018, 10, 17)
+
+CATEGORIES = [
+    'cama_mesa_banho', 'beleza_saude', 'esporte_lazer', 'moveis_decoracao',
+    'informatica_acessorios', 'utilidades_domesticas', 'relogios_presentes',
+    'telefonia', 'ferramentas_jardim', 'automotivo', 'brinquedos', 'cool_stuff',
+    'perfumaria', 'bebes', 'eletronicos', 'papelaria', 'fashion_bolsas_e_acessorios',
+    'pet_shop', 'moveis_escritorio', 'consoles_games'
+]
+
+def _scaled(key, scale):
+    return max(1, int(round(OLIST_ROWS[key] * scale)))
+
+def _reference_data(gen, scale, rng):
+    """
+    Synthetic products, sellers and zip prefixes for the generator to draw
+    from, sized like Olist at this scale.
+    """
+    states = np.array(sorted(STATE_NAMES))
+    zips = rng.choice(np.arange(1000, 100000), size=min(_scaled('zip_prefixes', scale), 99000), replace=False)
+    zip_states = states[rng.integers(0, len(states), size=len(zips))]
+    city_pool = np.array([gen.fake.city() for _ in range(2000)])
+    zip_cities = city_pool[rng.integers(0, len(city_pool), size=len(zips))]
+
+    product_ids = [gen.new_id() for _ in range(_scaled('products', scale))]
+    seller_ids = [gen.new_id() for _ in range(_scaled('sellers', scale))]
+
+    # Generated orders pick from these, as they would from the trained lists
+    gen.product_ids = product_ids
+    gen.seller_ids = seller_ids
+    gen.zip_codes = [int(z) for z in zips]
+    gen.cities = [str(c).lower() for c in zip_cities]
+    gen.states = [str(s) for s in zip_states]
+    gen.product_prices = {
+        pid: [round(float(p), 2)] for pid, p in zip(product_ids, rng.lognormal(4.3, 0.9, size=len(product_ids)))
+    }
+
+    n = len(product_ids)
+    products = pd.DataFrame({
+        'product_id': product_ids,
+        'product_category_name': np.array(CATEGORIES)[rng.integers(0, len(CATEGORIES), size=n)],
+        'product_name_lenght': rng.integers(5, 76, size=n),
+        'product_description_lenght': rng.integers(4, 3993, size=n),
+        'product_photos_qty': rng.integers(1, 21, size=n),
+        'product_weight_g': rng.integers(0, 40426, size=n),
+        'product_length_cm': rng.integers(7, 106, size=n),
+        'product_height_cm': rng.integers(2, 106, size=n),
+        'product_width_cm': rng.integers(6, 119, size=n),
+    })
+
+    seller_rows = rng.integers(0, len(zips), size=len(seller_ids))
+    sellers = pd.DataFrame({
+        'seller_id': seller_ids,
+        'seller_zip_code_prefix': zips[seller_rows],
+        'seller_city': zip_cities[seller_rows],
+        'seller_state': zip_states[seller_rows],
+    })
+
+    return products, sellers, (zips, zip_cities, zip_states)
+
+def _geolocation_chunks(zip_table, scale, rng, chunk_size=1000000):
+    # Olist has ~50 geolocation rows per zip prefix, jittered around a centre.
+    # Written in chunks so the 100x table never has to fit in memory
+    zips, zip_cities, zip_states = zip_table
+    centres = rng.uniform([-33.0, -73.0], [3.0, -35.0], size=(len(zips), 2))
+    total = _scaled('geolocation', scale)
+    for offset in range(0, total, chunk_size):
+        n = min(chunk_size, total - offset)
+        rows = rng.integers(0, len(zips), size=n)
+        yield pd.DataFrame({
+            'geolocation_zip_code_prefix': zips[rows],
+            'geolocation_lat': centres[rows, 0] + rng.normal(0, 0.01, size=n),
+            'geolocation_lng': centres[rows, 1] + rng.normal(0, 0.01, size=n),
+            'geolocation_city': np.char.lower(zip_cities[rows].astype(str)),
+            'geolocation_state': zip_states[rows],
+        })
+
+def _to_raw(key, df):
+    # Generated frames match the transformed schema; the raw CSVs hold state initials
+    if key == 'customers':
+        df = df.drop(columns=['customer_state']).rename(columns={'customer_state_initials': 'customer_state'})
+        df['customer_city'] = df['customer_city'].str.lower()
+    return df
+
+def build_dataset(directory, scale, seed=42, batch_size=10000):
+    """
+    Write an Olist-shaped set of raw CSVs at `scale` times the size of the
+    public dataset, generated offline (no Supabase) and streamed to disk in
+    batches. A dataset already built with the same scale and seed is reused.
+
+    Arguments:
+        directory (str): Where to write the CSVs.
+        scale (float): Multiple of the Olist size, e.g. 1, 10 or 100.
+        seed (int): Seed for the generator, so datasets are reproducible.
+        batch_size (int): Orders generated and appended per batch.
+
+    Returns:
+        dict: Row count of each dataset.
+    """
+    manifest_path = os.path.join(directory, 'manifest.json')
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if manifest.get('scale') == scale and manifest.get('seed') == seed:
+            return manifest['rows']
+        os.remove(manifest_path)
+
+    os.makedirs(directory, exist_ok=True)
+    # Learns prices, arrivals and review text from data/ when the Olist CSVs are there
+    gen = OrderGenerator(seed=seed, offline=True)
+    gen.train()
+    rng = np.random.default_rng(seed)
+    products, sellers, zip_table = _reference_data(gen, scale, rng)
+
+    rows = {}
+    for key, df in (('products', products), ('sellers', sellers)):
+        df.to_csv(os.path.join(directory, DATASET_FILES[key]), index=False)
+        rows[key] = len(df)
+
+    rows['geolocation'] = 0
+    for df in _geolocation_chunks(zip_table, scale, rng):
+        path = os.path.join(directory, DATASET_FILES['geolocation'])
+        df.to_csv(path, mode='a' if rows['geolocation'] else 'w', header=not rows['geolocation'], index=False)
+        rows['geolocation'] += len(df)
+
+    generated = ('orders', 'customers', 'order_items', 'order_payments', 'order_reviews')
+    for key in generated:
+        rows[key] = 0
+    for frames in gen.iter_orders(_scaled('orders', scale), batch_size=batch_size, start_date=OLIST_START, end_date=OLIST_END):
+        for key in generated:
+            path = os.path.join(directory, DATASET_FILES[key])
+            df = _to_raw(key, frames[key])
+            df.to_csv(path, mode='a' if rows[key] else 'w', header=not rows[key], index=False)
+            rows[key] += len(df)
+
+    with open(manifest_path, 'w') as f:
+        json.dump({'scale': scale, 'seed': seed, 'rows': rows}, f, indent=2)
+    return rows
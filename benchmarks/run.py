@@ -0,0 +1,252 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import numpy as np
+import pandas as pd
+from benchmarks.datasets import DATASET_FILES, build_dataset
+from etl_core.extract import extract_data
+from etl_core.load import batch_upsert
+from etl_core.pipeline import TRANSFORMS
+from etl_core.sinks import NullSink, set_sink
+from etl_core.utils import log_message, warning_message, error_message, success_message
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+
+# Same order as the loader, so the parents of each table are benchmarked first
+TABLES = ['geolocation', 'customers', 'sellers', 'products', 'orders', 'order_items', 'order_payments', 'order_reviews']
+
+def measure(fn, make_input, repeat=1):
+    """
+    Time `fn` on a fresh input, best of `repeat` runs, then run it once more
+    under tracemalloc for its peak memory. Timed runs are not traced, since
+    tracing slows down Python-level loops.
+
+    Returns:
+        tuple: (result, seconds, peak memory in MB)
+    """
+    best = None
+    for _ in range(repeat):
+        data = make_input()
+        gc.collect()
+        start = time.perf_counter()
+        result = fn(data)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        del data
+
+    data = make_input()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn(data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del data
+    return result, best, peak / 1024 / 1024
+
+def calibrate(repeat=5):
+    """
+    Time a fixed mix of pandas and pure-Python work, best of `repeat`.
+    Throughput is compared relative to this, so a run on a slower or busier
+    machine is not reported as a regression of the code.
+    """
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'a': rng.integers(0, 1000, 200000), 'b': rng.random(200000)})
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df.groupby('a')['b'].sum()
+        df.sort_values('b')
+        df.head(50000).to_dict('records')
+        json.dumps([{'id': i, 'value': str(i)} for i in range(50000)])
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 4)
+
+def entry(rows, seconds, peak_mb):
+    return {
+        'rows': rows,
+        'seconds': round(seconds, 4),
+        'rows_per_second': round(rows / seconds, 1) if seconds else None,
+        'peak_memory_mb': round(peak_mb, 2),
+    }
+
+def benchmark_scale(directory, scale, seed, repeat, batch_size):
+    """
+    Build (or reuse) the dataset for one scale and benchmark every table's
+    extract, transform and upsert serialization.
+
+    Returns:
+        dict: Results keyed by "stage:table".
+    """
+    log_message(f"Preparing dataset at {scale:g}x in {directory}...")
+    build_dataset(directory, scale, seed=seed)
+
+    results = {}
+    for key in TABLES:
+        path = os.path.join(directory, DATASET_FILES[key])
+
+        raw, seconds, peak = measure(extract_data, lambda: path, repeat)
+        results[f"extract:{key}"] = entry(len(raw), seconds, peak)
+
+        # Transforms leave their input untouched, so every run can share it
+        transformed, seconds, peak = measure(TRANSFORMS[key], lambda: raw, repeat)
+        results[f"transform:{key}"] = entry(len(raw), seconds, peak)
+        del raw
+
+        _, seconds, peak = measure(
+            lambda df: batch_upsert(key, df, batch_size=batch_size), lambda: transformed, repeat
+        )
+        results[f"serialize:{key}"] = entry(len(transformed), seconds, peak)
+        del transformed
+
+        log_message(
+            f"Benchmarked {key}",
+            **{stage: results[f"{stage}:{key}"]['rows_per_second'] for stage in ('extract', 'transform', 'serialize')}
+        )
+    return results
+
+def compare(results, baseline, tolerance, memory_tolerance, min_seconds=0.05, speed_factor=1.0):
+    """
+    Compare a run against the baseline. A stage regresses when its throughput
+    drops by more than `tolerance`, or its peak memory grows by more than
+    `memory_tolerance` (both fractions). Peak memory is deterministic for a
+    given dataset, so its tolerance can be much tighter.
+    Throughput is first scaled by `speed_factor`, the ratio of this run's
+    calibration time to the baseline's.
+    Throughput of stages faster than `min_seconds` in the baseline is too
+    noisy to gate on and is only reported. Stages missing from the baseline
+    are skipped.
+
+    Returns:
+        tuple: (report lines, list of regressions)
+    """
+    lines = []
+    regressions = []
+    header = f"{'scale':<6} {'stage':<28} {'rows/s':>12} {'base':>12} {'Δ':>8} {'peak MB':>9} {'base':>9} {'Δ':>8}"
+    lines.append(header)
+    lines.append('-' * len(header))
+    for scale, stages in results.items():
+        for stage, current in stages.items():
+            base = baseline.get(scale, {}).get(stage)
+            if base is None:
+                lines.append(f"{scale:<6} {stage:<28} {current['rows_per_second'] or 0:>12,.0f} {'-':>12} {'':>8} {current['peak_memory_mb']:>9.1f}")
+                continue
+            speed = (current['rows_per_second'] or 0) * speed_factor / base['rows_per_second'] - 1 if base['rows_per_second'] else 0.0
+            memory = current['peak_memory_mb'] / base['peak_memory_mb'] - 1 if base['peak_memory_mb'] else 0.0
+            flag = ''
+            if speed < -tolerance and base['seconds'] >= min_seconds:
+                regressions.append(f"{scale} {stage}: throughput {speed:+.0%}")
+                flag = ' <- slower'
+            if memory > memory_tolerance:
+                regressions.append(f"{scale} {stage}: peak memory {memory:+.0%}")
+                flag += ' <- more memory'
+            lines.append(
+                f"{scale:<6} {stage:<28} {current['rows_per_second'] or 0:>12,.0f} {base['rows_per_second']:>12,.0f} {speed:>+8.0%} "
+                f"{current['peak_memory_mb']:>9.1f} {base['peak_memory_mb']:>9.1f} {memory:>+8.0%}{flag}"
+            )
+    return lines, regressions
+
+def baseline_scales(path):
+    """
+    The scales a stored baseline has results for, e.g. [1.0] for "1x".
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        labels = json.load(f).get('results', {})
+    return sorted(float(label.rstrip('x')) for label in labels)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ETL hot paths on synthetic Olist-shaped data.")
+    parser.add_argument('--scales', type=float, nargs='+', default=None, help="Dataset sizes as multiples of Olist; by default those the baseline covers.")
+    parser.add_argument('--data-dir', type=str, default=os.path.join(BENCH_DIR, '.data'), help="Where generated datasets are kept between runs.")
+    parser.add_argument('--output', type=str, default=os.path.join(BENCH_DIR, 'results'), help="Directory for the results JSON.")
+    parser.add_argument('--baseline', type=str, default=DEFAULT_BASELINE, help="Baseline results to compare against.")
+    parser.add_argument('--tolerance', type=float, default=0.3, help="Allowed throughput drop, as a fraction.")
+    parser.add_argument('--memory-tolerance', type=float, default=0.1, help="Allowed peak memory growth, as a fraction.")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per stage; the fastest is kept.")
+    parser.add_argument('--min-seconds', type=float, default=0.05, help="Stages faster than this are not gated on throughput.")
+    parser.add_argument('--batch-size', type=int, default=1000, help="Upsert batch size used for serialization.")
+    parser.add_argument('--seed', type=int, default=42, help="Seed for the generated datasets.")
+    parser.add_argument('--update-baseline', action='store_true', help="Store this run as the new baseline.")
+
+    args = parser.parse_args()
+    if args.scales is None:
+        args.scales = baseline_scales(args.baseline) or [1]
+
+    # Upserts go nowhere; only their serialization is measured
+    set_sink(NullSink())
+
+    calibration = calibrate()
+    results = {}
+    for scale in args.scales:
+        label = f"{scale:g}x"
+        results[label] = benchmark_scale(
+            os.path.join(args.data_dir, label), scale, args.seed, args.repeat, args.batch_size
+        )
+
+    # Calibrated either side of the benchmarks, so the figure reflects how busy the machine was during them
+    calibration = round((calibration + calibrate()) / 2, 4)
+    run = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'seed': args.seed,
+        'calibration_seconds': calibration,
+        'results': results,
+    }
+    os.makedirs(args.output, exist_ok=True)
+    path = os.path.join(args.output, f"bench-{datetime.now():%Y%m%d-%H%M%S}.json")
+    with open(path, 'w') as f:
+        json.dump(run, f, indent=2)
+    success_message(f"Results written to {path}")
+
+    if args.update_baseline:
+        previous = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                previous = json.load(f)['results']
+        # Scales not benchmarked in this run keep their old baseline
+        baseline = dict(run, results={**previous, **results})
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2)
+        success_message(f"Baseline updated at {args.baseline}")
+        return
+
+    baseline = {'results': {}}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    else:
+        warning_message(f"No baseline at {args.baseline}; run with --update-baseline to store one.")
+
+    speed_factor = calibration / baseline['calibration_seconds'] if baseline.get('calibration_seconds') else 1.0
+    if speed_factor != 1.0:
+        log_message(f"Machine speed relative to the baseline: {1 / speed_factor:.2f}x; throughput is normalised by it.")
+    lines, regressions = compare(
+        results, baseline['results'], args.tolerance, args.memory_tolerance, args.min_seconds, speed_factor
+    )
+    print('\n'.join(lines))
+    if regressions:
+        error_message(f"{len(regressions)} regression(s) against the baseline: " + '; '.join(regressions))
+        sys.exit(1)
+    if baseline['results']:
+        success_message("No regressions against the baseline.")
+
+if __name__ == "__main__":
+    main()
@@ -17,7 +17,7 @@ project_root = os.path.dirname(os.path.dirname(__file__))
 sys.path.insert(0, project_root)
 
 from create_schema import engine
-from etl.utils import log_message, error_message, success_message
+from etl_core.utils import log_message, error_message, success_message
 
 BACKUP_DIR = Path(__file__).parent / "backups"
 BACKUP_DIR.mkdir(exist_ok=True)
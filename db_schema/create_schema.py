@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, ForeignKey, Text
+from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Date, ForeignKey, Text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -27,11 +27,26 @@ class Customer(Base):
     customer_state = Column(String)
     customer_state_initials = Column(String)
 
+# One row per zip code prefix: the centroid of its points and its modal city and state
 class Geolocation(Base):
     __tablename__ = 'geolocation'
 
-    geolocation_id = Column(Integer, primary_key=True, autoincrement=True)
-    geolocation_zip_code_prefix = Column(Integer)
+    geolocation_zip_code_prefix = Column(Integer, primary_key=True, autoincrement=False)
+    geolocation_lat = Column(Float)
+    geolocation_lng = Column(Float)
+    geolocation_city = Column(String)
+    geolocation_state = Column(String)
+    geolocation_state_initials = Column(String)
+
+# Optional fine-grained geolocation: the distinct points of each zip code prefix,
+# rounded to etl_core.transform.geolocation.POINT_DECIMALS places. Keyed by the
+# rounded coordinates scaled to integers, as floats need not round-trip exactly
+class GeolocationPoint(Base):
+    __tablename__ = 'geolocation_points'
+
+    geolocation_zip_code_prefix = Column(Integer, primary_key=True, autoincrement=False)
+    geolocation_lat_key = Column(Integer, primary_key=True, autoincrement=False)
+    geolocation_lng_key = Column(Integer, primary_key=True, autoincrement=False)
     geolocation_lat = Column(Float)
     geolocation_lng = Column(Float)
     geolocation_city = Column(String)
@@ -75,7 +90,8 @@ class Order(Base):
     order_id = Column(String, primary_key=True)
     customer_id = Column(String, nullable=False)
     order_status = Column(String, nullable=False)
-    order_purchase_timestamp = Column(DateTime)
+    # Indexed for the purchase day ranges the KPI rollups are refreshed by
+    order_purchase_timestamp = Column(DateTime, index=True)
     order_approved_at = Column(DateTime)
     order_delivered_carrier_date = Column(DateTime)
     order_delivered_customer_date = Column(DateTime)
@@ -104,6 +120,68 @@ class Seller(Base):
     seller_state = Column(String)
     seller_state_initials = Column(String)
 
+# Daily KPI rollups, maintained by db_schema/rollups.py after each load.
+# Sums and counts rather than averages, so any date range can be re-aggregated.
+class RollupDailyState(Base):
+    __tablename__ = 'rollup_daily_state'
+
+    day = Column(Date, primary_key=True)
+    customer_state = Column(String, primary_key=True)
+    order_count = Column(Integer, nullable=False)
+    delivered_orders = Column(Integer, nullable=False)
+    revenue = Column(Float, nullable=False)
+    items_sold = Column(Integer, nullable=False)
+    lead_time_days_sum = Column(Float, nullable=False)
+    lead_time_orders = Column(Integer, nullable=False)
+    delayed_orders = Column(Integer, nullable=False)
+    review_count = Column(Integer, nullable=False)
+    review_score_sum = Column(Integer, nullable=False)
+
+class RollupDailyCategory(Base):
+    __tablename__ = 'rollup_daily_category'
+
+    day = Column(Date, primary_key=True)
+    category = Column(String, primary_key=True)
+    order_count = Column(Integer, nullable=False)
+    items_sold = Column(Integer, nullable=False)
+    revenue = Column(Float, nullable=False)
+    price_sum = Column(Float, nullable=False)
+
+class RollupDailySeller(Base):
+    __tablename__ = 'rollup_daily_seller'
+
+    day = Column(Date, primary_key=True)
+    seller_id = Column(String, primary_key=True)
+    order_count = Column(Integer, nullable=False)
+    items_sold = Column(Integer, nullable=False)
+    revenue = Column(Float, nullable=False)
+
+class RollupDailyPayment(Base):
+    __tablename__ = 'rollup_daily_payment'
+
+    day = Column(Date, primary_key=True)
+    payment_type = Column(String, primary_key=True)
+    payment_installments = Column(Integer, primary_key=True)
+    transaction_count = Column(Integer, nullable=False)
+    payment_value_sum = Column(Float, nullable=False)
+    payment_value_sq_sum = Column(Float, nullable=False)
+    payment_value_min = Column(Float)
+    payment_value_max = Column(Float)
+
+class RollupDailyReviews(Base):
+    __tablename__ = 'rollup_daily_reviews'
+
+    day = Column(Date, primary_key=True)
+    review_score = Column(Integer, primary_key=True)
+    review_count = Column(Integer, nullable=False)
+
+class RollupCustomerOrders(Base):
+    __tablename__ = 'rollup_customer_orders'
+
+    customer_unique_id = Column(String, primary_key=True)
+    first_order_day = Column(Date, nullable=False)
+    delivered_orders = Column(Integer, nullable=False)
+
 # Create all tables
 def create_database_schema():
     """Create all tables in the database."""
@@ -6,14 +6,57 @@ project_root = os.path.dirname(os.path.dirname(__file__))
 sys.path.insert(0, project_root)
 
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import text
-from .create_schema import engine, Customer, Geolocation, OrderItem, OrderPayment, OrderReview, Order, Product, Seller
-from etl.utils import log_message, error_message, success_message
+from sqlalchemy import inspect, text
+from .create_schema import engine, DATABASE_URL, Customer, Geolocation, GeolocationPoint, OrderItem, OrderPayment, OrderReview, Order, Product, Seller
+from etl_core.load import batch_upsert
+from etl_core.sinks import SqlAlchemySink
+from etl_core.utils import log_message, error_message, success_message
 from .create_schema import check_schema_created
 
 # Create session
 Session = sessionmaker(bind=engine)
 
+# Tables keyed by their natural key, which are upserted instead of appended,
+# so a repeated load updates their rows
+NATURAL_KEYS = {
+    'geolocation': ['geolocation_zip_code_prefix'],
+    'geolocation_points': ['geolocation_zip_code_prefix', 'geolocation_lat_key', 'geolocation_lng_key'],
+}
+
+def check_natural_key(table):
+    """
+    Raise if `table` exists with another primary key than its natural key,
+    e.g. a geolocation table created before it was keyed by zip code prefix.
+    create_schema.py only adds missing tables, so such a table must be migrated.
+    """
+    keys = inspect(engine).get_pk_constraint(table)['constrained_columns']
+    if sorted(keys) != sorted(NATURAL_KEYS[table]):
+        raise RuntimeError(
+            f"Table {table} is keyed by ({', '.join(keys)}), not ({', '.join(NATURAL_KEYS[table])}). "
+            f"create_schema.py does not change existing tables; run the migration SQL in "
+            f"docs/etl_setup.md (Geolocation) first."
+        )
+
+def upsert_table(table, df, full_reload=False):
+    """
+    Upsert a table keyed by its natural key through the same batched upsert
+    as incremental loads. Unlike the load_* appenders, failures are raised.
+    """
+    if not check_schema_created():
+        raise RuntimeError("Database schema not created. Please run create_schema.py first.")
+    check_natural_key(table)
+
+    if full_reload:
+        with engine.begin() as conn:
+            conn.execute(text(f"TRUNCATE TABLE {table} RESTART IDENTITY CASCADE;"))
+        success_message(f"{table} table truncated for full reload.")
+
+    sink = SqlAlchemySink(DATABASE_URL)
+    try:
+        batch_upsert(table, df, sink=sink)
+    finally:
+        sink.close()
+
 def load_customers(df, full_reload=False):
     """Load customers data into the database."""
     if not check_schema_created():
@@ -39,27 +82,12 @@ def load_customers(df, full_reload=False):
         session.close()
 
 def load_geolocation(df, full_reload=False):
-    """Load geolocation data into the database."""
-    if not check_schema_created():
-        error_message("Database schema not created. Please run create_schema.py first.")
-        return
-    
-    try:
-        session = Session()
-        
-        if full_reload:
-            session.execute(text("TRUNCATE TABLE geolocation RESTART IDENTITY CASCADE;"))
-            success_message("Geolocation table truncated for full reload.")
-        
-        records = df.to_dict('records')
-        session.bulk_insert_mappings(Geolocation, records)
-        session.commit()
-        success_message(f"Loaded {len(records)} geolocation records.")
-    except Exception as e:
-        session.rollback()
-        error_message(f"Failed to load geolocation: {e}")
-    finally:
-        session.close()
+    """Upsert geolocation data, one row per zip code prefix, into the database."""
+    upsert_table('geolocation', df, full_reload)
+
+def load_geolocation_points(df, full_reload=False):
+    """Upsert fine-grained geolocation points into the database."""
+    upsert_table('geolocation_points', df, full_reload)
 
 def load_order_items(df, full_reload=False):
     """Load order items data into the database."""
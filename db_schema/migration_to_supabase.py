@@ -15,8 +15,8 @@ from sqlalchemy import text, inspect
 project_root = os.path.dirname(os.path.dirname(__file__))
 sys.path.insert(0, project_root)
 
-from create_schema import engine, Base, Customer, Geolocation, OrderItem, OrderPayment, OrderReview, Order, Product, Seller
-from etl.utils import log_message, error_message, success_message
+from create_schema import engine, Base, Customer, Geolocation, GeolocationPoint, OrderItem, OrderPayment, OrderReview, Order, Product, Seller
+from etl_core.utils import log_message, error_message, success_message
 
 # Create session
 Session = sessionmaker(bind=engine)
@@ -35,6 +35,7 @@ SQL_DIR.mkdir(exist_ok=True)
 MODELS = {
     'customers': Customer,
     'geolocation': Geolocation,
+    'geolocation_points': GeolocationPoint,
     'order_items': OrderItem,
     'order_payments': OrderPayment,
     'order_reviews': OrderReview,
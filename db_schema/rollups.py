@@ -0,0 +1,396 @@
+import os
+import sys
+
+# Add project root to path for imports
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from datetime import datetime, time, timedelta
+from urllib.parse import urlparse
+from sqlalchemy import create_engine, text
+from etl_core.utils import log_message, success_message, warning_message
+from instrumentation import counter, span
+
+ROLLUP_FAILURES = counter('etl_rollup_failures_total', 'KPI rollup updates that failed after a load.')
+
+# Rollup days are order purchase days, as in the trend queries of sql/.
+# {days} is replaced by a filter on the days being refreshed: half-open
+# timestamp ranges on the bare column, so the orders index can serve it.
+PURCHASE_RANGE = "(o.order_purchase_timestamp >= :start_{i} AND o.order_purchase_timestamp < :end_{i})"
+
+# Taken by every refresh, so shards finishing at once do not delete and
+# re-insert the same boundary days concurrently
+REFRESH_LOCK = "SELECT pg_advisory_xact_lock(hashtext('kpi_rollups'))"
+
+# Kept on orders for the range filters, and created on existing databases too
+PURCHASE_INDEX = "CREATE INDEX IF NOT EXISTS ix_orders_order_purchase_timestamp ON orders (order_purchase_timestamp)"
+
+DAILY_ROLLUPS = {
+    'rollup_daily_state': """
+        INSERT INTO rollup_daily_state
+        SELECT
+            DATE(o.order_purchase_timestamp) AS day,
+            COALESCE(c.customer_state, 'Unknown') AS customer_state,
+            COUNT(*) AS order_count,
+            COUNT(*) FILTER (WHERE o.order_status = 'delivered') AS delivered_orders,
+            COALESCE(SUM(t.revenue) FILTER (WHERE o.order_status = 'delivered'), 0) AS revenue,
+            COALESCE(SUM(t.items_sold) FILTER (WHERE o.order_status = 'delivered'), 0) AS items_sold,
+            COALESCE(SUM(EXTRACT(EPOCH FROM (o.order_delivered_customer_date - o.order_purchase_timestamp))/86400)
+                FILTER (WHERE o.order_status = 'delivered' AND o.order_delivered_customer_date IS NOT NULL), 0) AS lead_time_days_sum,
+            COUNT(*) FILTER (WHERE o.order_status = 'delivered' AND o.order_delivered_customer_date IS NOT NULL) AS lead_time_orders,
+            COUNT(*) FILTER (WHERE o.order_status = 'delivered'
+                AND o.order_delivered_customer_date > o.order_estimated_delivery_date) AS delayed_orders,
+            COUNT(r.review_score) AS review_count,
+            COALESCE(SUM(r.review_score), 0) AS review_score_sum
+        FROM orders o
+        LEFT JOIN customers c ON o.customer_id = c.customer_id
+        LEFT JOIN (
+            -- Only the items of the orders being refreshed
+            SELECT oi.order_id, SUM(oi.price + oi.freight_value) AS revenue, COUNT(*) AS items_sold
+            FROM orders o
+            JOIN order_items oi ON oi.order_id = o.order_id
+            WHERE {days}
+            GROUP BY oi.order_id
+        ) t ON t.order_id = o.order_id
+        LEFT JOIN order_reviews r ON r.order_id = o.order_id
+        WHERE o.order_purchase_timestamp IS NOT NULL AND {days}
+        GROUP BY 1, 2
+    """,
+    'rollup_daily_category': """
+        INSERT INTO rollup_daily_category
+        SELECT
+            DATE(o.order_purchase_timestamp) AS day,
+            COALESCE(p.product_category_name_english, 'Unknown') AS category,
+            COUNT(DISTINCT o.order_id) AS order_count,
+            COUNT(*) AS items_sold,
+            SUM(oi.price + oi.freight_value) AS revenue,
+            SUM(oi.price) AS price_sum
+        FROM orders o
+        JOIN order_items oi ON oi.order_id = o.order_id
+        LEFT JOIN products p ON p.product_id = oi.product_id
+        WHERE o.order_status = 'delivered' AND o.order_purchase_timestamp IS NOT NULL AND {days}
+        GROUP BY 1, 2
+    """,
+    'rollup_daily_seller': """
+        INSERT INTO rollup_daily_seller
+        SELECT
+            DATE(o.order_purchase_timestamp) AS day,
+            oi.seller_id,
+            COUNT(DISTINCT o.order_id) AS order_count,
+            COUNT(*) AS items_sold,
+            SUM(oi.price + oi.freight_value) AS revenue
+        FROM orders o
+        JOIN order_items oi ON oi.order_id = o.order_id
+        WHERE o.order_status = 'delivered' AND o.order_purchase_timestamp IS NOT NULL AND {days}
+        GROUP BY 1, 2
+    """,
+    'rollup_daily_payment': """
+        INSERT INTO rollup_daily_payment
+        SELECT
+            DATE(o.order_purchase_timestamp) AS day,
+            op.payment_type,
+            op.payment_installments,
+            COUNT(*) AS transaction_count,
+            SUM(op.payment_value) AS payment_value_sum,
+            SUM(op.payment_value * op.payment_value) AS payment_value_sq_sum,
+            MIN(op.payment_value) AS payment_value_min,
+            MAX(op.payment_value) AS payment_value_max
+        FROM orders o
+        JOIN order_payments op ON op.order_id = o.order_id
+        WHERE o.order_purchase_timestamp IS NOT NULL AND {days}
+        GROUP BY 1, 2, 3
+    """,
+    'rollup_daily_reviews': """
+        INSERT INTO rollup_daily_reviews
+        SELECT
+            DATE(o.order_purchase_timestamp) AS day,
+            r.review_score,
+            COUNT(*) AS review_count
+        FROM orders o
+        JOIN order_reviews r ON r.order_id = o.order_id
+        WHERE r.review_score IS NOT NULL AND o.order_purchase_timestamp IS NOT NULL AND {days}
+        GROUP BY 1, 2
+    """,
+}
+
+# Repeat purchase rate is not additive over days, so it is kept per customer
+# instead and refreshed for the customers who ordered on the touched days
+TOUCHED_CUSTOMERS = """
+    SELECT DISTINCT c.customer_unique_id
+    FROM orders o
+    JOIN customers c ON o.customer_id = c.customer_id
+    WHERE c.customer_unique_id IS NOT NULL AND {days}
+"""
+
+CUSTOMER_ROLLUP = """
+    INSERT INTO rollup_customer_orders
+    SELECT
+        c.customer_unique_id,
+        MIN(DATE(o.order_purchase_timestamp)) AS first_order_day,
+        COUNT(DISTINCT o.order_id) AS delivered_orders
+    FROM customers c
+    JOIN orders o ON o.customer_id = c.customer_id
+    WHERE o.order_status = 'delivered'
+        AND o.order_purchase_timestamp IS NOT NULL
+        AND c.customer_unique_id IN ({customers})
+    GROUP BY c.customer_unique_id
+"""
+
+# One engine per process and database, like the Supabase clients in etl_core.backends.supabase
+_engines = {}
+
+def enabled():
+    """
+    Rollups are maintained when a direct Postgres connection is configured.
+    """
+    return bool(os.environ.get('DATABASE_URL'))
+
+def supabase_database_url():
+    """
+    DATABASE_URL if it is the database of the Supabase project the loaders
+    upsert into (SUPABASE_URL), else None. The project ref, the first label
+    of the API host, appears in the direct host (db.<ref>.supabase.co) or in
+    the pooler user name (postgres.<ref>); a self-hosted project shares its host.
+    """
+    database_url = os.environ.get('DATABASE_URL')
+    supabase_url = os.environ.get('SUPABASE_URL')
+    if not database_url or not supabase_url:
+        return None
+    api_host = urlparse(supabase_url).hostname or ''
+    ref = api_host.split('.')[0]
+    database = urlparse(database_url)
+    if ref and (ref in (database.hostname or '').split('.') or (database.username or '').endswith(f".{ref}")):
+        return database_url
+    return None
+
+def get_engine(database_url=None):
+    """
+    Engine for the rollups of a database, DATABASE_URL by default, with the
+    rollup tables and the purchase day index created on first use.
+    """
+    database_url = database_url or os.environ['DATABASE_URL']
+    key = (os.getpid(), database_url)
+    if key not in _engines:
+        _engines[key] = create_engine(database_url, pool_pre_ping=True)
+        if supported(_engines[key]):
+            create_rollup_tables(_engines[key])
+    return _engines[key]
+
+def supported(engine):
+    """
+    The rollup queries are written for Postgres.
+    """
+    return engine.dialect.name == 'postgresql'
+
+def create_rollup_tables(engine=None):
+    # Imported here: create_schema builds its own engine at import time
+    from db_schema.create_schema import (
+        Base, RollupDailyState, RollupDailyCategory, RollupDailySeller,
+        RollupDailyPayment, RollupDailyReviews, RollupCustomerOrders
+    )
+    tables = [
+        RollupDailyState, RollupDailyCategory, RollupDailySeller,
+        RollupDailyPayment, RollupDailyReviews, RollupCustomerOrders
+    ]
+    engine = engine or get_engine()
+    Base.metadata.create_all(engine, tables=[model.__table__ for model in tables])
+    with engine.begin() as conn:
+        conn.execute(text(PURCHASE_INDEX))
+
+def day_ranges(days):
+    """
+    Merge purchase days into half-open [start, end) timestamp ranges, one per
+    run of consecutive days.
+
+    Arguments:
+        days (list): Dates.
+
+    Returns:
+        list: (start, end) datetime pairs, in order.
+    """
+    ranges = []
+    for day in sorted(set(days)):
+        start = datetime.combine(day, time())
+        if ranges and ranges[-1][1] == start:
+            ranges[-1][1] = start + timedelta(days=1)
+        else:
+            ranges.append([start, start + timedelta(days=1)])
+    return [tuple(r) for r in ranges]
+
+def purchase_filter(days):
+    """
+    SQL filter on o.order_purchase_timestamp for the given days, and its parameters.
+    """
+    if days is None:
+        return "TRUE", {}
+    clauses, params = [], {}
+    for i, (start, end) in enumerate(day_ranges(days)):
+        clauses.append(PURCHASE_RANGE.format(i=i))
+        params.update({f"start_{i}": start, f"end_{i}": end})
+    return f"({' OR '.join(clauses)})", params
+
+def touched_days(conn, transformed_data):
+    """
+    Purchase days affected by a load.
+
+    Days come straight from the loaded orders; rows of the other order
+    tables, and customers, are resolved to the days of the orders they
+    belong to, and products and sellers to the days of the orders that
+    sold them.
+
+    Arguments:
+        conn: Open SQLAlchemy connection.
+        transformed_data (dict): Dictionary of loaded DataFrames.
+
+    Returns:
+        list: Sorted dates.
+    """
+    days = set()
+    known_orders = set()
+    orders = transformed_data.get('orders')
+    if orders is not None and not orders.empty:
+        days.update(ts.date() for ts in orders['order_purchase_timestamp'].dropna())
+        known_orders = set(orders['order_id'])
+
+    order_ids = set()
+    for key in ('order_items', 'order_payments', 'order_reviews'):
+        df = transformed_data.get(key)
+        if df is not None and not df.empty:
+            order_ids.update(df['order_id'])
+    order_ids -= known_orders
+    if order_ids:
+        rows = conn.execute(
+            text("SELECT DISTINCT DATE(order_purchase_timestamp) FROM orders WHERE order_id = ANY(:ids)"),
+            {'ids': list(order_ids)}
+        )
+        days.update(row[0] for row in rows if row[0] is not None)
+
+    customers = transformed_data.get('customers')
+    if customers is not None and not customers.empty:
+        rows = conn.execute(
+            text("SELECT DISTINCT DATE(order_purchase_timestamp) FROM orders WHERE customer_id = ANY(:ids)"),
+            {'ids': list(customers['customer_id'])}
+        )
+        days.update(row[0] for row in rows if row[0] is not None)
+
+    # Category names feed rollup_daily_category, sellers rollup_daily_seller
+    for key, column in (('products', 'product_id'), ('sellers', 'seller_id')):
+        df = transformed_data.get(key)
+        if df is not None and not df.empty:
+            rows = conn.execute(
+                text(f"""
+                    SELECT DISTINCT DATE(o.order_purchase_timestamp)
+                    FROM order_items oi
+                    JOIN orders o ON o.order_id = oi.order_id
+                    WHERE oi.{column} = ANY(:ids)
+                """),
+                {'ids': list(df[column])}
+            )
+            days.update(row[0] for row in rows if row[0] is not None)
+
+    return sorted(days)
+
+def refresh_rollups(days=None, engine=None):
+    """
+    Recompute the rollups for the given purchase days, or rebuild them all.
+
+    Each day is replaced as a whole inside one transaction, so the refresh is
+    idempotent and readers never see a half-updated day. Refreshes are
+    serialized by an advisory lock, so concurrent loads (e.g. backfill
+    shards sharing a boundary day) take turns instead of conflicting.
+
+    Arguments:
+        days (list): Dates to refresh; None rebuilds every day.
+        engine: SQLAlchemy engine; the DATABASE_URL engine if omitted.
+    """
+    engine = engine or get_engine()
+    if days is not None and not days:
+        return
+
+    day_filter, params = purchase_filter(days)
+    day_params = {'days': list(days)} if days is not None else {}
+
+    with engine.begin() as conn:
+        conn.execute(text(REFRESH_LOCK))
+        for table, insert_sql in DAILY_ROLLUPS.items():
+            if days is None:
+                conn.execute(text(f"DELETE FROM {table}"))
+            else:
+                conn.execute(text(f"DELETE FROM {table} WHERE day = ANY(:days)"), day_params)
+            conn.execute(text(insert_sql.format(days=day_filter)), params)
+
+        if days is None:
+            conn.execute(text("DELETE FROM rollup_customer_orders"))
+            customers = "SELECT customer_unique_id FROM customers"
+        else:
+            customers = TOUCHED_CUSTOMERS.format(days=day_filter)
+            conn.execute(text(f"DELETE FROM rollup_customer_orders WHERE customer_unique_id IN ({customers})"), params)
+        conn.execute(text(CUSTOMER_ROLLUP.format(customers=customers)), params)
+
+def refresh_for_loaded(transformed_data, engine=None):
+    """
+    Refresh the rollups for the days touched by a load. Called by the loaders
+    after upserting, so reports stay current without rescanning raw tables.
+
+    Arguments:
+        transformed_data (dict): Dictionary of loaded DataFrames.
+        engine: SQLAlchemy engine of the loaded database; DATABASE_URL if omitted.
+    """
+    if engine is None:
+        if not enabled():
+            return
+        engine = get_engine()
+    if not supported(engine):
+        warning_message(f"KPI rollups need Postgres, not {engine.dialect.name}; skipping refresh.")
+        return
+    with engine.connect() as conn:
+        days = touched_days(conn, transformed_data)
+    if not days:
+        return
+    log_message(f"Refreshing KPI rollups for {len(days)} day(s) ({days[0]} to {days[-1]})...")
+    refresh_rollups(days, engine)
+    success_message("KPI rollups refreshed.")
+
+def rebuild_rollups(engine=None):
+    """
+    Rebuild every rollup from the raw tables, e.g. after a full reload.
+
+    Arguments:
+        engine: SQLAlchemy engine of the loaded database; DATABASE_URL if omitted.
+    """
+    if engine is None:
+        if not enabled():
+            warning_message("DATABASE_URL is not set; skipping KPI rollup rebuild.")
+            return
+        engine = get_engine()
+    if not supported(engine):
+        warning_message(f"KPI rollups need Postgres, not {engine.dialect.name}; skipping rebuild.")
+        return
+    log_message("Rebuilding KPI rollups...")
+    refresh_rollups(None, engine)
+    success_message("KPI rollups rebuilt.")
+
+def update_after_load(loaded=None, database_url=None):
+    """
+    Bring the rollups up to date after a load: refreshed for the days touched
+    by `loaded`, or rebuilt if it is None. Best effort: the data is already
+    loaded, so a failure is logged and counted rather than failing the load.
+
+    Arguments:
+        loaded (dict): Loaded DataFrames of an incremental load; None after a full load.
+        database_url (str): The database that was loaded; DATABASE_URL if omitted.
+    """
+    try:
+        engine = get_engine(database_url) if database_url or enabled() else None
+        if loaded is not None:
+            with span('rollups:refresh'):
+                refresh_for_loaded(loaded, engine)
+        else:
+            with span('rollups:rebuild'):
+                rebuild_rollups(engine)
+    except Exception as e:
+        ROLLUP_FAILURES.inc()
+        warning_message(f"KPI rollups were not updated: {e}. The loaded data is kept; run 'python db_schema/rollups.py' to rebuild them.")
+
+if __name__ == "__main__":
+    rebuild_rollups()
@@ -0,0 +1,76 @@
+from datetime import date, datetime
+import pandas as pd
+from db_schema import rollups
+
+class FakeConnection:
+    """
+    Answers each lookup query with the days of the ids it is asked about.
+    """
+    def __init__(self, days_by_id):
+        self.days_by_id = days_by_id
+        self.queries = []
+
+    def execute(self, query, params):
+        self.queries.append(str(query))
+        return [(self.days_by_id.get(i),) for i in params['ids']]
+
+def test_day_ranges_merge_consecutive_days():
+    days = [date(2018, 1, 3), date(2018, 1, 1), date(2018, 1, 2), date(2018, 1, 5), date(2018, 1, 2)]
+    assert rollups.day_ranges(days) == [
+        (datetime(2018, 1, 1), datetime(2018, 1, 4)),
+        (datetime(2018, 1, 5), datetime(2018, 1, 6)),
+    ]
+
+def test_purchase_filter():
+    assert rollups.purchase_filter(None) == ("TRUE", {})
+    clause, params = rollups.purchase_filter([date(2018, 1, 1), date(2018, 1, 3)])
+    assert clause.count(' OR ') == 1
+    assert params == {
+        'start_0': datetime(2018, 1, 1), 'end_0': datetime(2018, 1, 2),
+        'start_1': datetime(2018, 1, 3), 'end_1': datetime(2018, 1, 4),
+    }
+
+def test_touched_days_from_orders_need_no_lookup():
+    conn = FakeConnection({})
+    orders = pd.DataFrame({
+        'order_id': ['o1', 'o2', 'o3'],
+        'order_purchase_timestamp': pd.to_datetime(['2018-01-01 10:00', '2018-01-01 23:59', None]),
+    })
+    # Items of orders loaded alongside them are not looked up again
+    items = pd.DataFrame({'order_id': ['o1', 'o2']})
+    assert rollups.touched_days(conn, {'orders': orders, 'order_items': items}) == [date(2018, 1, 1)]
+    assert conn.queries == []
+
+def test_touched_days_resolves_other_tables_through_orders():
+    conn = FakeConnection({
+        'o9': date(2017, 5, 1), 'c1': date(2017, 6, 1), 'p1': date(2017, 7, 1), 's1': date(2017, 8, 1),
+    })
+    loaded = {
+        'order_payments': pd.DataFrame({'order_id': ['o9', 'missing']}),
+        'customers': pd.DataFrame({'customer_id': ['c1']}),
+        'products': pd.DataFrame({'product_id': ['p1']}),
+        'sellers': pd.DataFrame({'seller_id': ['s1']}),
+        'order_reviews': pd.DataFrame({'order_id': []}),
+    }
+    assert rollups.touched_days(conn, loaded) == [
+        date(2017, 5, 1), date(2017, 6, 1), date(2017, 7, 1), date(2017, 8, 1)
+    ]
+    assert len(conn.queries) == 4
+
+def test_supabase_database_url_matches_the_project(monkeypatch):
+    monkeypatch.setenv('SUPABASE_URL', 'https://abcd1234.supabase.co')
+    direct = 'postgresql://postgres:pw@db.abcd1234.supabase.co:5432/postgres'
+    pooler = 'postgresql://postgres.abcd1234:pw@aws-0-eu-west-1.pooler.supabase.com:6543/postgres'
+    for url in (direct, pooler):
+        monkeypatch.setenv('DATABASE_URL', url)
+        assert rollups.supabase_database_url() == url
+    monkeypatch.setenv('DATABASE_URL', 'postgresql://me:pw@localhost:5432/brazilretail_bi')
+    assert rollups.supabase_database_url() is None
+
+def test_update_after_load_failure_is_counted_not_raised(monkeypatch):
+    def unavailable(database_url=None):
+        raise RuntimeError("connection refused")
+    monkeypatch.setattr(rollups, 'get_engine', unavailable)
+    before = sum(rollups.ROLLUP_FAILURES.snapshot().values())
+    rollups.update_after_load({'orders': pd.DataFrame()}, 'postgresql://localhost/none')
+    assert sum(rollups.ROLLUP_FAILURES.snapshot().values()) == before + 1
@@ -13,7 +13,7 @@ from sqlalchemy import create_engine, text
 project_root = os.path.dirname(os.path.dirname(__file__))
 sys.path.insert(0, project_root)
 
-from etl.utils import log_message, error_message, success_message
+from etl_core.utils import log_message, error_message, success_message
 
 MIGRATION_DIR = Path(__file__).parent / "migrations"
 
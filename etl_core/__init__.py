@@ -0,0 +1 @@
+# ETL core package: extract, transform and the pipeline, shared by every backend
@@ -0,0 +1,71 @@
+import importlib
+import os
+from instrumentation import span
+from ..dag import topological_order
+
+# Tables each table references by foreign key (see db_schema/setup_constraints.py)
+TABLE_DEPENDENCIES = {
+    'geolocation': [],
+    'geolocation_points': [],
+    'customers': [],
+    'sellers': [],
+    'products': [],
+    'orders': ['customers'],
+    'order_items': ['orders', 'products', 'sellers'],
+    'order_payments': ['orders'],
+    'order_reviews': ['orders'],
+}
+
+# Tables in foreign-key order: each is loaded after the tables it references
+LOAD_ORDER = topological_order(TABLE_DEPENDENCIES)
+
+# Module implementing each backend; imported on first use, so a backend's
+# dependencies are only needed where it runs
+BACKENDS = {
+    'supabase': 'etl_core.backends.supabase',
+    'sqlalchemy': 'etl_core.backends.sqlalchemy',
+}
+
+def get_backend(name=None):
+    """
+    The module that loads transformed data for a backend. Every backend
+    provides a Loader(incremental=False, full_reload=False) class, which the
+    pipeline drives one table at a time, and the all-at-once
+    load_all_data(transformed_data, on_table_loaded=None) and
+    load_incremental(transformed_data, tables_to_update=None, on_table_loaded=None).
+
+    Arguments:
+        name (str): "supabase" or "sqlalchemy"; ETL_BACKEND, else supabase.
+
+    Returns:
+        module: The backend module.
+    """
+    name = name or os.environ.get('ETL_BACKEND', 'supabase')
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown ETL backend {name!r}; expected one of {', '.join(BACKENDS)}")
+    return importlib.import_module(BACKENDS[name])
+
+def load_tables(loader, transformed_data, tables=None, on_table_loaded=None):
+    """
+    Load DataFrames already in memory through a backend's Loader, in
+    foreign-key order, then let the loader finish (e.g. refresh rollups).
+
+    Arguments:
+        loader: A backend Loader.
+        transformed_data (dict): Dictionary of DataFrames.
+        tables (list): Keys to load; all of them by default.
+        on_table_loaded (callable): Optional callback(key, rows) run after each table is loaded
+    """
+    try:
+        for key in LOAD_ORDER:
+            if tables is not None and key not in tables:
+                continue
+            df = transformed_data.get(key)
+            if df is not None and not df.empty:
+                with span(f"load:{key}", rows=len(df)):
+                    loader.load(key, df)
+                if on_table_loaded:
+                    on_table_loaded(key, len(df))
+        loader.finish()
+    finally:
+        loader.close()
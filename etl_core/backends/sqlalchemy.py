@@ -0,0 +1,71 @@
+from db_schema import rollups
+from ..load import batch_upsert
+from ..utils import log_message
+from ..sinks import SqlAlchemySink
+from . import load_tables
+
+class Loader:
+    """
+    Loads tables into the local database one at a time. Full loads go
+    through db_schema.dbmanip, truncating each table first on a full reload;
+    dbmanip appends all but the tables keyed by a natural key (geolocation),
+    so incremental loads go through the same batched upsert as the Supabase
+    backend, with the database as the sink. The KPI rollups are then brought
+    up to date as for Supabase.
+    """
+    def __init__(self, incremental=False, full_reload=False):
+        self.incremental = incremental
+        self.full_reload = full_reload
+        self.sink = None
+        self.loaded = {}
+        # create_schema opens an engine on import
+        from db_schema.create_schema import DATABASE_URL
+        self.database_url = DATABASE_URL
+        if incremental:
+            self.sink = SqlAlchemySink(DATABASE_URL)
+        else:
+            from db_schema.create_schema import check_schema_created
+            if not check_schema_created():
+                raise RuntimeError("Database schema not created. Please run 'python db_schema/create_schema.py' first.")
+
+    def load(self, key, df):
+        if self.incremental:
+            log_message(f"Incremental update for {key}...")
+            from db_schema import dbmanip
+            if key in dbmanip.NATURAL_KEYS:
+                # An unmigrated table would silently be appended to
+                dbmanip.check_natural_key(key)
+            batch_upsert(key, df, sink=self.sink)
+            self.loaded[key] = df
+        else:
+            from db_schema import dbmanip
+            getattr(dbmanip, f"load_{key}")(df, self.full_reload)
+
+    def finish(self):
+        rollups.update_after_load(self.loaded if self.incremental else None, self.database_url)
+
+    def close(self):
+        self.loaded = {}
+        if self.sink is not None:
+            self.sink.close()
+
+def load_all_data(transformed_data, on_table_loaded=None):
+    """
+    Load all transformed datasets into the local database.
+    Args:
+        transformed_data (dict): Dictionary of DataFrames, plus 'full_reload'
+            to truncate each table before it is loaded
+        on_table_loaded (callable): Optional callback(key, rows) run after each table is loaded
+    """
+    loader = Loader(full_reload=transformed_data.get('full_reload', False))
+    load_tables(loader, transformed_data, on_table_loaded=on_table_loaded)
+
+def load_incremental(transformed_data, tables_to_update=None, on_table_loaded=None):
+    """
+    Upsert only specific tables into the local database.
+    Args:
+        transformed_data (dict): Dictionary of DataFrames
+        tables_to_update (list): List of keys to update (e.g. ['orders', 'order_items'])
+        on_table_loaded (callable): Optional callback(key, rows) run after each table is loaded
+    """
+    load_tables(Loader(incremental=True), transformed_data, tables_to_update, on_table_loaded)
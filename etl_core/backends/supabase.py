@@ -0,0 +1,75 @@
+import os
+from supabase import create_client
+from ..load import batch_upsert
+from ..sinks import get_sink
+from ..utils import log_message, warning_message
+from . import load_tables
+from db_schema import rollups
+
+# One client per process; forked workers must not share the parent's connections
+_clients = {}
+
+def get_supabase_client():
+    pid = os.getpid()
+    if pid in _clients:
+        return _clients[pid]
+    url = os.environ.get("SUPABASE_URL")
+    key = os.environ.get("SUPERKEY")
+    if not url or not key:
+        raise ValueError("SUPABASE_URL and SUPERKEY must be set in environment variables.")
+    _clients[pid] = create_client(url, key)
+    return _clients[pid]
+
+class Loader:
+    """
+    Upserts tables into Supabase one at a time, then brings the KPI rollups
+    up to date: rebuilt after a full load, refreshed for the touched days
+    after an incremental one. Rollups are only touched when DATABASE_URL is
+    the database of the project just loaded.
+    """
+    def __init__(self, incremental=False, full_reload=False):
+        self.incremental = incremental
+        self.full_reload = full_reload
+        self.loaded = {}
+
+    def load(self, key, df):
+        if self.incremental:
+            log_message(f"Incremental update for {key}...")
+        # Table names match the data keys
+        batch_upsert(key, df)
+        if self.incremental:
+            self.loaded[key] = df
+
+    def finish(self):
+        if get_sink().name != 'supabase':
+            # e.g. the mock or null sink: nothing reached a database
+            return
+        database_url = rollups.supabase_database_url()
+        if database_url is None:
+            if rollups.enabled():
+                warning_message("DATABASE_URL is not the database of SUPABASE_URL; skipping KPI rollups.")
+            return
+        # Keep the KPI rollups current for just the days an incremental load touched
+        rollups.update_after_load(self.loaded if self.incremental else None, database_url)
+
+    def close(self):
+        self.loaded = {}
+
+def load_all_data(transformed_data, on_table_loaded=None):
+    """
+    Load all transformed datasets into Supabase.
+    Args:
+        transformed_data (dict): Dictionary of DataFrames
+        on_table_loaded (callable): Optional callback(key, rows) run after each table is loaded
+    """
+    load_tables(Loader(), transformed_data, on_table_loaded=on_table_loaded)
+
+def load_incremental(transformed_data, tables_to_update=None, on_table_loaded=None):
+    """
+    Load only specific tables or new data.
+    Args:
+        transformed_data (dict): Dictionary of DataFrames
+        tables_to_update (list): List of keys to update (e.g. ['orders', 'order_items'])
+        on_table_loaded (callable): Optional callback(key, rows) run after each table is loaded
+    """
+    load_tables(Loader(incremental=True), transformed_data, tables_to_update, on_table_loaded)
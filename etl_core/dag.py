@@ -0,0 +1,313 @@
+import contextvars
+import hashlib
+import inspect
+import os
+import pickle
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+from instrumentation import span
+from .utils import log_message, warning_message
+
+class Node:
+    """
+    One step of a pipeline, called with the results of its `deps` in order.
+
+    A node with a `fingerprint` (a string, or a callable returning one) has a
+    cache key: the fingerprint chained with the keys of its dependencies, so
+    it changes whenever the node or anything upstream of it changes. A
+    fingerprint of None means the inputs cannot be identified, and neither
+    the node nor anything downstream of it is cached.
+
+    Only nodes with `cache=True` are stored; a node with a fingerprint but
+    `cache=False` (e.g. an extract, cheaper to re-read than to store) still
+    lets its dependents be cached. `group` names a pool of nodes whose
+    concurrency can be limited, e.g. the loads.
+    """
+    def __init__(self, name, fn, deps=(), fingerprint=None, cache=False, group=None):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+        self.fingerprint = fingerprint
+        self.cache = cache
+        self.group = group
+
+    def __repr__(self):
+        return f"Node({self.name!r}, deps={list(self.deps)})"
+
+def topological_order(deps):
+    """
+    Order names so each comes after its dependencies, keeping the given order
+    wherever the dependencies allow it.
+
+    Arguments:
+        deps (dict): Dependencies of each name; names not in the dict are ignored.
+
+    Returns:
+        list: The ordered names.
+    """
+    order = []
+    done = set()
+    remaining = list(deps)
+    while remaining:
+        ready = [name for name in remaining if all(d in done or d not in deps for d in deps[name])]
+        if not ready:
+            raise ValueError(f"Dependency cycle between {', '.join(remaining)}")
+        for name in ready:
+            order.append(name)
+            done.add(name)
+        remaining = [name for name in remaining if name not in done]
+    return order
+
+def file_fingerprint(path):
+    """
+    Identify a file by path, size and modification time, or None if it is missing.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+def _helper_modules(module):
+    # The module and every module of its package it uses, directly or not
+    package = module.__name__.split('.')[0]
+    found = {}
+    stack = [module]
+    while stack:
+        module = stack.pop()
+        if module.__name__ in found:
+            continue
+        found[module.__name__] = module
+        for value in vars(module).values():
+            used = value if inspect.ismodule(value) else inspect.getmodule(value)
+            if used is not None and used.__name__.split('.')[0] == package:
+                stack.append(used)
+    return [found[name] for name in sorted(found)]
+
+def source_fingerprint(fn):
+    """
+    Identify a function by the source of its module, of the modules of its
+    package that module uses (e.g. the shared helpers in etl_core.frames),
+    and the pandas version, so editing any of them or upgrading pandas
+    invalidates cached results.
+    """
+    module = inspect.getmodule(fn)
+    digest = hashlib.sha256()
+    try:
+        for used in _helper_modules(module):
+            digest.update(used.__name__.encode() + b'\0' + inspect.getsource(used).encode())
+    except (OSError, TypeError, AttributeError):
+        digest.update(fn.__qualname__.encode())
+    return f"{digest.hexdigest()}:{pd.__version__}"
+
+class _StaleCache(Exception):
+    """
+    A cache entry could not be read, so the nodes it stood in for must run.
+    """
+
+class Dag:
+    """
+    A set of nodes run by a thread-pool scheduler.
+
+    Each node starts as soon as all its dependencies have finished, so
+    independent nodes (e.g. the transforms of different tables) overlap. A
+    result is dropped once every node that needs it has run, unless it was
+    asked for. Cacheable results are pickled to `cache_dir`; a node whose
+    cache entry matches its key is read back instead of run, and its
+    dependencies are skipped entirely unless something else needs them.
+    """
+    def __init__(self, nodes=(), cache_dir=None):
+        self.nodes = {}
+        self.cache_dir = cache_dir
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node):
+        if node.name in self.nodes:
+            raise ValueError(f"Duplicate node {node.name}")
+        self.nodes[node.name] = node
+        return node
+
+    def upstream(self, targets):
+        """
+        The targets and every node they depend on, directly or not.
+        """
+        found = {}
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name in found:
+                continue
+            if name not in self.nodes:
+                raise KeyError(f"Unknown node {name}")
+            found[name] = self.nodes[name].deps
+            stack.extend(found[name])
+        return found
+
+    def _keys(self, targets):
+        # Only the nodes a run could touch are fingerprinted
+        keys = {}
+        for name in topological_order(self.upstream(targets)):
+            node = self.nodes[name]
+            fingerprint = node.fingerprint() if callable(node.fingerprint) else node.fingerprint
+            dep_keys = [keys.get(d) for d in node.deps]
+            if fingerprint is None or None in dep_keys:
+                keys[name] = None
+                continue
+            digest = hashlib.sha256(name.encode())
+            for part in [fingerprint] + dep_keys:
+                digest.update(b'\0' + part.encode())
+            keys[name] = digest.hexdigest()
+        return keys
+
+    def _cache_path(self, name, key):
+        safe_name = ''.join(c if c.isalnum() or c in '-_' else '_' for c in name)
+        return os.path.join(self.cache_dir, f"{safe_name}.{key[:16]}.pkl")
+
+    def _cached(self, name, keys):
+        node = self.nodes[name]
+        if not (node.cache and self.cache_dir and keys.get(name)):
+            return None
+        path = self._cache_path(name, keys[name])
+        return path if os.path.exists(path) else None
+
+    def _store(self, name, key, result):
+        path = self._cache_path(name, key)
+        prefix = os.path.basename(path).split('.')[0] + '.'
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+            # Entries for older inputs of this node can never be hit again
+            for entry in os.listdir(self.cache_dir):
+                if entry.startswith(prefix) and entry.endswith('.pkl') and entry != os.path.basename(path):
+                    os.remove(os.path.join(self.cache_dir, entry))
+        except OSError as e:
+            warning_message(f"Could not cache {name}: {e}")
+
+    def _execute(self, name, inputs, key, cached_path):
+        node = self.nodes[name]
+        start = time.perf_counter()
+        with span(name, cached=bool(cached_path)) as s:
+            if cached_path:
+                try:
+                    with open(cached_path, 'rb') as f:
+                        result = pickle.load(f)
+                except Exception as e:
+                    warning_message(f"Discarding unreadable cache entry for {name}: {e}")
+                    try:
+                        os.remove(cached_path)
+                    except OSError:
+                        pass
+                    raise _StaleCache(name)
+            else:
+                result = node.fn(*inputs)
+                if node.cache and key and self.cache_dir:
+                    self._store(name, key, result)
+            # Rows handled: the length of the result, or the result itself if it is a count
+            if isinstance(result, int):
+                s.rows = result
+            elif hasattr(result, '__len__'):
+                s.rows = len(result)
+        return result, time.perf_counter() - start
+
+    def run(self, targets=None, max_workers=None, limits=None, on_done=None):
+        """
+        Run the nodes needed for `targets` and return their results.
+
+        Arguments:
+            targets (list): Names of the nodes whose results are wanted; all by default.
+            max_workers (int): Threads running nodes at once.
+            limits (dict): Most nodes of a group running at once, e.g. {'load': 1}.
+            on_done (callable): Optional callback(name, seconds, cached) after each node.
+
+        Returns:
+            dict: Result of each target.
+        """
+        targets = list(self.nodes if targets is None else targets)
+        limits = limits or {}
+        keys = self._keys(targets)
+        # Results of finished nodes, kept across replans so nothing runs twice
+        results = {}
+
+        while True:
+            # Walk up from the targets; a cache hit, or a node that already
+            # finished before a replan, cuts off everything above it
+            cached = {}
+            needed = {}
+            stack = list(reversed(targets))
+            while stack:
+                name = stack.pop()
+                if name in needed:
+                    continue
+                cached[name] = None if name in results else self._cached(name, keys)
+                needed[name] = () if cached[name] or name in results else self.nodes[name].deps
+                stack.extend(needed[name])
+            order = [name for name in topological_order(needed) if name not in results]
+
+            waiting = {name: {d for d in needed[name] if d not in results} for name in order}
+            dependents = {name: [] for name in needed}
+            users = {name: targets.count(name) for name in needed}
+            for name in order:
+                for dep in needed[name]:
+                    dependents[dep].append(name)
+                    users[dep] += 1
+            for name in list(results):
+                if not users.get(name):
+                    del results[name]
+
+            stale = False
+            ready = [name for name in order if not waiting[name]]
+            running = {}
+            if len(order) < len(self.nodes) or any(cached.values()):
+                hits = sum(1 for path in cached.values() if path)
+                log_message(f"Running {len(order) - hits} of {len(self.nodes)} pipeline steps ({hits} cached).")
+
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                def submit_ready():
+                    for name in list(ready):
+                        group = self.nodes[name].group
+                        if group in limits and sum(1 for n in running.values() if self.nodes[n].group == group) >= limits[group]:
+                            continue
+                        ready.remove(name)
+                        inputs = [results[d] for d in needed[name]]
+                        # Each node runs in a copy of this context, so its span joins the current trace run
+                        future = pool.submit(contextvars.copy_context().run, self._execute, name, inputs, keys[name], cached[name])
+                        running[future] = name
+
+                submit_ready()
+                # After a stale entry nothing new starts, but the nodes already
+                # running are seen through, so their results are kept
+                while running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = running.pop(future)
+                        try:
+                            results[name], seconds = future.result()
+                        except _StaleCache:
+                            # The entry is gone now, so planning again runs what it stood in for
+                            stale = True
+                            continue
+                        except Exception:
+                            for other in running:
+                                other.cancel()
+                            raise
+                        if on_done:
+                            on_done(name, seconds, bool(cached[name]))
+                        for dep in needed[name]:
+                            users[dep] -= 1
+                            if not users[dep]:
+                                del results[dep]
+                        for dependent in dependents[name]:
+                            waiting[dependent].discard(name)
+                            if not waiting[dependent]:
+                                ready.append(dependent)
+                    if not stale:
+                        submit_ready()
+
+            if not stale:
+                return {name: results[name] for name in targets}
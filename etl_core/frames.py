@@ -0,0 +1,54 @@
+import pandas as pd
+
+# Ownership contract for the DataFrames passed along the pipeline:
+#   - A function never modifies a frame it was given. Transforms start from
+#     `own(data)` and build their result on it.
+#   - A returned frame may share column memory with its input, so neither
+#     may be modified in place afterwards; build a new frame instead.
+# Under copy-on-write, always on from pandas 3, this is cheap: `own` is a
+# shallow copy, unchanged columns are never copied, and replacing a column
+# only allocates that column. Older pandas is left as the process set it;
+# without copy-on-write `own` falls back to a full copy.
+
+def copy_on_write():
+    """
+    Whether pandas copies shared data on write in this process.
+    """
+    return int(pd.__version__.split('.')[0]) >= 3 or pd.get_option('mode.copy_on_write') is True
+
+def own(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    A frame the caller may add or replace columns on without touching
+    `data`. No data is copied under copy-on-write.
+    """
+    return data.copy(deep=not copy_on_write())
+
+def drop_incomplete_and_duplicates(data: pd.DataFrame, max_missing=1, unique=None) -> pd.DataFrame:
+    """
+    Drop rows missing more than `max_missing` values, then exact duplicate
+    rows and, if `unique` is given, later rows repeating those columns.
+
+    Same result as chaining dropna(thresh=...), drop_duplicates() and
+    drop_duplicates(subset=unique), but with at most two row selections
+    instead of a full copy per step, and none when every row is kept.
+
+    Arguments:
+        data (pd.DataFrame): The frame to clean.
+        max_missing (int): Most missing values a kept row may have.
+        unique (list): Columns whose first occurrence alone is kept.
+
+    Returns:
+        pd.DataFrame: The kept rows.
+    """
+    complete = (data.notna().sum(axis=1) >= len(data.columns) - max_missing).to_numpy()
+    if not complete.all():
+        # Selected first, so duplicates are only hashed for the rows that remain
+        data = data[complete]
+    keep = ~data.duplicated().to_numpy()
+    if unique is not None:
+        # Only rows kept so far can be the first occurrence of a key
+        kept = keep.nonzero()[0]
+        keep[kept[data[unique].iloc[kept].duplicated().to_numpy()]] = False
+    if keep.all():
+        return data
+    return data[keep]
@@ -0,0 +1,66 @@
+import time
+import pandas as pd
+from instrumentation import counter, histogram, span
+from .utils import log_message, error_message, success_message
+from .sinks import get_sink
+from .frames import own
+
+ROWS_LOADED = counter('etl_rows_loaded_total', 'Rows upserted, per table.')
+BYTES_SENT = counter('etl_bytes_sent_total', 'JSON payload bytes sent in upserts, per table.')
+BATCH_FAILURES = counter('etl_upsert_failures_total', 'Upsert batches that failed, per table.')
+BATCH_SECONDS = histogram('etl_upsert_batch_seconds', 'Latency of one upsert batch, per table.')
+
+def batch_upsert(table_name, df, batch_size=1000, sink=None):
+    """
+    Serialize a DataFrame to JSON-ready records and upsert them in batches.
+
+    Arguments:
+        table_name (str): Target table.
+        df (pd.DataFrame): Rows to upsert.
+        batch_size (int): Records per request.
+        sink (Sink): Where to send the batches; the process default
+            (ETL_SINK, see etl_core.sinks) if not given.
+    """
+    sink = sink or get_sink()
+    
+    with span(f"serialize:{table_name}", rows=len(df)):
+        # Pre-process DataFrame for JSON serialization. `df` belongs to the
+        # caller: columns are replaced on a shallow copy, so only the
+        # converted columns are materialized (see etl_core.frames)
+        df_clean = own(df)
+        for col in df_clean.columns:
+            values = df_clean[col]
+            if pd.api.types.is_datetime64_any_dtype(values):
+                # Convert datetime objects to ISO format strings
+                df_clean[col] = values.apply(lambda x: x.isoformat() if pd.notnull(x) else None)
+            elif values.hasnans:
+                # Handle NaN -> None for JSON compatibility
+                df_clean[col] = values.astype('object').where(values.notna(), None)
+
+        records = df_clean.to_dict('records')
+    total = len(records)
+    
+    log_message(f"Upserting {total} records into {table_name}...", sink=sink.name)
+    
+    start = time.perf_counter()
+    for i in range(0, total, batch_size):
+        batch = records[i:i+batch_size]
+        batch_start = time.perf_counter()
+        try:
+            with span(f"upsert_batch:{table_name}", rows=len(batch)):
+                sent = sink.upsert(table_name, batch)
+        except Exception as e:
+            BATCH_FAILURES.inc(table=table_name)
+            error_message(f"Failed to upsert batch to {table_name}: {e}", table=table_name, offset=i)
+            raise e
+        BATCH_SECONDS.observe(time.perf_counter() - batch_start, table=table_name)
+        ROWS_LOADED.inc(len(batch), table=table_name)
+        if sent is not None:
+            # Counted by the sink as it sends, so the batch is never encoded twice
+            BYTES_SENT.inc(sent, table=table_name)
+    elapsed = time.perf_counter() - start
+    success_message(
+        f"Completed upsert for {table_name}",
+        table=table_name, sink=sink.name, rows=total, seconds=round(elapsed, 3),
+        rows_per_second=round(total / elapsed, 1) if elapsed else None
+    )
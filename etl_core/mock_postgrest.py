@@ -0,0 +1,163 @@
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# A syntactically valid (unsigned) JWT; the Supabase client refuses keys that are not JWT-shaped
+MOCK_KEY = "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJyb2xlIjoic2VydmljZV9yb2xlIn0.bW9jaw"
+
+class MockPostgrest:
+    """
+    A local stand-in for a Supabase project's PostgREST API, for load tests.
+
+    Accepts the upserts the loader sends (POST /rest/v1/<table>) and answers
+    reads (GET /rest/v1/<table>?select=...&order=...&offset=...&limit=...)
+    from what it was sent. Every request waits `latency_ms` plus up to
+    `jitter_ms`, and fails with a 503 with probability `error_rate`, so the
+    loader's concurrency and failure handling can be exercised without a
+    network.
+
+    Arguments:
+        host (str): Interface to listen on.
+        port (int): Port to listen on; 0 picks a free one.
+        latency_ms (float): Fixed delay added to every request.
+        jitter_ms (float): Extra random delay, uniform in [0, jitter_ms].
+        error_rate (float): Fraction of requests answered with a 503.
+        keep_rows (bool): Store upserted rows so they can be read back.
+        seed (int): Seed for the jitter and error injection.
+    """
+    def __init__(self, host='127.0.0.1', port=0, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, keep_rows=False, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.keep_rows = keep_rows
+        self.random = random.Random(seed)
+        self.tables = {}
+        self.stats = {'requests': 0, 'rows': 0, 'bytes': 0, 'errors': 0}
+        self._lock = threading.Lock()
+        self._thread = None
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name='mock-postgrest', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _delay_and_fail(self):
+        # Decide under the lock so a seeded server is reproducible; sleep outside it
+        with self._lock:
+            delay = self.latency_ms + self.random.uniform(0, self.jitter_ms)
+            fail = self.random.random() < self.error_rate
+            self.stats['requests'] += 1
+            if fail:
+                self.stats['errors'] += 1
+        if delay:
+            time.sleep(delay / 1000)
+        return fail
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, status, payload):
+                body = json.dumps(payload, default=str).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _table(self):
+                path = urlparse(self.path).path
+                if not path.startswith('/rest/v1/'):
+                    self._reply(404, {'message': f"Unknown path {path}"})
+                    return None
+                return path[len('/rest/v1/'):]
+
+            def do_POST(self):
+                table = self._table()
+                if table is None:
+                    return
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if mock._delay_and_fail():
+                    self._reply(503, {'message': 'Injected failure', 'code': 'PGRST503', 'details': None, 'hint': None})
+                    return
+                rows = json.loads(body or b'[]')
+                if isinstance(rows, dict):
+                    rows = [rows]
+                with mock._lock:
+                    mock.stats['rows'] += len(rows)
+                    mock.stats['bytes'] += len(body)
+                    if mock.keep_rows:
+                        mock.tables.setdefault(table, []).extend(rows)
+                # Like Prefer: return=representation, which the Supabase client asks for
+                if 'return=minimal' in self.headers.get('Prefer', ''):
+                    self._reply(201, [])
+                else:
+                    self._reply(201, rows)
+
+            def do_GET(self):
+                table = self._table()
+                if table is None:
+                    return
+                if mock._delay_and_fail():
+                    self._reply(503, {'message': 'Injected failure', 'code': 'PGRST503', 'details': None, 'hint': None})
+                    return
+                query = parse_qs(urlparse(self.path).query)
+                with mock._lock:
+                    rows = list(mock.tables.get(table, []))
+                if 'order' in query:
+                    # A single column, as "column.asc" or "column.desc"
+                    column, _, direction = query['order'][0].partition('.')
+                    rows.sort(key=lambda row: row.get(column), reverse=direction.startswith('desc'))
+                offset = int(query['offset'][0]) if 'offset' in query else 0
+                end = offset + int(query['limit'][0]) if 'limit' in query else None
+                rows = rows[offset:end]
+                select = query.get('select', ['*'])[0]
+                if select != '*':
+                    columns = select.split(',')
+                    rows = [{c: row.get(c) for c in columns} for row in rows]
+                self._reply(200, rows)
+
+            def log_message(self, format, *args):
+                # One line per request would drown out the pipeline's own logs
+                pass
+
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local PostgREST stand-in for load testing the loader.")
+    parser.add_argument('--host', type=str, default='127.0.0.1', help="Interface to listen on.")
+    parser.add_argument('--port', type=int, default=54321, help="Port to listen on.")
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="Delay added to every request.")
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help="Extra random delay per request.")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests failed with a 503.")
+    parser.add_argument('--keep-rows', action='store_true', help="Keep upserted rows so they can be read back.")
+    args = parser.parse_args()
+
+    mock = MockPostgrest(args.host, args.port, args.latency_ms, args.jitter_ms, args.error_rate, args.keep_rows)
+    print(f"Mock PostgREST listening on {mock.url}")
+    print(f"Point the loader at it with SUPABASE_URL={mock.url} SUPERKEY={MOCK_KEY}")
+    try:
+        mock.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        mock.server.server_close()
+        print(f"Served: {mock.stats}")
+
+if __name__ == "__main__":
+    main()
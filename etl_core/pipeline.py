@@ -0,0 +1,257 @@
+from .extract import extract_data
+from .transform.customers import transform_customers
+from .transform.geolocation import transform_geolocation, transform_geolocation_points
+from .transform.orders_items import transform_order_items
+from .transform.order_payments import transform_order_payments
+from .transform.order_reviews import transform_order_reviews
+from .transform.orders import transform_orders
+from .transform.products import transform_products
+from .transform.sellers import transform_sellers
+from .backends import BACKENDS, TABLE_DEPENDENCIES, get_backend
+from .dag import Dag, Node, file_fingerprint, source_fingerprint
+from .utils import log_message, warning_message, error_message, success_message
+from instrumentation import span, trace_run
+import os
+import sys
+import argparse
+from functools import partial
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Root directory of the project
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Olist CSV file for each dataset key
+DATASET_FILES = {
+    'customers': "data/olist_customers_dataset.csv",
+    'geolocation': "data/olist_geolocation_dataset.csv",
+    'order_items': "data/olist_order_items_dataset.csv",
+    'order_payments': "data/olist_order_payments_dataset.csv",
+    'order_reviews': "data/olist_order_reviews_dataset.csv",
+    'orders': "data/olist_orders_dataset.csv",
+    'products': "data/olist_products_dataset.csv",
+    'sellers': "data/olist_sellers_dataset.csv",
+}
+
+# Transformer for each dataset key
+TRANSFORMS = {
+    'customers': transform_customers,
+    'geolocation': transform_geolocation,
+    'geolocation_points': transform_geolocation_points,
+    'order_items': transform_order_items,
+    'order_payments': transform_order_payments,
+    'order_reviews': transform_order_reviews,
+    'orders': transform_orders,
+    'products': transform_products,
+    'sellers': transform_sellers,
+}
+
+# Tables transformed from another table's CSV
+SHARED_EXTRACTS = {
+    'geolocation_points': 'geolocation',
+}
+
+# Tables built only when asked for by name, or by default with
+# ETL_GEOLOCATION_POINTS=1: the fine-grained geolocation points, ~50x the
+# rows of the per-zip-prefix geolocation table
+OPTIONAL_TABLES = ['geolocation_points']
+
+def default_tables():
+    if os.environ.get('ETL_GEOLOCATION_POINTS', '').lower() in ('1', 'true', 'yes'):
+        return list(TRANSFORMS)
+    return [key for key in TRANSFORMS if key not in OPTIONAL_TABLES]
+
+# Transformed tables are cached here between runs and reused while their CSV
+# and transform are unchanged; ETL_CACHE_DIR="" turns the cache off
+CACHE_DIR = os.environ.get('ETL_CACHE_DIR', os.path.join(root, '.cache', 'etl'))
+
+# Threads running pipeline steps; pandas releases the GIL for much of the
+# CSV parsing and column conversion, so the tables' steps overlap
+THREADS = int(os.environ.get('ETL_THREADS', min(8, os.cpu_count() or 1)))
+
+# Loads run one at a time: they share the backend's client or connection
+LOAD_CONCURRENCY = 1
+
+def _load_step(loader, key, on_table_loaded):
+    # Called with the transformed table, then the (unused) results of the parent tables' loads
+    def load(df, *parents):
+        if df is None or df.empty:
+            return 0
+        loader.load(key, df)
+        if on_table_loaded:
+            on_table_loaded(key, len(df))
+        return len(df)
+    return load
+
+def build_dag(loader=None, tables=None, on_table_loaded=None):
+    """
+    The pipeline as a DAG: extract:<table> -> transform:<table> -> load:<table>
+    for every dataset, each load also waiting for the loads of the tables it
+    references (TABLE_DEPENDENCIES). Transforms are cached on the CSV's size
+    and mtime and the transform's source.
+
+    Arguments:
+        loader: A backend Loader; without one the DAG has no load steps.
+        tables (list): Keys of the tables to load; default_tables() by default.
+        on_table_loaded (callable): Optional callback(key, rows) run after each table is loaded
+
+    Returns:
+        Dag: The pipeline.
+    """
+    tables = default_tables() if tables is None else tables
+    unknown = sorted(set(tables) - set(TRANSFORMS))
+    if unknown:
+        raise ValueError(f"Unknown tables: {', '.join(unknown)}; expected some of {', '.join(TRANSFORMS)}")
+
+    dag = Dag(cache_dir=CACHE_DIR or None)
+    for key, path in DATASET_FILES.items():
+        path = os.path.join(root, path)
+        dag.add(Node(f"extract:{key}", partial(extract_data, path), fingerprint=partial(file_fingerprint, path)))
+    for key, transform in TRANSFORMS.items():
+        dag.add(Node(
+            f"transform:{key}", transform, deps=[f"extract:{SHARED_EXTRACTS.get(key, key)}"],
+            fingerprint=source_fingerprint(transform), cache=True
+        ))
+
+    if loader is not None:
+        loaded = [key for key in TRANSFORMS if key in tables]
+        for key in loaded:
+            parents = [f"load:{parent}" for parent in TABLE_DEPENDENCIES[key] if parent in loaded]
+            dag.add(Node(
+                f"load:{key}", _load_step(loader, key, on_table_loaded),
+                deps=[f"transform:{key}"] + parents, group='load'
+            ))
+    return dag
+
+def run_pipeline(loader=None, tables=None, on_table_loaded=None, on_step_done=None):
+    """
+    Extract, transform and (given a loader) load the datasets, each step
+    starting as soon as its inputs are ready. Only the steps the requested
+    tables need are run, so refreshing orders never reads the geolocation CSV.
+
+    Arguments:
+        loader: A backend Loader, e.g. get_backend().Loader(incremental=True).
+        tables (list): Keys of the tables to produce; default_tables() by default.
+        on_table_loaded (callable): Optional callback(key, rows) run after each table is loaded
+        on_step_done (callable): Optional callback(step, seconds, cached) after each step
+
+    Returns:
+        dict: Without a loader, the transformed DataFrames keyed by dataset
+            name; with one, the rows loaded per table.
+    """
+    tables = default_tables() if tables is None else tables
+    stage = 'transform' if loader is None else 'load'
+    targets = [f"{stage}:{key}" for key in TRANSFORMS if key in tables]
+    try:
+        dag = build_dag(loader, tables, on_table_loaded)
+        results = dag.run(targets, max_workers=THREADS, limits={'load': LOAD_CONCURRENCY}, on_done=on_step_done)
+        if loader is not None:
+            loader.finish()
+    finally:
+        if loader is not None:
+            loader.close()
+    return {name.split(':', 1)[1]: result for name, result in results.items()}
+
+def extract_all():
+    """
+    Extract every raw dataset from the data directory.
+
+    Returns:
+        dict: Raw DataFrames keyed by dataset name.
+    """
+    try:
+        datasets = {}
+        for key, path in DATASET_FILES.items():
+            with span(f"extract:{key}") as s:
+                datasets[key] = extract_data(os.path.join(root, path))
+                s.rows = len(datasets[key])
+        success_message("Data extraction completed.")
+        return datasets
+    except Exception as e:
+        error_message(f"Data extraction failed: {e}")
+        raise e
+
+def transform_all(datasets):
+    """
+    Transform every raw dataset returned by extract_all.
+
+    Returns:
+        dict: Transformed DataFrames keyed by dataset name.
+    """
+    try:
+        transformed_data = {}
+        for key, df in datasets.items():
+            with span(f"transform:{key}", rows=len(df)):
+                transformed_data[key] = TRANSFORMS[key](df)
+        success_message("Data transformation completed.")
+        return transformed_data
+    except Exception as e:
+        error_message(f"Data transformation failed: {e}")
+        raise e
+
+def extract_and_transform(tables=None):
+    """
+    Extract and transform the given tables (all of them by default).
+
+    Returns:
+        dict: Transformed DataFrames keyed by dataset name.
+    """
+    log_message("Starting Extract and Transform...")
+    with span('extract_and_transform'):
+        return run_pipeline(tables=tables)
+
+def run_etl_process(full_reload=False, backend=None):
+    """
+    Run the complete ETL process.
+
+    Arguments:
+        full_reload (bool): Reload every table (the SQLAlchemy backend truncates them first).
+        backend (str): Backend to load into (see etl_core.backends); ETL_BACKEND, else supabase.
+    """
+    log_message("ETL process started.")
+    try:
+        loader = get_backend(backend).Loader(full_reload=full_reload)
+        with trace_run('etl'):
+            run_pipeline(loader)
+        success_message("ETL process finished successfully.")
+    except Exception as e:
+        error_message(f"ETL process failed: {e}")
+
+def run_incremental_etl(tables_to_update=None, backend=None):
+    """
+    Upsert the given tables (all of them by default) without a full reload.
+
+    Arguments:
+        tables_to_update (list): Keys of the tables to update.
+        backend (str): Backend to load into; ETL_BACKEND, else supabase.
+    """
+    log_message("Incremental ETL process started.")
+    try:
+        loader = get_backend(backend).Loader(incremental=True)
+        with trace_run('incremental_etl'):
+            run_pipeline(loader, tables_to_update)
+        success_message("Incremental ETL process finished successfully.")
+    except Exception as e:
+        error_message(f"Incremental ETL process failed: {e}")
+
+def main(default_backend=None):
+    """
+    Command-line entry point shared by etl_prod.main, etl_local.main and etl.main.
+    """
+    parser = argparse.ArgumentParser(description="Run ETL Process")
+    parser.add_argument('--full-reload', action='store_true', help="Full reload of data")
+    parser.add_argument('--incremental', action='store_true', help="Run incremental update")
+    parser.add_argument('--tables', nargs='+', choices=list(TRANSFORMS), help="Specific tables to update incrementally")
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default=default_backend, help=f"Where to load the data (default: {default_backend or 'ETL_BACKEND, else supabase'})")
+    
+    args = parser.parse_args()
+    
+    if args.incremental:
+        run_incremental_etl(args.tables, backend=args.backend)
+    else:
+        run_etl_process(full_reload=args.full_reload, backend=args.backend)
+
+if __name__ == "__main__":
+    main()
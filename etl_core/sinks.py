@@ -0,0 +1,150 @@
+import os
+import threading
+
+class Sink:
+    """
+    Where batch_upsert sends its batches. A sink upserts a list of JSON-ready
+    records (datetimes already ISO strings, NaN already None) into a table,
+    and returns the size in bytes of the payload it sent, or None if it sends
+    no payload or cannot tell without encoding the records again.
+    """
+    name = 'sink'
+
+    def upsert(self, table_name, records):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class SupabaseSink(Sink):
+    """
+    Upserts through the Supabase client, i.e. PostgREST over HTTPS.
+    """
+    name = 'supabase'
+
+    def __init__(self, client=None):
+        self.client = client
+        # Size of the last request body sent by each thread
+        self._sent = threading.local()
+
+    def _count_payload(self, request):
+        # httpx has already encoded the body; its length is in the headers
+        self._sent.bytes = int(request.headers.get('content-length', 0))
+
+    def upsert(self, table_name, records):
+        if self.client is None:
+            from .backends.supabase import get_supabase_client
+            self.client = get_supabase_client()
+        # The client rebuilds its PostgREST session on auth changes, so the hook is checked each time
+        session = self.client.postgrest.session
+        hooks = session.event_hooks
+        if self._count_payload not in hooks['request']:
+            session.event_hooks = {**hooks, 'request': [*hooks['request'], self._count_payload]}
+        self._sent.bytes = None
+        self.client.table(table_name).upsert(records).execute()
+        return self._sent.bytes
+
+class SqlAlchemySink(Sink):
+    """
+    Upserts straight into a database with SQLAlchemy, e.g. a local Postgres
+    created with db_schema/create_schema.py. Rows are matched on the table's
+    primary key; tables whose key is generated are appended to.
+
+    Arguments:
+        database_url (str): SQLAlchemy URL; SINK_DATABASE_URL, else DATABASE_URL.
+    """
+    name = 'sqlalchemy'
+
+    def __init__(self, database_url=None):
+        from sqlalchemy import MetaData, create_engine
+        self.engine = create_engine(database_url or os.environ.get('SINK_DATABASE_URL') or os.environ['DATABASE_URL'])
+        self.metadata = MetaData()
+        self.tables = {}
+
+    def _table(self, table_name):
+        from sqlalchemy import Table
+        if table_name not in self.tables:
+            self.tables[table_name] = Table(table_name, self.metadata, autoload_with=self.engine)
+        return self.tables[table_name]
+
+    def upsert(self, table_name, records):
+        if not records:
+            return
+        if self.engine.dialect.name == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        table = self._table(table_name)
+        stmt = insert(table).values(records)
+        keys = [c.name for c in table.primary_key.columns]
+        if keys and all(k in records[0] for k in keys):
+            updates = {c: stmt.excluded[c] for c in records[0] if c not in keys}
+            if updates:
+                stmt = stmt.on_conflict_do_update(index_elements=keys, set_=updates)
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=keys)
+        with self.engine.begin() as conn:
+            conn.execute(stmt)
+
+    def close(self):
+        self.engine.dispose()
+
+class MockSink(SupabaseSink):
+    """
+    The Supabase client pointed at an in-process MockPostgrest, so the whole
+    client path (serialization, HTTP, response parsing) runs without a
+    network. Latency and error injection are read from MOCK_LATENCY_MS,
+    MOCK_JITTER_MS and MOCK_ERROR_RATE unless given.
+    """
+    name = 'mock'
+
+    def __init__(self, latency_ms=None, jitter_ms=None, error_rate=None):
+        from supabase import create_client
+        from .mock_postgrest import MOCK_KEY, MockPostgrest
+        self.server = MockPostgrest(
+            latency_ms=float(os.environ.get('MOCK_LATENCY_MS', 0)) if latency_ms is None else latency_ms,
+            jitter_ms=float(os.environ.get('MOCK_JITTER_MS', 0)) if jitter_ms is None else jitter_ms,
+            error_rate=float(os.environ.get('MOCK_ERROR_RATE', 0)) if error_rate is None else error_rate
+        ).start()
+        super().__init__(create_client(self.server.url, MOCK_KEY))
+
+    def close(self):
+        self.server.stop()
+
+class NullSink(Sink):
+    """
+    Accepts and drops every batch; what is left is the loader's own cost.
+    """
+    name = 'null'
+
+    def upsert(self, table_name, records):
+        pass
+
+SINKS = {
+    'supabase': SupabaseSink,
+    'sqlalchemy': SqlAlchemySink,
+    'mock': MockSink,
+    'null': NullSink,
+}
+
+# One sink per process, like the Supabase client; forked workers build their own
+_sinks = {}
+
+def get_sink():
+    """
+    The sink batch_upsert uses by default: ETL_SINK (supabase, sqlalchemy,
+    mock or null), else supabase.
+    """
+    pid = os.getpid()
+    if pid not in _sinks:
+        kind = os.environ.get('ETL_SINK', 'supabase')
+        if kind not in SINKS:
+            raise ValueError(f"Unknown ETL_SINK {kind!r}; expected one of {', '.join(SINKS)}")
+        _sinks[pid] = SINKS[kind]()
+    return _sinks[pid]
+
+def set_sink(sink):
+    """
+    Replace this process's default sink, e.g. with a NullSink in benchmarks.
+    """
+    _sinks[os.getpid()] = sink
@@ -0,0 +1,106 @@
+import importlib
+import os
+import threading
+import time
+import pytest
+from etl_core.dag import Dag, Node, file_fingerprint, source_fingerprint, topological_order
+
+def counting(fn, calls, name):
+    def run(*args):
+        calls.append(name)
+        return fn(*args)
+    return run
+
+def pipeline(calls, cache_dir, fingerprint='v1'):
+    # extract -> transform -> load, with only the transform stored
+    return Dag([
+        Node('extract', counting(lambda: [1, 2, 3], calls, 'extract'), fingerprint='csv'),
+        Node('transform', counting(lambda rows: [r * 10 for r in rows], calls, 'transform'),
+             deps=['extract'], fingerprint=fingerprint, cache=True),
+        Node('load', counting(lambda rows: len(rows), calls, 'load'), deps=['transform'], group='load'),
+    ], cache_dir=str(cache_dir))
+
+def test_topological_order_keeps_given_order_and_rejects_cycles():
+    assert topological_order({'b': ['a'], 'a': [], 'c': []}) == ['a', 'c', 'b']
+    with pytest.raises(ValueError):
+        topological_order({'a': ['b'], 'b': ['a']})
+
+def test_run_returns_targets(tmp_path):
+    calls = []
+    assert pipeline(calls, tmp_path).run(['load', 'transform']) == {'load': 3, 'transform': [10, 20, 30]}
+    assert calls == ['extract', 'transform', 'load']
+
+def test_cache_hit_skips_the_node_and_its_dependencies(tmp_path):
+    calls = []
+    pipeline(calls, tmp_path).run(['load'])
+    calls.clear()
+    assert pipeline(calls, tmp_path).run(['load']) == {'load': 3}
+    assert calls == ['load']
+
+def test_changed_fingerprint_misses_and_replaces_the_entry(tmp_path):
+    calls = []
+    pipeline(calls, tmp_path).run(['load'])
+    calls.clear()
+    pipeline(calls, tmp_path, fingerprint='v2').run(['load'])
+    assert calls == ['extract', 'transform', 'load']
+    assert len([f for f in os.listdir(tmp_path) if f.startswith('transform.')]) == 1
+
+def test_unknown_fingerprint_upstream_disables_caching(tmp_path):
+    calls = []
+    dag = pipeline(calls, tmp_path)
+    dag.nodes['extract'].fingerprint = lambda: None
+    dag.run(['load'])
+    dag.run(['load'])
+    assert calls.count('transform') == 2
+    assert os.listdir(tmp_path) == []
+
+def test_unreadable_entry_replans_without_rerunning_finished_nodes(tmp_path):
+    calls = []
+    dag = pipeline(calls, tmp_path)
+    # A second, independent table whose load finishes before the bad entry is read
+    dag.add(Node('other', counting(lambda: 'done', calls, 'other'), group='load'))
+    dag.run(['load', 'other'])
+    for entry in os.listdir(tmp_path):
+        with open(tmp_path / entry, 'wb') as f:
+            f.write(b'not a pickle')
+    calls.clear()
+    assert dag.run(['load', 'other'], max_workers=1) == {'load': 3, 'other': 'done'}
+    assert sorted(calls) == ['extract', 'load', 'other', 'transform']
+
+def test_group_limit_runs_loads_one_at_a_time():
+    active = []
+    peak = []
+    lock = threading.Lock()
+    def load():
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.02)
+        with lock:
+            active.pop()
+    dag = Dag([Node(f'load:{i}', load, group='load') for i in range(4)])
+    dag.run(max_workers=4, limits={'load': 1})
+    assert max(peak) == 1
+
+def test_file_fingerprint_tracks_size_and_mtime(tmp_path):
+    path = tmp_path / 'data.csv'
+    assert file_fingerprint(str(path)) is None
+    path.write_text('a,b\n')
+    before = file_fingerprint(str(path))
+    path.write_text('a,b\n1,2\n')
+    assert file_fingerprint(str(path)) != before
+
+def test_source_fingerprint_covers_helper_modules(tmp_path, monkeypatch):
+    package = tmp_path / 'fingerprinted'
+    package.mkdir()
+    (package / '__init__.py').write_text('')
+    (package / 'helpers.py').write_text('def clean(data):\n    return data\n')
+    (package / 'transform.py').write_text('from .helpers import clean\n\ndef transform(data):\n    return clean(data)\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    transform = importlib.import_module('fingerprinted.transform')
+    before = source_fingerprint(transform.transform)
+
+    # Editing only the helper changes the transform's fingerprint
+    (package / 'helpers.py').write_text('def clean(data):\n    return data.dropna()\n')
+    os.utime(package / 'helpers.py', ns=(0, 0))
+    assert source_fingerprint(transform.transform) != before
@@ -1,4 +1,5 @@
 import pandas as pd
+from ..frames import own, drop_incomplete_and_duplicates
 
 def transform_customers(data: pd.DataFrame) -> pd.DataFrame:
     """
@@ -10,11 +11,13 @@ def transform_customers(data: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: The transformed and cleaned customers data.
     """
+    data = own(data)
+
     # Convert data types
-    data.customer_id = data.customer_id.astype('string')
-    data.customer_unique_id = data.customer_unique_id.astype('string')
-    data.customer_city = data.customer_city.astype('string')
-    data.customer_state = data.customer_state.astype('string')
+    data['customer_id'] = data['customer_id'].astype('string')
+    data['customer_unique_id'] = data['customer_unique_id'].astype('string')
+    data['customer_city'] = data['customer_city'].astype('string')
+    data['customer_state'] = data['customer_state'].astype('string')
 
     # Clean city names
     data['customer_city'] = data['customer_city'].str.title()
@@ -52,11 +55,8 @@ def transform_customers(data: pd.DataFrame) -> pd.DataFrame:
     data['customer_state_initials'] = data['customer_state']
     data['customer_state'] = data['customer_state'].map(mapping)
 
-    # Drop rows with more than 1 NaN value
-    data = data.dropna(thresh=len(data.columns) - 1)
-
-    # Drop duplicate rows
-    data = data.drop_duplicates()
+    # Drop rows with more than 1 NaN value and duplicate rows
+    data = drop_incomplete_and_duplicates(data, max_missing=1)
 
     return data
 
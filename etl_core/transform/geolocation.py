@@ -0,0 +1,144 @@
+import pandas as pd
+from ..frames import own, drop_incomplete_and_duplicates
+
+ZIP_KEY = 'geolocation_zip_code_prefix'
+PLACE_COLUMNS = ['geolocation_city', 'geolocation_state', 'geolocation_state_initials']
+
+# Decimal places fine-grained points are rounded to; 3 is about 110 m
+POINT_DECIMALS = 3
+# Key columns of a point: its coordinates times 10**POINT_DECIMALS, as
+# integers, so matching rows never depends on floats comparing equal
+POINT_KEY_COLUMNS = ['geolocation_lat_key', 'geolocation_lng_key']
+
+def clean_geolocation(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Clean the geolocation dataset, one row per raw point.
+
+    Arguments:
+        data (pd.DataFrame): The raw geolocation data.
+    Returns:
+        pd.DataFrame: The cleaned geolocation data.
+    """
+    data = own(data)
+
+    # Convert data types
+    data['geolocation_zip_code_prefix'] = data['geolocation_zip_code_prefix'].astype('Int64')
+    data['geolocation_lat'] = data['geolocation_lat'].astype('float64')
+    data['geolocation_lng'] = data['geolocation_lng'].astype('float64')
+    data['geolocation_city'] = data['geolocation_city'].astype('string')
+    data['geolocation_state'] = data['geolocation_state'].astype('string')
+
+    # Clean city names
+    data['geolocation_city'] = data['geolocation_city'].str.title()
+
+    # State mapping from initials to full names
+    mapping = {
+        'SP': 'São Paulo',
+        'RJ': 'Rio de Janeiro',
+        'MG': 'Minas Gerais',
+        'RS': 'Rio Grande do Sul',
+        'PR': 'Paraná',
+        'SC': 'Santa Catarina',
+        'BA': 'Bahia',
+        'DF': 'Distrito Federal',
+        'ES': 'Espírito Santo',
+        'GO': 'Goiás',
+        'PE': 'Pernambuco',
+        'CE': 'Ceará',
+        'PA': 'Pará',
+        'MT': 'Mato Grosso',
+        'MA': 'Maranhão',
+        'MS': 'Mato Grosso do Sul',
+        'PB': 'Paraíba',
+        'PI': 'Piauí',
+        'RN': 'Rio Grande do Norte',
+        'AL': 'Alagoas',
+        'SE': 'Sergipe',
+        'TO': 'Tocantins',
+        'RO': 'Rondônia',
+        'AM': 'Amazonas',
+        'AC': 'Acre',
+        'AP': 'Amapá',
+        'RR': 'Roraima'
+    }
+    data['geolocation_state_initials'] = data['geolocation_state']
+    data['geolocation_state'] = data['geolocation_state'].map(mapping)
+
+    # Drop rows with more than 1 NaN value and duplicate rows
+    data = drop_incomplete_and_duplicates(data, max_missing=1)
+
+    return data
+
+def _modal_places(data, keys):
+    # Most frequent (city, state) of each key; ties go to the first alphabetically
+    counts = data.groupby(keys + PLACE_COLUMNS, dropna=False, observed=True).size().rename('points').reset_index()
+    counts = counts.sort_values(
+        ['points'] + PLACE_COLUMNS, ascending=[False] + [True] * len(PLACE_COLUMNS), kind='stable'
+    )
+    return counts.drop_duplicates(keys).set_index(keys)[PLACE_COLUMNS]
+
+def aggregate_geolocation(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Collapse cleaned geolocation points to one row per zip code prefix: the
+    centroid (mean latitude and longitude) of its points, and the city and
+    state most of them are in. Olist has ~50 points per prefix, nearly all
+    within a few hundred metres of each other.
+
+    Arguments:
+        data (pd.DataFrame): Cleaned geolocation data.
+    Returns:
+        pd.DataFrame: One row per zip code prefix.
+    """
+    centroids = data.groupby(ZIP_KEY)[['geolocation_lat', 'geolocation_lng']].mean()
+    # Prefixes with no point (a missing key) have no centroid and are left out by the join
+    return centroids.join(_modal_places(data, [ZIP_KEY])).reset_index()[list(data.columns)]
+
+def dedupe_geolocation_points(data: pd.DataFrame, decimals=POINT_DECIMALS) -> pd.DataFrame:
+    """
+    Collapse near-duplicate geolocation points: coordinates are rounded to
+    `decimals` places and each zip code prefix keeps one row per rounded
+    point, with the city and state most of the merged points are in. The
+    rounded point is also given as integers (POINT_KEY_COLUMNS), which key
+    the geolocation_points table.
+
+    Arguments:
+        data (pd.DataFrame): Cleaned geolocation data.
+        decimals (int): Decimal places of the rounded coordinates.
+    Returns:
+        pd.DataFrame: One row per zip code prefix and rounded point.
+    """
+    # The rounded point is the key, so points without one cannot be kept
+    points = data[data[[ZIP_KEY, 'geolocation_lat', 'geolocation_lng']].notna().all(axis=1).to_numpy()]
+    points = own(points)
+    scale = 10 ** decimals
+    points['geolocation_lat_key'] = (points['geolocation_lat'] * scale).round().astype('int64')
+    points['geolocation_lng_key'] = (points['geolocation_lng'] * scale).round().astype('int64')
+    keys = [ZIP_KEY] + POINT_KEY_COLUMNS
+    points = _modal_places(points, keys).sort_index().reset_index()
+    # The coordinates are derived from the key, so equal keys give equal values
+    points['geolocation_lat'] = points['geolocation_lat_key'] / scale
+    points['geolocation_lng'] = points['geolocation_lng_key'] / scale
+    return points[list(data.columns) + POINT_KEY_COLUMNS]
+
+def transform_geolocation(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Transform the geolocation dataset into one row per zip code prefix.
+
+    Arguments:
+        data (pd.DataFrame): The raw geolocation data.
+    Returns:
+        pd.DataFrame: The geolocation table, keyed by zip code prefix.
+    """
+    return aggregate_geolocation(clean_geolocation(data))
+
+def transform_geolocation_points(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Transform the geolocation dataset into its distinct points, for the
+    optional fine-grained geolocation_points table.
+
+    Arguments:
+        data (pd.DataFrame): The raw geolocation data.
+    Returns:
+        pd.DataFrame: The geolocation_points table.
+    """
+    return dedupe_geolocation_points(clean_geolocation(data))
@@ -0,0 +1,26 @@
+import pandas as pd
+from ..frames import own, drop_incomplete_and_duplicates
+
+def transform_order_payments(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Transform and clean the order payments dataset.
+
+    Arguments:
+        data (pd.DataFrame): The raw order payments data.
+
+    Returns:
+        pd.DataFrame: The transformed and cleaned order payments data.
+    """
+    data = own(data)
+
+    # Convert data types
+    data['order_id'] = data['order_id'].astype('string')
+    data['payment_sequential'] = data['payment_sequential'].astype('Int64')
+    data['payment_type'] = data['payment_type'].astype('string')
+    data['payment_installments'] = data['payment_installments'].astype('Int64')
+    data['payment_value'] = data['payment_value'].astype('float64')
+
+    # Drop rows with more than 1 NaN value and duplicate rows
+    data = drop_incomplete_and_duplicates(data, max_missing=1)
+
+    return data
\ No newline at end of file
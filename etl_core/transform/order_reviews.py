@@ -0,0 +1,34 @@
+import pandas as pd
+from ..frames import own, drop_incomplete_and_duplicates
+
+def transform_order_reviews(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Transform and clean the order reviews dataset.
+
+    Arguments:
+        data (pd.DataFrame): The raw order reviews data.
+
+    Returns:
+        pd.DataFrame: The transformed and cleaned order reviews data.
+    """
+    data = own(data)
+
+    # Convert data types
+    data['review_id'] = data['review_id'].astype('string')
+    data['order_id'] = data['order_id'].astype('string')
+    data['review_score'] = data['review_score'].astype('Int64')
+    data['review_comment_title'] = data['review_comment_title'].astype('string')
+    data['review_comment_message'] = data['review_comment_message'].astype('string')
+
+    # Convert dates
+    data['review_creation_date'] = pd.to_datetime(data['review_creation_date'])
+    data['review_creation_date'] = data['review_creation_date'].dt.tz_localize(None)
+    data['review_answer_timestamp'] = pd.to_datetime(data['review_answer_timestamp'])
+    data['review_answer_timestamp'] = data['review_answer_timestamp'].dt.tz_localize(None)
+
+    # Drop rows with more than 1 NaN value and duplicate rows.
+    # For duplicate review_ids, keep only the first occurrence per review_id
+    # This ensures we have a valid primary key (order_id) without duplicate review_ids
+    data = drop_incomplete_and_duplicates(data, max_missing=1, unique=['review_id'])
+
+    return data
\ No newline at end of file
@@ -1,4 +1,5 @@
 import pandas as pd
+from ..frames import own, drop_incomplete_and_duplicates
 
 def transform_orders(data: pd.DataFrame) -> pd.DataFrame:
     """
@@ -10,10 +11,12 @@ def transform_orders(data: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: The transformed and cleaned orders data.
     """
+    data = own(data)
+
     # Convert data types
-    data.order_id = data.order_id.astype('string')
-    data.customer_id = data.customer_id.astype('string')
-    data.order_status = data.order_status.astype('string')
+    data['order_id'] = data['order_id'].astype('string')
+    data['customer_id'] = data['customer_id'].astype('string')
+    data['order_status'] = data['order_status'].astype('string')
 
     # Convert timestamps to datetime and remove timezone
     timestamp_columns = [
@@ -36,10 +39,7 @@ def transform_orders(data: pd.DataFrame) -> pd.DataFrame:
                 data[col] = data[col].astype('object')
                 data.loc[mask, col] = None
 
-    # Drop rows with more than 1 NaN value
-    data = data.dropna(thresh=len(data.columns) - 1)
-
-    # Drop duplicate rows
-    data = data.drop_duplicates()
+    # Drop rows with more than 1 NaN value and duplicate rows
+    data = drop_incomplete_and_duplicates(data, max_missing=1)
 
     return data
\ No newline at end of file
@@ -2,6 +2,8 @@
 
 import pandas as pd
 import os
+from ..frames import own, drop_incomplete_and_duplicates
+from ..utils import warning_message
 
 def transform_products(data: pd.DataFrame) -> pd.DataFrame:
     """
@@ -13,16 +15,18 @@ def transform_products(data: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: The transformed and cleaned products data.
     """
+    data = own(data)
+
     # Convert data types
-    data.product_id = data.product_id.astype('string')
-    data.product_category_name = data.product_category_name.astype('string')
-    data.product_name_lenght = data.product_name_lenght.astype('Int64')
-    data.product_description_lenght = data.product_description_lenght.astype('Int64')
-    data.product_photos_qty = data.product_photos_qty.astype('Int64')
-    data.product_weight_g = data.product_weight_g.astype('Int64')
-    data.product_length_cm = data.product_length_cm.astype('Int64')
-    data.product_height_cm = data.product_height_cm.astype('Int64')
-    data.product_width_cm = data.product_width_cm.astype('Int64')
+    data['product_id'] = data['product_id'].astype('string')
+    data['product_category_name'] = data['product_category_name'].astype('string')
+    data['product_name_lenght'] = data['product_name_lenght'].astype('Int64')
+    data['product_description_lenght'] = data['product_description_lenght'].astype('Int64')
+    data['product_photos_qty'] = data['product_photos_qty'].astype('Int64')
+    data['product_weight_g'] = data['product_weight_g'].astype('Int64')
+    data['product_length_cm'] = data['product_length_cm'].astype('Int64')
+    data['product_height_cm'] = data['product_height_cm'].astype('Int64')
+    data['product_width_cm'] = data['product_width_cm'].astype('Int64')
 
     # Load product category translation
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -43,13 +47,10 @@ def transform_products(data: pd.DataFrame) -> pd.DataFrame:
         
         data['product_category_name_english'] = data['product_category_name_english'].apply(format_category_name)
     except FileNotFoundError:
-        print("Warning: Product category translation file not found. Skipping English translation.")
+        warning_message("Product category translation file not found. Skipping English translation.")
         data['product_category_name_english'] = data['product_category_name']
 
-    # Drop rows with more than 1 NaN value
-    data = data.dropna(thresh=len(data.columns) - 1)
-
-    # Drop duplicate rows
-    data = data.drop_duplicates()
+    # Drop rows with more than 1 NaN value and duplicate rows
+    data = drop_incomplete_and_duplicates(data, max_missing=1)
 
     return data
\ No newline at end of file
@@ -1,4 +1,5 @@
 import pandas as pd
+from ..frames import own, drop_incomplete_and_duplicates
 
 def transform_sellers(data: pd.DataFrame) -> pd.DataFrame:
     """
@@ -10,11 +11,13 @@ def transform_sellers(data: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: The transformed and cleaned sellers data.
     """
+    data = own(data)
+
     # Convert data types
-    data.seller_id = data.seller_id.astype('string')
-    data.seller_zip_code_prefix = data.seller_zip_code_prefix.astype('Int64')
-    data.seller_city = data.seller_city.astype('string')
-    data.seller_state = data.seller_state.astype('string')
+    data['seller_id'] = data['seller_id'].astype('string')
+    data['seller_zip_code_prefix'] = data['seller_zip_code_prefix'].astype('Int64')
+    data['seller_city'] = data['seller_city'].astype('string')
+    data['seller_state'] = data['seller_state'].astype('string')
 
     # Clean city names
     data['seller_city'] = data['seller_city'].str.title()
@@ -52,10 +55,7 @@ def transform_sellers(data: pd.DataFrame) -> pd.DataFrame:
     data['seller_state_initials'] = data['seller_state']
     data['seller_state'] = data['seller_state'].map(mapping)
 
-    # Drop rows with more than 1 NaN value
-    data = data.dropna(thresh=len(data.columns) - 1)
-
-    # Drop duplicate rows
-    data = data.drop_duplicates()
+    # Drop rows with more than 1 NaN value and duplicate rows
+    data = drop_incomplete_and_duplicates(data, max_missing=1)
 
     return data
\ No newline at end of file
@@ -0,0 +1,43 @@
+from instrumentation import get_logger
+
+logger = get_logger('etl')
+
+def log_message(message: str, **fields):
+    """
+    Log a message.
+
+    Arguments:
+        message (str): The message to log.
+        fields: Structured fields to attach, e.g. table="orders", rows=1000.
+    """
+    logger.info(message, extra=fields)
+
+def warning_message(message: str, **fields):
+    """
+    Log a warning message.
+
+    Arguments:
+        message (str): The warning message to log.
+        fields: Structured fields to attach.
+    """
+    logger.warning(message, extra=fields)
+
+def error_message(message: str, **fields):
+    """
+    Log an error message.
+
+    Arguments:
+        message (str): The error message to log.
+        fields: Structured fields to attach.
+    """
+    logger.error(message, extra=fields)
+
+def success_message(message: str, **fields):
+    """
+    Log a success message.
+
+    Arguments:
+        message (str): The success message to log.
+        fields: Structured fields to attach.
+    """
+    logger.info(message, extra={**fields, 'status': 'success'})
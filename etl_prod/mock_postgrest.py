@@ -0,0 +1,5 @@
+# The shared implementation lives in etl_core
+from etl_core.mock_postgrest import MOCK_KEY, MockPostgrest, main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+# The shared implementation lives in etl_core
+from etl_core.sinks import Sink, SupabaseSink, SqlAlchemySink, MockSink, NullSink, SINKS, get_sink, set_sink
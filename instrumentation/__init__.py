@@ -0,0 +1,4 @@
+# Shared logging and metrics for the ETL packages, the generator and the API
+from .logs import get_logger, setup_logging
+from .metrics import REGISTRY, counter, histogram
+from .tracing import span, traced, trace_run
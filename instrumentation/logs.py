@@ -0,0 +1,108 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+
+LOGGER_NAME = 'retail'
+
+COLORS = {
+    'WARNING': '\033[93m',
+    'ERROR': '\033[91m',
+    'SUCCESS': '\033[92m',
+}
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RESERVED = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'status'}
+
+def _fields(record):
+    return {k: v for k, v in vars(record).items() if k not in _RESERVED}
+
+def _label(record):
+    # Success messages are INFO records flagged by the helpers in */utils.py
+    return 'SUCCESS' if getattr(record, 'status', None) == 'success' else record.levelname
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: timestamp, level, logger, message, process and
+    any structured fields passed with `extra`.
+    """
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': _label(record),
+            'logger': record.name,
+            'message': record.getMessage(),
+            'pid': record.process,
+            'thread': record.threadName,
+        }
+        entry.update(_fields(record))
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class ConsoleFormatter(logging.Formatter):
+    """
+    The pipeline's original console style ("[LOG]: ...", coloured by level),
+    with a timestamp and any structured fields appended.
+    """
+    def format(self, record):
+        label = _label(record)
+        prefix = 'LOG' if label in ('INFO', 'DEBUG') else label
+        text = f"{self.formatTime(record, '%H:%M:%S')} [{prefix}]: {record.getMessage()}"
+        fields = _fields(record)
+        if fields:
+            text += ' ' + ' '.join(f"{k}={v}" for k, v in fields.items())
+        if record.exc_info:
+            text += '\n' + self.formatException(record.exc_info)
+        color = COLORS.get(label)
+        return f"{color}{text}\033[0m" if color else text
+
+_setup_lock = threading.Lock()
+_setup_pid = None
+_listener = None
+
+def setup_logging(fmt=None, level=None, stream=None):
+    """
+    Route the pipeline's logger through a queue to a background writer.
+
+    Callers only enqueue records, so logging never waits on stdout. Runs once
+    per process (spawned workers set themselves up on first use) and is
+    flushed at exit.
+
+    Arguments:
+        fmt (str): "json" or "text"; LOG_FORMAT, else JSON unless stdout is a terminal.
+        level (str): Minimum level; LOG_LEVEL, else INFO.
+        stream: Output stream; stdout by default.
+    """
+    global _setup_pid, _listener
+    with _setup_lock:
+        if _setup_pid == os.getpid():
+            return
+        stream = stream or sys.stdout
+        fmt = fmt or os.environ.get('LOG_FORMAT') or ('text' if stream.isatty() else 'json')
+
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(JsonFormatter() if fmt == 'json' else ConsoleFormatter())
+
+        log_queue = queue.SimpleQueue()
+        logger = logging.getLogger(LOGGER_NAME)
+        logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+        logger.setLevel(level or os.environ.get('LOG_LEVEL', 'INFO'))
+        logger.propagate = False
+
+        _listener = logging.handlers.QueueListener(log_queue, handler)
+        _listener.start()
+        _setup_pid = os.getpid()
+    atexit.register(_listener.stop)
+
+def get_logger(name=None):
+    """
+    A child of the pipeline logger, e.g. get_logger('etl_core.load').
+    """
+    setup_logging()
+    return logging.getLogger(f"{LOGGER_NAME}.{name}" if name else LOGGER_NAME)
@@ -0,0 +1,158 @@
+import bisect
+import threading
+
+# Latency buckets in seconds, from a fast local call to a slow network batch
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in pairs) + '}'
+
+class Counter:
+    """
+    Monotonic count per label set, e.g. rows loaded per table.
+    """
+    kind = 'counter'
+
+    def __init__(self, name, help=''):
+        self.name = name
+        self.help = help
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def snapshot(self, reset=False):
+        with self._lock:
+            values = dict(self.values)
+            if reset:
+                self.values.clear()
+        return values
+
+    def merge(self, values):
+        with self._lock:
+            for key, value in values.items():
+                self.values[key] = self.values.get(key, 0) + value
+
+    def render(self):
+        lines = []
+        for key, value in sorted(self.snapshot().items()):
+            lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+class Histogram:
+    """
+    Bucketed distribution per label set, e.g. upsert batch latency.
+    """
+    kind = 'histogram'
+
+    def __init__(self, name, help='', buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self.values = {}  # key -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def snapshot(self, reset=False):
+        with self._lock:
+            values = {key: list(state) for key, state in self.values.items()}
+            if reset:
+                self.values.clear()
+        return values
+
+    def merge(self, values):
+        with self._lock:
+            for key, other in values.items():
+                state = self.values.setdefault(key, [0] * (len(self.buckets) + 2))
+                for i, value in enumerate(other):
+                    state[i] += value
+
+    def render(self):
+        lines = []
+        for key, state in sorted(self.snapshot().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(key, [('le', bound)])} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(key, [('le', '+Inf')])} {state[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {state[-2]}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {state[-1]}")
+        return lines
+
+class Registry:
+    """
+    Process-wide set of metrics, rendered in the Prometheus text format.
+
+    Worker processes keep their own registry; `drain` hands back what they
+    recorded so the API process can `merge` it into the one it serves.
+    """
+    def __init__(self):
+        self.metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, help, **kwargs):
+        with self._lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(name, help, **kwargs)
+            return metric
+
+    def counter(self, name, help=''):
+        return self._get(Counter, name, help)
+
+    def histogram(self, name, help='', buckets=DEFAULT_BUCKETS):
+        return self._get(Histogram, name, help, buckets=buckets)
+
+    def drain(self):
+        """
+        Snapshot every metric and reset it.
+
+        Returns:
+            dict: {name: (kind, help, values)}
+        """
+        with self._lock:
+            metrics = list(self.metrics.values())
+        return {m.name: (m.kind, m.help, m.snapshot(reset=True)) for m in metrics}
+
+    def merge(self, drained):
+        for name, (kind, help, values) in drained.items():
+            metric = self.counter(name, help) if kind == 'counter' else self.histogram(name, help)
+            metric.merge(values)
+
+    def render(self):
+        with self._lock:
+            metrics = sorted(self.metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = Registry()
+
+def counter(name, help=''):
+    return REGISTRY.counter(name, help)
+
+def histogram(name, help='', buckets=DEFAULT_BUCKETS):
+    return REGISTRY.histogram(name, help, buckets)
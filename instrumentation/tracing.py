@@ -0,0 +1,217 @@
+import contextvars
+import functools
+import json
+import os
+import resource
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from .logs import get_logger
+
+logger = get_logger('tracing')
+
+# Trace files kept in a trace directory, newest first; older ones are removed
+DEFAULT_TRACE_KEEP = 100
+
+# The run spans are recorded into, and the innermost open span, for this context
+_current_run = contextvars.ContextVar('trace_run', default=None)
+_current_span = contextvars.ContextVar('trace_span', default=None)
+
+def _peak_rss_kb():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+class Span:
+    """
+    One timed unit of work. `rows` can be set or added to while it is open.
+    """
+    __slots__ = ('name', 'parent', 'attrs', 'rows', 'start', 'wall', 'cpu', 'rss_delta_kb', 'pid', 'tid')
+
+    def __init__(self, name, parent, attrs, rows):
+        self.name = name
+        self.parent = parent
+        self.attrs = attrs
+        self.rows = rows
+        self.start = None
+        self.wall = None
+        self.cpu = None
+        self.rss_delta_kb = None
+        self.pid = os.getpid()
+        self.tid = threading.get_ident()
+
+    def add_rows(self, rows):
+        self.rows = (self.rows or 0) + rows
+
+class TraceRun:
+    """
+    Spans recorded during one pipeline run.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.started = time.perf_counter()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def record(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+    def summary(self):
+        """
+        Totals per span name, in order of first appearance.
+        """
+        totals = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            entry = totals.setdefault(span.name, {'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'rss_delta_kb': 0, 'rows': None})
+            entry['calls'] += 1
+            entry['wall'] += span.wall
+            entry['cpu'] += span.cpu
+            entry['rss_delta_kb'] += span.rss_delta_kb
+            if span.rows is not None:
+                entry['rows'] = (entry['rows'] or 0) + span.rows
+        return totals
+
+    def summary_table(self):
+        header = f"{'span':<36} {'calls':>6} {'wall s':>9} {'cpu s':>9} {'rss +MB':>8} {'rows':>10} {'rows/s':>10}"
+        lines = [f"Trace summary for {self.name}", header, '-' * len(header)]
+        for name, t in self.summary().items():
+            rows = '' if t['rows'] is None else f"{t['rows']:,}"
+            rate = '' if t['rows'] is None or not t['wall'] else f"{t['rows'] / t['wall']:,.0f}"
+            lines.append(
+                f"{name[:36]:<36} {t['calls']:>6} {t['wall']:>9.3f} {t['cpu']:>9.3f} "
+                f"{t['rss_delta_kb'] / 1024:>8.1f} {rows:>10} {rate:>10}"
+            )
+        return '\n'.join(lines)
+
+    def chrome_trace(self):
+        """
+        The spans as Chrome trace events, viewable in chrome://tracing or Perfetto.
+        """
+        with self._lock:
+            spans = list(self.spans)
+        events = []
+        for span in spans:
+            args = dict(span.attrs)
+            args.update(cpu_s=round(span.cpu, 6), rss_delta_kb=span.rss_delta_kb)
+            if span.rows is not None:
+                args['rows'] = span.rows
+            events.append({
+                'name': span.name,
+                'cat': span.name.split(':')[0],
+                'ph': 'X',
+                'ts': round((span.start - self.started) * 1e6, 1),
+                'dur': round(span.wall * 1e6, 1),
+                'pid': span.pid,
+                'tid': span.tid,
+                'args': args,
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms', 'otherData': {'run': self.name}}
+
+    def write(self, directory, keep=DEFAULT_TRACE_KEEP):
+        """
+        Write the Chrome trace to `directory`, then remove all but the
+        `keep` newest traces there.
+        """
+        os.makedirs(directory, exist_ok=True)
+        safe_name = ''.join(c if c.isalnum() or c in '-_' else '_' for c in self.name)
+        path = os.path.join(directory, f"{safe_name}-{datetime.now():%Y%m%d-%H%M%S}.json")
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f, default=str)
+        traces = sorted(
+            (os.path.join(directory, entry) for entry in os.listdir(directory) if entry.endswith('.json')),
+            key=os.path.getmtime, reverse=True
+        )
+        for old in traces[max(keep, 1):]:
+            if old != path:
+                os.remove(old)
+        return path
+
+@contextmanager
+def span(name, rows=None, **attrs):
+    """
+    Time a block of work as a span of the current trace run.
+
+    Records wall time, CPU time of the calling thread, growth of the
+    process's peak RSS and, if given or set on the yielded span, a row
+    count. Outside a trace run this does nothing.
+
+    Arguments:
+        name (str): Span name, e.g. "transform:orders".
+        rows (int): Rows handled, if already known.
+        attrs: Extra attributes shown in the trace viewer.
+    """
+    run = _current_run.get()
+    if run is None:
+        yield Span(name, None, attrs, rows)
+        return
+
+    current = Span(name, _current_span.get(), attrs, rows)
+    token = _current_span.set(current)
+    rss_before = _peak_rss_kb()
+    cpu_before = time.thread_time()
+    current.start = time.perf_counter()
+    try:
+        yield current
+    finally:
+        current.wall = time.perf_counter() - current.start
+        current.cpu = time.thread_time() - cpu_before
+        current.rss_delta_kb = _peak_rss_kb() - rss_before
+        _current_span.reset(token)
+        run.record(current)
+
+def traced(name=None, rows=len):
+    """
+    Decorator form of `span`. By default the row count is the length of the
+    return value (e.g. a DataFrame); pass rows=None to skip it.
+    """
+    def decorator(fn):
+        span_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(span_name) as s:
+                result = fn(*args, **kwargs)
+                if rows is not None and result is not None:
+                    try:
+                        s.rows = rows(result)
+                    except TypeError:
+                        pass
+                return result
+        return wrapper
+    return decorator
+
+@contextmanager
+def trace_run(name, directory=None):
+    """
+    Collect the spans of one run. On exit the summary table is logged and,
+    if a `directory` (TRACE_DIR) is given, the trace is written there as
+    Chrome trace JSON. Only the newest TRACE_KEEP (default 100) traces in
+    the directory are kept.
+
+    Nested runs are folded into the outer run.
+    """
+    if _current_run.get() is not None:
+        with span(name) as s:
+            yield s
+        return
+
+    run = TraceRun(name)
+    token = _current_run.set(run)
+    try:
+        with span(name) as s:
+            yield s
+    finally:
+        _current_run.reset(token)
+        directory = directory if directory is not None else os.environ.get('TRACE_DIR')
+        message = run.summary_table()
+        if directory:
+            try:
+                keep = int(os.environ.get('TRACE_KEEP', DEFAULT_TRACE_KEEP))
+                message += f"\nTrace written to {run.write(directory, keep)}"
+            except OSError as e:
+                message += f"\nCould not write trace: {e}"
+        logger.info(message)
@@ -0,0 +1,168 @@
+import numpy as np
+import pandas as pd
+
+def black_friday(year):
+    """
+    The day after the fourth Thursday of November.
+    """
+    november = pd.Timestamp(year=year, month=11, day=1)
+    first_thursday = november + pd.Timedelta(days=(3 - november.dayofweek) % 7)
+    return (first_thursday + pd.Timedelta(weeks=3, days=1)).date()
+
+# Named calendar events whose order volume is modelled as a multiplier
+SPECIAL_DAYS = {
+    'black_friday': black_friday,
+}
+
+class ArrivalModel:
+    """
+    Order arrival process learned from historical purchase timestamps.
+
+    The daily rate is a linear growth trend times a weekday factor times a
+    multiplier for special days such as Black Friday. Within a day, the
+    hour is drawn from the hour-of-day profile of that weekday. All sampling
+    is vectorized over the requested number of orders.
+    """
+    def __init__(self):
+        self.fitted = False
+
+        # Daily trend: orders/day = intercept + slope * days since origin
+        self.origin = None
+        self.intercept = 1.0
+        self.slope = 0.0
+
+        # Weekday (Mon=0) volume factors and hour-of-day profiles
+        self.weekday_factors = np.ones(7)
+        self.hour_profiles = np.full((7, 24), 1 / 24)
+
+        # Multiplier per entry of SPECIAL_DAYS
+        self.special_day_factors = {name: 1.0 for name in SPECIAL_DAYS}
+
+    def fit(self, timestamps):
+        """
+        Learn the arrival process from a series of purchase timestamps.
+
+        Arguments:
+            timestamps (pd.Series): Historical order purchase timestamps.
+        """
+        ts = pd.to_datetime(pd.Series(timestamps), errors='coerce').dropna()
+        if ts.empty:
+            return self
+
+        # Weekday x hour counts give both the weekday factors and hour profiles
+        grid = np.zeros((7, 24))
+        np.add.at(grid, (ts.dt.dayofweek.to_numpy(), ts.dt.hour.to_numpy()), 1)
+        grid += 1  # Laplace smoothing for empty cells
+        self.hour_profiles = grid / grid.sum(axis=1, keepdims=True)
+
+        daily = ts.dt.normalize().value_counts().sort_index()
+        daily = daily.reindex(pd.date_range(daily.index.min(), daily.index.max(), freq='D'), fill_value=0)
+        weekday_means = daily.groupby(daily.index.dayofweek).mean().reindex(range(7), fill_value=0).to_numpy()
+        self.weekday_factors = np.maximum(weekday_means / max(weekday_means.mean(), 1e-9), 1e-3)
+
+        # Special days are excluded from the trend fit and measured against it
+        special = {name: {rule(year) for year in range(daily.index.min().year, daily.index.max().year + 1)}
+                   for name, rule in SPECIAL_DAYS.items()}
+        all_special = set().union(*special.values())
+        regular = daily[[d.date() not in all_special for d in daily.index]]
+
+        self.origin = daily.index.min()
+        x = (regular.index - self.origin).days.to_numpy(dtype=float)
+        y = regular.to_numpy(dtype=float) / self.weekday_factors[regular.index.dayofweek]
+        if len(x) > 1:
+            self.slope, self.intercept = np.polyfit(x, y, 1)
+        else:
+            self.slope, self.intercept = 0.0, float(y.mean())
+
+        for name, days in special.items():
+            ratios = []
+            for day in days:
+                stamp = pd.Timestamp(day)
+                if stamp in daily.index and daily[stamp] > 0:
+                    expected = self._base_rate(np.array([stamp], dtype='datetime64[ns]'))[0]
+                    ratios.append(daily[stamp] / expected)
+            if ratios:
+                self.special_day_factors[name] = float(np.mean(ratios))
+
+        self.fitted = True
+        return self
+
+    def _base_rate(self, days):
+        # Trend is floored so extrapolating backwards never yields negative rates
+        offsets = (pd.DatetimeIndex(days) - self.origin).days.to_numpy(dtype=float)
+        trend = np.maximum(self.intercept + self.slope * offsets, max(self.intercept, 1.0) * 0.05)
+        return trend * self.weekday_factors[pd.DatetimeIndex(days).dayofweek]
+
+    def daily_rates(self, start_date, end_date):
+        """
+        Expected relative order volume for each day in [start_date, end_date].
+
+        Returns:
+            pd.Series: Rate per day, indexed by day.
+        """
+        days = pd.date_range(pd.Timestamp(start_date).normalize(), pd.Timestamp(end_date).normalize(), freq='D')
+        if not self.fitted:
+            return pd.Series(np.ones(len(days)), index=days)
+
+        rates = self._base_rate(days)
+        dates = days.date
+        for name, rule in SPECIAL_DAYS.items():
+            factor = self.special_day_factors[name]
+            if factor == 1.0:
+                continue
+            hits = {rule(year) for year in range(days.min().year, days.max().year + 1)}
+            rates = np.where([d in hits for d in dates], rates * factor, rates)
+        return pd.Series(rates, index=days)
+
+    def sample(self, n, start_date, end_date, rng=None):
+        """
+        Draw `n` purchase timestamps in [start_date, end_date).
+
+        Arguments:
+            n (int): Number of timestamps to draw.
+            start_date (datetime): Start of the window.
+            end_date (datetime): End of the window.
+            rng (np.random.Generator): Random source; a fresh one if omitted.
+
+        Returns:
+            np.ndarray: Sorted datetime64[ns] timestamps.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        start = np.datetime64(pd.Timestamp(start_date), 'ns')
+        end = np.datetime64(pd.Timestamp(end_date), 'ns')
+        if n <= 0 or end <= start:
+            return np.full(max(n, 0), start)
+
+        rates = self.daily_rates(start_date, end_date)
+        days = rates.index.to_numpy(dtype='datetime64[ns]')
+        weekdays = pd.DatetimeIndex(days).dayofweek.to_numpy()
+        # Part of each day inside the window: all of it, except on a partial first or last day
+        day_ns = np.timedelta64(1, 'D').astype('timedelta64[ns]').astype(np.int64)
+        lo = np.clip((start - days).astype(np.int64), 0, day_ns)
+        hi = np.clip((end - days).astype(np.int64), 0, day_ns)
+        lo_mass = self._time_of_day_cdf(weekdays, lo / 1e9)
+        hi_mass = self._time_of_day_cdf(weekdays, hi / 1e9)
+        # A day is drawn in proportion to its expected orders inside the window
+        weights = rates.to_numpy() * (hi_mass - lo_mass)
+        day_idx = rng.choice(len(days), size=n, p=weights / weights.sum())
+
+        # The time of day is drawn from the day's hour profile restricted to the window
+        u = lo_mass[day_idx] + rng.random(n) * (hi_mass[day_idx] - lo_mass[day_idx])
+        seconds = np.floor(self._time_of_day_quantile(weekdays[day_idx], u))
+        offsets = np.clip((seconds * 1e9).astype(np.int64), lo[day_idx], hi[day_idx] - 1)
+        return np.sort(days[day_idx] + offsets.astype('timedelta64[ns]'))
+
+    def _time_of_day_cdf(self, weekdays, seconds):
+        # Share of a weekday's orders placed before `seconds` into the day, the
+        # hour profile spread evenly over each hour
+        hours = np.minimum(seconds // 3600, 23).astype(int)
+        before = np.cumsum(self.hour_profiles, axis=1) - self.hour_profiles
+        return before[weekdays, hours] + self.hour_profiles[weekdays, hours] * (seconds - hours * 3600) / 3600
+
+    def _time_of_day_quantile(self, weekdays, u):
+        # Inverse of _time_of_day_cdf: seconds into the day
+        cumulative = np.cumsum(self.hour_profiles, axis=1)[weekdays]
+        hours = np.minimum((cumulative <= u[:, None]).sum(axis=1), 23)
+        profile = self.hour_profiles[weekdays, hours]
+        before = cumulative[np.arange(len(u)), hours] - profile
+        return hours * 3600 + np.clip((u - before) / profile, 0, 1) * 3600
@@ -1,6 +1,12 @@
 import argparse
+import hashlib
+import json
 import os
 import sys
+import queue
+import uuid
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_EXCEPTION, wait
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -9,81 +15,241 @@ project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
 from ordergen.generator import OrderGenerator
-from etl_prod.transform.customers import transform_customers
-from etl_prod.transform.orders import transform_orders
-from etl_prod.transform.orders_items import transform_order_items
-from etl_prod.transform.order_payments import transform_order_payments
-from etl_prod.transform.order_reviews import transform_order_reviews
-from etl_prod.load import load_incremental
-from etl_prod.utils import log_message, success_message, error_message
+from ordergen.sources import SOURCES, make_source
+from ordergen.schema import validate_generated
+from ordergen.utils import prefetch
+from etl_core.backends.supabase import load_incremental
+from etl_core.utils import log_message, success_message, error_message
 
 # Load environment variables
 load_dotenv()
 
+# Trained generator handed to each worker process once, at pool start-up
+_worker_gen = None
+
+def _init_worker(gen):
+    global _worker_gen
+    _worker_gen = gen
+
+def derive_seed(run_id, *parts):
+    """
+    Derive a stable 64-bit seed from the run ID and any extra parts.
+    """
+    key = ':'.join(str(p) for p in (run_id,) + parts)
+    return int.from_bytes(hashlib.sha256(key.encode()).digest()[:8], 'big')
+
+def plan_shards(count, start_date, end_date, workers, batch_size):
+    """
+    Split the date range into contiguous windows, one per worker, and each
+    window into numbered batches.
+
+    Batch indices are global and stable for a given plan, which is what lets
+    a restarted run recognise and skip the batches it already loaded.
+
+    Arguments:
+        count (int): Total number of orders to generate.
+        start_date (datetime): Start of the backfill period.
+        end_date (datetime): End of the backfill period.
+        workers (int): Number of shards to create.
+        batch_size (int): Maximum orders per batch.
+
+    Returns:
+        list: Shard dictionaries with index, count, start_date, end_date and batches.
+    """
+    workers = max(1, min(workers, count))
+    span = (end_date - start_date) / workers
+    shards = []
+    batch_index = 0
+    for i in range(workers):
+        shard_count = count // workers + (1 if i < count % workers else 0)
+        batches = []
+        for offset in range(0, shard_count, batch_size):
+            batches.append({'index': batch_index, 'count': min(batch_size, shard_count - offset)})
+            batch_index += 1
+        shards.append({
+            'index': i,
+            'count': shard_count,
+            'start_date': start_date + span * i,
+            'end_date': start_date + span * (i + 1),
+            'batches': batches,
+        })
+    return shards
+
+class Checkpoint:
+    """
+    Local progress record for one backfill run.
+
+    `run.json` stores the run's plan parameters so a restart reproduces the
+    exact same batches, and each shard appends the indices of the batches it
+    has loaded to its own `shard-<n>.done` file. Appends are line-sized and
+    flushed immediately, so a crash loses at most the batch in flight.
+    """
+    def __init__(self, directory, run_id):
+        self.run_id = run_id
+        self.path = os.path.join(directory, run_id)
+
+    def exists(self):
+        return os.path.exists(os.path.join(self.path, 'run.json'))
+
+    def save_params(self, params):
+        os.makedirs(self.path, exist_ok=True)
+        tmp_path = os.path.join(self.path, 'run.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(params, f, indent=2)
+        os.replace(tmp_path, os.path.join(self.path, 'run.json'))
+
+    def load_params(self):
+        with open(os.path.join(self.path, 'run.json')) as f:
+            return json.load(f)
+
+    def completed(self):
+        done = set()
+        if not os.path.isdir(self.path):
+            return done
+        for name in os.listdir(self.path):
+            if not name.endswith('.done'):
+                continue
+            with open(os.path.join(self.path, name)) as f:
+                for line in f:
+                    # A torn final line from a crash is simply ignored
+                    if line.endswith('\n'):
+                        done.add(int(line))
+        return done
+
+    def mark_done(self, shard_index, batch_index):
+        with open(os.path.join(self.path, f'shard-{shard_index}.done'), 'a') as f:
+            f.write(f'{batch_index}\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+def run_shard(shard, batch_size, queue_size, checkpoint, progress):
+    """
+    Generate and load the pending batches of one shard.
+
+    Every batch reseeds the generator from the run ID and the batch index, so
+    regenerating a batch after a restart yields the same rows and UUIDs and
+    the upsert is idempotent. A producer thread generates and validates
+    batches into a bounded queue while this thread uploads them, so synthesis
+    overlaps with network I/O.
+    """
+    gen = _worker_gen
+
+    def produce():
+        for batch in shard['batches']:
+            gen.reseed(derive_seed(checkpoint.run_id, batch['index']))
+            raw_data = gen.generate_orders(
+                num_orders=batch['count'],
+                start_date=shard['start_date'],
+                end_date=shard['end_date']
+            )
+            yield batch, validate_generated(raw_data)
+
+    loaded = 0
+    for batch, transformed_data in prefetch(produce(), maxsize=queue_size):
+        load_incremental(transformed_data)
+        checkpoint.mark_done(shard['index'], batch['index'])
+        loaded += batch['count']
+        log_message(f"Shard {shard['index']}: loaded batch {batch['index']} ({loaded} orders this run).")
+        progress.put(batch['count'])
+
+    return loaded
+
 def main():
     parser = argparse.ArgumentParser(description="Backfill synthetic orders from 2018 to 2025.")
     parser.add_argument('--count', type=int, default=5000, help="Total number of orders to generate.")
     parser.add_argument('--data-dir', type=str, default=os.path.join(project_root, 'data'), help="Path to existing data for training.")
-    
+    parser.add_argument('--source', choices=SOURCES, default=None, help="Where to read training data from (default: GENERATOR_SOURCE, else supabase).")
+    parser.add_argument('--parquet-dir', type=str, default=None, help="Parquet cache directory for --source parquet (default: <data-dir>/.parquet).")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Number of worker processes.")
+    parser.add_argument('--batch-size', type=int, default=1000, help="Orders per generated batch.")
+    parser.add_argument('--queue-size', type=int, default=2, help="Generated batches each worker may buffer ahead of the upload.")
+    parser.add_argument('--run-id', type=str, default=None, help="Resume the run with this ID, or start a new run under it.")
+    parser.add_argument('--checkpoint-dir', type=str, default=os.path.join(project_root, '.backfill'), help="Directory for progress files.")
+
     args = parser.parse_args()
-    
-    # Define the gap period
-    # Olist dataset ends roughly in Oct 2018
-    start_date = datetime(2018, 10, 18)
-    end_date = datetime.now()
-    
-    log_message(f"Starting backfill from {start_date.date()} to {end_date.date()}...")
-    log_message(f"Target: {args.count} orders.")
-    
+
+    run_id = args.run_id or f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}"
+    checkpoint = Checkpoint(args.checkpoint_dir, run_id)
+
+    if checkpoint.exists():
+        # Resuming: the stored plan wins over the command line so batches line up
+        params = checkpoint.load_params()
+        log_message(f"Resuming backfill run {run_id}.")
+    else:
+        # Define the gap period
+        # Olist dataset ends roughly in Oct 2018
+        params = {
+            'count': args.count,
+            'batch_size': args.batch_size,
+            'workers': args.workers,
+            'start_date': datetime(2018, 10, 18).isoformat(),
+            'end_date': datetime.now().isoformat(),
+        }
+        checkpoint.save_params(params)
+        log_message(f"Starting backfill run {run_id}. Rerun with --run-id {run_id} to resume.")
+
+    count = params['count']
+    start_date = datetime.fromisoformat(params['start_date'])
+    end_date = datetime.fromisoformat(params['end_date'])
+
+    log_message(f"Backfill period {start_date.date()} to {end_date.date()}...")
+    log_message(f"Target: {count} orders.")
+
     try:
-        # 1. Initialize and Train Generator
-        gen = OrderGenerator()
+        # 1. Initialize and Train Generator once; workers receive a copy.
+        # Seeding from the run ID keeps the review text pools identical across restarts,
+        # and background refills are disabled because their timing is not reproducible.
+        source = make_source(args.source, args.data_dir, args.parquet_dir) if args.source else None
+        gen = OrderGenerator(args.data_dir, source=source, seed=derive_seed(run_id, 'train'))
+        gen.text_pool.background_refill = False
         gen.train()
-        
-        # 2. Generate Data with Date Range
-        # We'll generate in batches to avoid memory issues if count is huge
-        batch_size = 1000
-        total_generated = 0
-        
-        while total_generated < args.count:
-            current_batch_size = min(batch_size, args.count - total_generated)
-            log_message(f"Generating batch of {current_batch_size} orders...")
-            
-            raw_data = gen.generate_orders(
-                num_orders=current_batch_size,
-                start_date=start_date,
-                end_date=end_date
-            )
-            
-            # 3. Transform Data
-            transformed_data = {}
-            
-            if not raw_data['customers'].empty:
-                transformed_data['customers'] = transform_customers(raw_data['customers'])
-                
-            if not raw_data['orders'].empty:
-                transformed_data['orders'] = transform_orders(raw_data['orders'])
-                
-            if not raw_data['order_items'].empty:
-                transformed_data['order_items'] = transform_order_items(raw_data['order_items'])
-                
-            if not raw_data['order_payments'].empty:
-                transformed_data['order_payments'] = transform_order_payments(raw_data['order_payments'])
-                
-            if not raw_data['order_reviews'].empty:
-                transformed_data['order_reviews'] = transform_order_reviews(raw_data['order_reviews'])
-            
-            # 4. Load Data
-            log_message("Loading batch into Supabase...")
-            load_incremental(transformed_data)
-            
-            total_generated += current_batch_size
-            success_message(f"Batch complete. Total progress: {total_generated}/{args.count}")
-            
+
+        # 2. Split the date range across workers and drop finished batches
+        shards = plan_shards(count, start_date, end_date, params['workers'], params['batch_size'])
+        completed = checkpoint.completed()
+        already_done = 0
+        for shard in shards:
+            already_done += sum(b['count'] for b in shard['batches'] if b['index'] in completed)
+            shard['batches'] = [b for b in shard['batches'] if b['index'] not in completed]
+        shards = [shard for shard in shards if shard['batches']]
+
+        if already_done:
+            log_message(f"Skipping {already_done} orders from {len(completed)} completed batch(es).")
+        log_message(f"Running {len(shards)} shard(s) with batches of {params['batch_size']} orders...")
+
+        total_generated = already_done
+        if len(shards) == 1:
+            _init_worker(gen)
+            total_generated += run_shard(shards[0], params['batch_size'], args.queue_size, checkpoint, queue.Queue())
+        elif shards:
+            with multiprocessing.Manager() as manager:
+                progress = manager.Queue()
+                with ProcessPoolExecutor(max_workers=len(shards), initializer=_init_worker, initargs=(gen,)) as pool:
+                    futures = [
+                        pool.submit(run_shard, shard, params['batch_size'], args.queue_size, checkpoint, progress)
+                        for shard in shards
+                    ]
+
+                    # 3. Aggregate progress reported by the workers
+                    pending = set(futures)
+                    while pending:
+                        finished, pending = wait(pending, timeout=1, return_when=FIRST_EXCEPTION)
+                        while not progress.empty():
+                            total_generated += progress.get()
+                            success_message(f"Batch complete. Total progress: {total_generated}/{count}")
+                        for future in finished:
+                            if future.exception():
+                                for other in pending:
+                                    other.cancel()
+                                raise future.exception()
+
+                    total_generated = already_done + sum(future.result() for future in futures)
+
         success_message(f"Successfully backfilled {total_generated} orders.")
-        
+
     except Exception as e:
         error_message(f"Backfill failed: {e}")
+        error_message(f"Rerun with --run-id {run_id} to resume from the last completed batch.")
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -1,17 +1,49 @@
+import os
 import pandas as pd
 import numpy as np
 import uuid
 import random
+import time
 from datetime import datetime, timedelta
 from faker import Faker
-from .utils import SimpleMarkovChain
-from etl_prod.load import get_supabase_client
+from .utils import CompiledMarkovChain, ReviewTextPool, prefetch
+from .arrivals import ArrivalModel
+from .schema import STATE_NAMES, build_frame
+from .sources import make_source
+from instrumentation import counter, get_logger, histogram, traced
+
+logger = get_logger('ordergen')
+
+ORDERS_GENERATED = counter('ordergen_orders_generated_total', 'Synthetic orders generated.')
+BATCH_SECONDS = histogram('ordergen_batch_seconds', 'Time to synthesize one batch of orders.')
+
+# Default location of the Olist CSV files
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
 
 class OrderGenerator:
-    def __init__(self):
+    def __init__(self, data_dir=None, seed=None, offline=False, source=None):
+        """
+        Arguments:
+            data_dir (str): Directory of the Olist CSVs.
+            seed (int): Seed for every random source.
+            offline (bool): Train from the CSVs only, with no Supabase connection.
+            source (Source): Where to read training data from (see
+                ordergen.sources); overrides `offline`. Otherwise it is built
+                from GENERATOR_SOURCE, by default "supabase": the reference
+                tables from Supabase and the rest from the CSVs.
+        """
+        self.data_dir = data_dir or DEFAULT_DATA_DIR
         self.fake = Faker('pt_BR')  # Brazilian Portuguese locale
-        self.markov = SimpleMarkovChain()
-        self.supabase = get_supabase_client()
+        self.random = random.Random(seed)
+        self.np_random = np.random.default_rng(seed)
+        self.arrivals = ArrivalModel()
+        self.markov = CompiledMarkovChain(seed=seed)
+        self.text_pool = ReviewTextPool(self.markov, seed=seed)
+        if source is None:
+            source = make_source('csv' if offline else os.environ.get('GENERATOR_SOURCE', 'supabase'), self.data_dir)
+        self.source = source
+        if seed is not None:
+            self.fake.seed_instance(seed)
         
         # Learned distributions/lists
         self.product_ids = []
@@ -21,88 +53,165 @@ class OrderGenerator:
         self.states = []
         self.product_prices = {} # product_id -> list of prices
         
+    def reseed(self, seed):
+        """
+        Reseed every random source so a worker produces its own reproducible stream.
+        """
+        self.random.seed(seed)
+        self.np_random = np.random.default_rng(seed)
+        self.fake.seed_instance(seed)
+        self.markov.rng = np.random.default_rng(seed)
+        self.text_pool.rng = np.random.default_rng(seed)
+
+    def new_id(self):
+        """
+        Draw a UUID4 from the seeded random source, so reseeding reproduces IDs.
+        """
+        return str(uuid.UUID(int=self.random.getrandbits(128), version=4))
+
+    @traced('generator:train', rows=None)
     def train(self):
         """
-        Load existing data from Supabase and learn distributions.
+        Load existing data from the source and learn distributions.
+        Anything the source cannot provide falls back to synthetic values.
         """
-        print("Training Order Generator from Database...")
-        
+        logger.info(f"Training Order Generator from {self.source!r}...")
+
         # Load Products
         try:
-            response = self.supabase.table('products').select('product_id').execute()
-            self.product_ids = [item['product_id'] for item in response.data]
+            products = self.source.read('products', ['product_id'])
+            # Sorted so the learned state does not depend on the row order returned
+            self.product_ids = sorted(products['product_id'])
         except Exception as e:
-            print(f"Warning: Could not load products: {e}")
+            logger.warning(f"Could not load products: {e}")
 
         # Load Sellers
         try:
-            response = self.supabase.table('sellers').select('seller_id').execute()
-            self.seller_ids = [item['seller_id'] for item in response.data]
+            sellers = self.source.read('sellers', ['seller_id'])
+            self.seller_ids = sorted(sellers['seller_id'])
         except Exception as e:
-            print(f"Warning: Could not load sellers: {e}")
+            logger.warning(f"Could not load sellers: {e}")
 
         # Load Geolocation (for realistic locations)
         try:
-            # Fetch a sample of locations (limit to 10000 for performance)
-            response = self.supabase.table('geolocation').select('geolocation_zip_code_prefix,geolocation_city,geolocation_state').limit(10000).execute()
-            
-            if response.data:
-                self.zip_codes = [item['geolocation_zip_code_prefix'] for item in response.data]
-                self.cities = [item['geolocation_city'] for item in response.data]
-                self.states = [item['geolocation_state'] for item in response.data]
-        except Exception as e:
-            print(f"Warning: Could not load geolocation: {e}")
+            # A sample of up to 10000 zip code prefixes, spread over the whole country
+            # geolocation_state holds the full name in the database; use the initials
+            geolocation = self.source.read(
+                'geolocation',
+                ['geolocation_zip_code_prefix', 'geolocation_city', 'geolocation_state_initials'],
+                limit=10000
+            )
+            rows = sorted((
+                (int(zip_code), city, state)
+                for zip_code, city, state in geolocation.itertuples(index=False, name=None)
+            ), key=str)
+            self.zip_codes = [row[0] for row in rows]
+            self.cities = [row[1] for row in rows]
+            self.states = [row[2] for row in rows]
         except Exception as e:
-            print(f"Warning: Could not load geolocation: {e}")
+            logger.warning(f"Could not load geolocation: {e}")
 
         # Load Order Items (for pricing)
         try:
-            items_df = pd.read_csv(f"{self.data_dir}/olist_order_items_dataset.csv")
+            items_df = self.source.read('order_items', ['product_id', 'price'])
             # Create a map of product_id -> prices
             # Group by product_id and get unique prices to save memory
             price_map = items_df.groupby('product_id')['price'].apply(list).to_dict()
             self.product_prices = price_map
         except Exception as e:
-            print(f"Warning: Could not load order items: {e}")
+            logger.warning(f"Could not load order items: {e}")
+
+        # Load Orders (for the arrival process)
+        try:
+            orders_df = self.source.read('orders', ['order_purchase_timestamp'])
+            self.arrivals.fit(orders_df['order_purchase_timestamp'])
+        except Exception as e:
+            logger.warning(f"Could not load orders: {e}")
 
         # Load Reviews (for NLP)
         try:
-            reviews_df = pd.read_csv(f"{self.data_dir}/olist_order_reviews_dataset.csv")
+            reviews_df = self.source.read('order_reviews', ['review_comment_message'])
             comments = reviews_df['review_comment_message'].dropna().astype(str).tolist()
-            # Train on a subset to be fast
-            self.markov.train(comments[:5000])
+            # The compiled chain is compact enough to train on every comment
+            self.markov.train(comments)
         except Exception as e:
-            print(f"Warning: Could not load reviews: {e}")
-            
-        print("Training complete.")
+            logger.warning(f"Could not load reviews: {e}")
+
+        # Pre-generate review text so the order loop only samples from pools
+        self.text_pool.fill()
 
+        logger.info("Training complete.")
+
+    def iter_orders(self, total, batch_size=1000, start_date=None, end_date=None, prefetch_batches=0):
+        """
+        Generate `total` orders as a stream of batches.
+
+        Each batch is the same dictionary of typed DataFrames returned by
+        generate_orders, so only one batch needs to be held in memory at a time.
+        With `prefetch_batches` > 0 the batches are synthesized on a background
+        thread, which lets the caller upsert batch N while batch N+1 is being
+        generated.
+
+        Arguments:
+            total (int): Total number of orders to generate.
+            batch_size (int): Maximum orders per batch.
+            start_date (datetime): Start of the purchase window.
+            end_date (datetime): End of the purchase window.
+            prefetch_batches (int): Batches to generate ahead of the consumer.
+
+        Yields:
+            dict: Dictionary of DataFrames for one batch.
+        """
+        def batches():
+            for offset in range(0, total, batch_size):
+                yield self.generate_orders(min(batch_size, total - offset), start_date, end_date)
+
+        if prefetch_batches > 0:
+            return prefetch(batches(), maxsize=prefetch_batches)
+        return batches()
+
+    @traced('generate_orders', rows=lambda frames: len(frames['orders']))
     def generate_orders(self, num_orders=10, start_date=None, end_date=None):
         """
         Generate synthetic data.
-        Returns a dictionary of DataFrames.
+        Returns a dictionary of DataFrames that already match the
+        transformed schema (see ordergen.schema).
         """
-        print(f"Generating {num_orders} orders...")
-        
+        # Once per batch, so only shown with debug logging
+        logger.debug(f"Generating {num_orders} orders...")
+        batch_start = time.perf_counter()
+
         orders = []
         customers = []
         order_items = []
         order_payments = []
         order_reviews = []
+        title_rows = []
+        message_rows = []
+
+        # Purchase timestamps follow the learned arrival process
+        if not (start_date and end_date):
+            # Default: the last 30 days
+            end_date = datetime.now()
+            start_date = end_date - timedelta(days=30)
+        purchase_timestamps = pd.to_datetime(
+            self.arrivals.sample(num_orders, start_date, end_date, self.np_random)
+        ).to_pydatetime()
         
-        for _ in range(num_orders):
+        for purchase_timestamp in purchase_timestamps:
             # 1. Generate Customer
-            customer_id = str(uuid.uuid4())
-            customer_unique_id = str(uuid.uuid4())
+            customer_id = self.new_id()
+            customer_unique_id = self.new_id()
             
             # Pick a random location from learned data or fake it
             if self.zip_codes:
-                idx = random.randint(0, len(self.zip_codes) - 1)
+                idx = self.random.randint(0, len(self.zip_codes) - 1)
                 zip_code = self.zip_codes[idx]
                 city = self.cities[idx]
                 state = self.states[idx]
             else:
-                zip_code = self.fake.postcode()
-                city = self.fake.city()
+                zip_code = int(self.fake.postcode()[:5])
+                city = self.fake.city().title()
                 state = self.fake.state_abbr()
                 
             customers.append({
@@ -110,26 +219,17 @@ class OrderGenerator:
                 'customer_unique_id': customer_unique_id,
                 'customer_zip_code_prefix': zip_code,
                 'customer_city': city,
-                'customer_state': state
+                'customer_state': STATE_NAMES.get(state),
+                'customer_state_initials': state
             })
             
             # 2. Generate Order
-            order_id = str(uuid.uuid4())
+            order_id = self.new_id()
             
-            # Date generation logic
-            if start_date and end_date:
-                time_between = end_date - start_date
-                days_between = time_between.days
-                random_days = random.randint(0, days_between)
-                purchase_timestamp = start_date + timedelta(days=random_days, minutes=random.randint(0, 1440))
-            else:
-                # Default: Random date within last 30 days
-                purchase_timestamp = datetime.now() - timedelta(days=random.randint(0, 30), minutes=random.randint(0, 1440))
-                
-            approved_at = purchase_timestamp + timedelta(minutes=random.randint(10, 600))
-            delivered_carrier = approved_at + timedelta(days=random.randint(1, 3))
-            delivered_customer = delivered_carrier + timedelta(days=random.randint(1, 10))
-            estimated_delivery = purchase_timestamp + timedelta(days=random.randint(10, 20))
+            approved_at = purchase_timestamp + timedelta(minutes=self.random.randint(10, 600))
+            delivered_carrier = approved_at + timedelta(days=self.random.randint(1, 3))
+            delivered_customer = delivered_carrier + timedelta(days=self.random.randint(1, 10))
+            estimated_delivery = purchase_timestamp + timedelta(days=self.random.randint(10, 20))
             
             orders.append({
                 'order_id': order_id,
@@ -143,26 +243,26 @@ class OrderGenerator:
             })
             
             # 3. Generate Order Items
-            num_items = random.randint(1, 3)
+            num_items = self.random.randint(1, 3)
             total_value = 0
             
             for i in range(num_items):
                 if self.product_ids:
-                    product_id = random.choice(self.product_ids)
+                    product_id = self.random.choice(self.product_ids)
                 else:
-                    product_id = str(uuid.uuid4()) # Fallback
+                    product_id = self.new_id() # Fallback
                     
                 if self.seller_ids:
-                    seller_id = random.choice(self.seller_ids)
+                    seller_id = self.random.choice(self.seller_ids)
                 else:
-                    seller_id = str(uuid.uuid4())
+                    seller_id = self.new_id()
                 
                 # Get price
                 price = 50.0
                 if product_id in self.product_prices:
-                    price = random.choice(self.product_prices[product_id])
+                    price = self.random.choice(self.product_prices[product_id])
                 
-                freight = random.uniform(10, 50)
+                freight = self.random.uniform(10, 50)
                 total_value += price + freight
                 
                 order_items.append({
@@ -179,37 +279,46 @@ class OrderGenerator:
             order_payments.append({
                 'order_id': order_id,
                 'payment_sequential': 1,
-                'payment_type': random.choice(['credit_card', 'boleto', 'voucher', 'debit_card']),
-                'payment_installments': random.randint(1, 10),
+                'payment_type': self.random.choice(['credit_card', 'boleto', 'voucher', 'debit_card']),
+                'payment_installments': self.random.randint(1, 10),
                 'payment_value': total_value
             })
             
             # 5. Generate Reviews (70% chance)
-            if random.random() < 0.7:
-                review_id = str(uuid.uuid4())
-                score = random.choices([5, 4, 3, 2, 1], weights=[0.5, 0.2, 0.1, 0.1, 0.1])[0]
+            if self.random.random() < 0.7:
+                review_id = self.new_id()
+                score = self.random.choices([5, 4, 3, 2, 1], weights=[0.5, 0.2, 0.1, 0.1, 0.1])[0]
                 
-                title = None
-                message = None
-                if random.random() < 0.4:
-                    title = self.fake.sentence(nb_words=3)
-                if random.random() < 0.6:
-                    message = self.markov.generate(max_words=20)
+                # Review text is filled in from the pools after the loop
+                if self.random.random() < 0.4:
+                    title_rows.append(len(order_reviews))
+                if self.random.random() < 0.6:
+                    message_rows.append(len(order_reviews))
                     
                 order_reviews.append({
                     'review_id': review_id,
                     'order_id': order_id,
                     'review_score': score,
-                    'review_comment_title': title,
-                    'review_comment_message': message,
+                    'review_comment_title': None,
+                    'review_comment_message': None,
                     'review_creation_date': delivered_customer + timedelta(days=1),
                     'review_answer_timestamp': delivered_customer + timedelta(days=2)
                 })
 
-        return {
-            'orders': pd.DataFrame(orders),
-            'customers': pd.DataFrame(customers),
-            'order_items': pd.DataFrame(order_items),
-            'order_payments': pd.DataFrame(order_payments),
-            'order_reviews': pd.DataFrame(order_reviews)
+        # Draw all review text in two batch calls
+        for row, title in zip(title_rows, self.text_pool.sample_titles(len(title_rows))):
+            order_reviews[row]['review_comment_title'] = title
+        for row, message in zip(message_rows, self.text_pool.sample_messages(len(message_rows))):
+            order_reviews[row]['review_comment_message'] = message
+
+        # Frames are built with their final dtypes, so they can skip the ETL transforms
+        frames = {
+            'orders': build_frame('orders', orders),
+            'customers': build_frame('customers', customers),
+            'order_items': build_frame('order_items', order_items),
+            'order_payments': build_frame('order_payments', order_payments),
+            'order_reviews': build_frame('order_reviews', order_reviews)
         }
+        ORDERS_GENERATED.inc(num_orders)
+        BATCH_SECONDS.observe(time.perf_counter() - batch_start)
+        return frames
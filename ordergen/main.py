@@ -8,13 +8,11 @@ project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
 from ordergen.generator import OrderGenerator
-from etl_prod.transform.customers import transform_customers
-from etl_prod.transform.orders import transform_orders
-from etl_prod.transform.orders_items import transform_order_items
-from etl_prod.transform.order_payments import transform_order_payments
-from etl_prod.transform.order_reviews import transform_order_reviews
-from etl_prod.load import load_incremental
-from etl_prod.utils import log_message, success_message, error_message
+from ordergen.sources import SOURCES, make_source
+from ordergen.schema import validate_generated
+from etl_core.backends.supabase import load_incremental
+from etl_core.utils import log_message, success_message, error_message
+from instrumentation import span, trace_run
 
 # Load environment variables
 load_dotenv()
@@ -23,47 +21,35 @@ def main():
     parser = argparse.ArgumentParser(description="Generate synthetic orders and load them into Supabase.")
     parser.add_argument('--count', type=int, default=10, help="Number of orders to generate.")
     parser.add_argument('--data-dir', type=str, default=os.path.join(project_root, 'data'), help="Path to existing data for training.")
+    parser.add_argument('--source', choices=SOURCES, default=None, help="Where to read training data from (default: GENERATOR_SOURCE, else supabase).")
+    parser.add_argument('--parquet-dir', type=str, default=None, help="Parquet cache directory for --source parquet (default: <data-dir>/.parquet).")
+    parser.add_argument('--batch-size', type=int, default=1000, help="Orders generated and loaded per batch.")
     
     args = parser.parse_args()
     
     try:
-        # 1. Initialize and Train Generator
-        gen = OrderGenerator(args.data_dir)
-        gen.train()
-        
-        # 2. Generate Data
-        raw_data = gen.generate_orders(args.count)
-        
-        # 3. Transform Data
-        # We reuse the production transformers to ensure data quality and schema compliance
-        log_message("Transforming generated data...")
-        transformed_data = {}
-        
-        if not raw_data['customers'].empty:
-            transformed_data['customers'] = transform_customers(raw_data['customers'])
-            
-        if not raw_data['orders'].empty:
-            transformed_data['orders'] = transform_orders(raw_data['orders'])
-            
-        if not raw_data['order_items'].empty:
-            transformed_data['order_items'] = transform_order_items(raw_data['order_items'])
-            
-        if not raw_data['order_payments'].empty:
-            transformed_data['order_payments'] = transform_order_payments(raw_data['order_payments'])
-            
-        if not raw_data['order_reviews'].empty:
-            transformed_data['order_reviews'] = transform_order_reviews(raw_data['order_reviews'])
-            
-        # Note: We are not generating new products, sellers, or geolocation data in this version,
-        # so we don't need to transform/load them. We reuse existing ones.
-        
-        success_message("Data transformation complete.")
-        
-        # 4. Load Data
-        log_message("Loading data into Supabase...")
-        # We use load_incremental to upsert the new records
-        load_incremental(transformed_data)
-        
+        with trace_run('ordergen'):
+            # 1. Initialize and Train Generator
+            source = make_source(args.source, args.data_dir, args.parquet_dir) if args.source else None
+            gen = OrderGenerator(args.data_dir, source=source)
+            gen.train()
+
+            # 2. Generate Data in batches; each batch is loaded while the next is generated
+            for raw_data in gen.iter_orders(args.count, batch_size=args.batch_size, prefetch_batches=1):
+                # 3. Validate Data
+                # Generated frames already match the transformed schema, so they take the
+                # validated fast path instead of the generic cleaning transforms
+                with span('validate', rows=len(raw_data['orders'])):
+                    transformed_data = validate_generated(raw_data)
+
+                # Note: We are not generating new products, sellers, or geolocation data in this version,
+                # so we don't need to transform/load them. We reuse existing ones.
+
+                # 4. Load Data
+                # We use load_incremental to upsert the new records
+                log_message("Loading batch into Supabase...")
+                load_incremental(transformed_data)
+
         success_message(f"Successfully generated and loaded {args.count} orders.")
         
     except Exception as e:
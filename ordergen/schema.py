@@ -0,0 +1,137 @@
+import pandas as pd
+
+# State mapping from initials to full names, as applied by the ETL transforms
+STATE_NAMES = {
+    'SP': 'São Paulo',
+    'RJ': 'Rio de Janeiro',
+    'MG': 'Minas Gerais',
+    'RS': 'Rio Grande do Sul',
+    'PR': 'Paraná',
+    'SC': 'Santa Catarina',
+    'BA': 'Bahia',
+    'DF': 'Distrito Federal',
+    'ES': 'Espírito Santo',
+    'GO': 'Goiás',
+    'PE': 'Pernambuco',
+    'CE': 'Ceará',
+    'PA': 'Pará',
+    'MT': 'Mato Grosso',
+    'MA': 'Maranhão',
+    'MS': 'Mato Grosso do Sul',
+    'PB': 'Paraíba',
+    'PI': 'Piauí',
+    'RN': 'Rio Grande do Norte',
+    'AL': 'Alagoas',
+    'SE': 'Sergipe',
+    'TO': 'Tocantins',
+    'RO': 'Rondônia',
+    'AM': 'Amazonas',
+    'AC': 'Acre',
+    'AP': 'Amapá',
+    'RR': 'Roraima'
+}
+
+# Columns and dtypes of each generated table, matching the output of the
+# etl_core transformers so generated frames can be loaded without them
+GENERATED_SCHEMA = {
+    'customers': {
+        'customer_id': 'string',
+        'customer_unique_id': 'string',
+        'customer_zip_code_prefix': 'Int64',
+        'customer_city': 'string',
+        'customer_state': 'string',
+        'customer_state_initials': 'string',
+    },
+    'orders': {
+        'order_id': 'string',
+        'customer_id': 'string',
+        'order_status': 'string',
+        'order_purchase_timestamp': 'datetime64[ns]',
+        'order_approved_at': 'datetime64[ns]',
+        'order_delivered_carrier_date': 'datetime64[ns]',
+        'order_delivered_customer_date': 'datetime64[ns]',
+        'order_estimated_delivery_date': 'datetime64[ns]',
+    },
+    'order_items': {
+        'order_id': 'string',
+        'order_item_id': 'int64',
+        'product_id': 'string',
+        'seller_id': 'string',
+        'shipping_limit_date': 'datetime64[ns]',
+        'price': 'float64',
+        'freight_value': 'float64',
+    },
+    'order_payments': {
+        'order_id': 'string',
+        'payment_sequential': 'Int64',
+        'payment_type': 'string',
+        'payment_installments': 'Int64',
+        'payment_value': 'float64',
+    },
+    'order_reviews': {
+        'review_id': 'string',
+        'order_id': 'string',
+        'review_score': 'Int64',
+        'review_comment_title': 'string',
+        'review_comment_message': 'string',
+        'review_creation_date': 'datetime64[ns]',
+        'review_answer_timestamp': 'datetime64[ns]',
+    },
+}
+
+# Primary key columns that must never be null
+PRIMARY_KEYS = {
+    'customers': ['customer_id'],
+    'orders': ['order_id'],
+    'order_items': ['order_id', 'order_item_id'],
+    'order_payments': ['order_id', 'payment_sequential'],
+    'order_reviews': ['order_id'],
+}
+
+def build_frame(table, records):
+    """
+    Build a typed DataFrame for a generated table straight from row dictionaries.
+
+    Arguments:
+        table (str): Key of GENERATED_SCHEMA.
+        records (list): Row dictionaries holding every column of the table.
+
+    Returns:
+        pd.DataFrame: Frame with the schema's columns and dtypes.
+    """
+    columns = GENERATED_SCHEMA[table]
+    return pd.DataFrame({
+        col: pd.array([record[col] for record in records], dtype=dtype)
+        for col, dtype in columns.items()
+    })
+
+def validate_generated(raw_data):
+    """
+    Validated fast path replacing the generic transforms for generated data.
+
+    The generator already emits clean, typed frames, so instead of re-casting,
+    title-casing and de-duplicating every column this only checks that each
+    frame matches GENERATED_SCHEMA and has non-null primary keys. Empty frames
+    are dropped, as the transform step used to do.
+
+    Arguments:
+        raw_data (dict): Dictionary of generated DataFrames.
+
+    Returns:
+        dict: The non-empty frames, ready for load_incremental.
+    """
+    validated = {}
+    for table, df in raw_data.items():
+        if df is None or df.empty:
+            continue
+        expected = GENERATED_SCHEMA[table]
+        if list(df.columns) != list(expected):
+            raise ValueError(f"Generated {table} columns {list(df.columns)} do not match schema {list(expected)}")
+        for col, dtype in expected.items():
+            if df[col].dtype != dtype:
+                raise ValueError(f"Generated {table}.{col} has dtype {df[col].dtype}, expected {dtype}")
+        for col in PRIMARY_KEYS[table]:
+            if df[col].isna().any():
+                raise ValueError(f"Generated {table}.{col} contains null keys")
+        validated[table] = df
+    return validated
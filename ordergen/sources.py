@@ -0,0 +1,197 @@
+import importlib.util
+import os
+import numpy as np
+import pandas as pd
+
+# Olist CSV file for each table the generator trains on
+CSV_FILES = {
+    'products': 'olist_products_dataset.csv',
+    'sellers': 'olist_sellers_dataset.csv',
+    'geolocation': 'olist_geolocation_dataset.csv',
+    'order_items': 'olist_order_items_dataset.csv',
+    'orders': 'olist_orders_dataset.csv',
+    'order_reviews': 'olist_order_reviews_dataset.csv',
+}
+
+class SourceError(Exception):
+    """
+    Raised when a source cannot provide a table.
+    """
+
+def spread(df, limit):
+    """
+    At most `limit` rows of `df`, evenly spaced over it rather than taken from
+    its start: tables are ordered by key, and for geolocation the key is the
+    zip code, so the first rows all lie in one region.
+    """
+    if not limit or len(df) <= limit:
+        return df
+    return df.iloc[np.linspace(0, len(df) - 1, limit).round().astype(int)].reset_index(drop=True)
+
+class Source:
+    """
+    Where the generator reads its training data from.
+
+    A source returns a table as a DataFrame with the requested columns, named
+    as in the database (i.e. after the ETL transforms), in the same order on
+    every read. `limit` caps the rows returned, spread over the whole table
+    (see `spread`).
+    """
+    def read(self, table, columns, limit=None):
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"{type(self).__name__}()"
+
+class SupabaseSource(Source):
+    """
+    Reads the reference tables (products, sellers, geolocation) from Supabase.
+
+    The fact tables are far too large to pull through the REST API, so reads
+    of any other table go to `fallback` (typically the local CSVs). Tables
+    are read in pages ordered by their key, so every read returns the same
+    rows in the same order.
+    """
+    # Primary key of each table read from Supabase
+    TABLES = {'products': 'product_id', 'sellers': 'seller_id', 'geolocation': 'geolocation_zip_code_prefix'}
+    # PostgREST caps each response, 1000 rows by default on Supabase
+    PAGE_SIZE = 1000
+
+    def __init__(self, client=None, fallback=None):
+        self.client = client
+        self.fallback = fallback
+
+    def read(self, table, columns, limit=None):
+        if table not in self.TABLES:
+            if self.fallback is None:
+                raise SourceError(f"{table} is not read from Supabase and no fallback source is set")
+            return self.fallback.read(table, columns, limit)
+        if self.client is None:
+            # Imported here so offline sources never pull in the Supabase client
+            from etl_core.backends.supabase import get_supabase_client
+            self.client = get_supabase_client()
+        rows = []
+        while True:
+            page = (
+                self.client.table(table).select(','.join(columns))
+                .order(self.TABLES[table])
+                .range(len(rows), len(rows) + self.PAGE_SIZE - 1)
+                .execute().data
+            )
+            rows.extend(page)
+            if len(page) < self.PAGE_SIZE:
+                break
+        return spread(pd.DataFrame(rows, columns=columns), limit)
+
+    def __getstate__(self):
+        # The client holds live connections; each process creates its own
+        state = self.__dict__.copy()
+        state['client'] = None
+        return state
+
+    def __repr__(self):
+        return f"SupabaseSource(fallback={self.fallback!r})"
+
+class CsvSource(Source):
+    """
+    Reads the raw Olist CSVs from a local directory.
+
+    The raw files predate the transforms. Geolocation, whose raw file has
+    ~50 points per zip code prefix, is run through its ETL transform so it
+    has one row per prefix as in the database.
+    """
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+
+    def read(self, table, columns, limit=None):
+        if table not in CSV_FILES:
+            raise SourceError(f"No CSV file is known for {table}")
+        path = os.path.join(self.data_dir, CSV_FILES[table])
+        if not os.path.exists(path):
+            raise SourceError(f"File not found: {path}")
+
+        if table == 'geolocation':
+            # Imported here so the other tables never pull in the transforms
+            from etl_core.transform.geolocation import transform_geolocation
+            df = transform_geolocation(pd.read_csv(path))
+            return spread(df.sort_values('geolocation_zip_code_prefix', ignore_index=True)[columns], limit)
+        return spread(pd.read_csv(path, usecols=columns)[columns], limit)
+
+    def __repr__(self):
+        return f"CsvSource({self.data_dir!r})"
+
+class ParquetSource(Source):
+    """
+    A local Parquet cache of another source, one file per table.
+
+    Tables missing from the cache are read in full from `upstream` and written
+    to the cache, so the first run pays for the CSV parsing and later runs
+    read only the columns they need. Needs pyarrow or fastparquet.
+    """
+    def __init__(self, cache_dir, upstream=None):
+        if not (importlib.util.find_spec('pyarrow') or importlib.util.find_spec('fastparquet')):
+            raise ImportError("ParquetSource needs pyarrow or fastparquet: pip install pyarrow")
+        self.cache_dir = cache_dir
+        self.upstream = upstream
+
+    def path(self, table):
+        return os.path.join(self.cache_dir, f"{table}.parquet")
+
+    def read(self, table, columns, limit=None):
+        path = self.path(table)
+        if os.path.exists(path):
+            try:
+                return spread(pd.read_parquet(path, columns=columns), limit)
+            except (KeyError, ValueError):
+                # Cached with other columns; refreshed from upstream below
+                pass
+        if self.upstream is None:
+            raise SourceError(f"{table} is not cached in {self.cache_dir} and no upstream source is set")
+        # The whole table is cached, so a later read with a different limit is still served
+        df = self.upstream.read(table, columns)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        df.to_parquet(path, index=False)
+        return spread(df, limit)
+
+    def __repr__(self):
+        return f"ParquetSource({self.cache_dir!r}, upstream={self.upstream!r})"
+
+class FrameSource(Source):
+    """
+    Serves tables from DataFrames already in memory, e.g. in tests or when
+    another stage of the pipeline has just produced them.
+    """
+    def __init__(self, frames):
+        self.frames = frames
+
+    def read(self, table, columns, limit=None):
+        if table not in self.frames:
+            raise SourceError(f"No frame given for {table}")
+        return spread(self.frames[table][columns], limit)
+
+    def __repr__(self):
+        return f"FrameSource({sorted(self.frames)})"
+
+SOURCES = ('supabase', 'csv', 'parquet')
+
+def make_source(kind, data_dir, cache_dir=None):
+    """
+    Build a source by name, as chosen on the command line.
+
+    Arguments:
+        kind (str): "supabase" (reference tables from Supabase, the rest from
+            the CSVs), "csv" (only the CSVs) or "parquet" (a Parquet cache of
+            the CSVs).
+        data_dir (str): Directory of the Olist CSVs.
+        cache_dir (str): Parquet cache directory; defaults to data_dir/.parquet.
+
+    Returns:
+        Source: The configured source.
+    """
+    if kind == 'supabase':
+        return SupabaseSource(fallback=CsvSource(data_dir))
+    if kind == 'csv':
+        return CsvSource(data_dir)
+    if kind == 'parquet':
+        return ParquetSource(cache_dir or os.path.join(data_dir, '.parquet'), upstream=CsvSource(data_dir))
+    raise ValueError(f"Unknown source {kind!r}; expected one of {', '.join(SOURCES)}")
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+from ordergen.arrivals import ArrivalModel, black_friday
+
+def fitted_model():
+    # Afternoon-heavy weekdays over a few months
+    rng = np.random.default_rng(0)
+    days = pd.date_range('2017-01-01', '2017-04-30', freq='D')
+    stamps = [
+        day + pd.Timedelta(hours=int(hour), seconds=int(rng.integers(0, 3600)))
+        for day in days
+        for hour in rng.choice(24, size=20, p=np.r_[np.full(12, 1 / 48), np.full(12, 3 / 48)])
+    ]
+    return ArrivalModel().fit(pd.Series(stamps))
+
+def test_black_friday():
+    assert str(black_friday(2017)) == '2017-11-24'
+    assert str(black_friday(2018)) == '2018-11-23'
+
+def test_samples_stay_in_short_windows():
+    model = fitted_model()
+    rng = np.random.default_rng(1)
+    # Sub-second, across midnight, and a partial first and last day
+    for start, end in [
+        ('2018-01-01 03:00:00.5', '2018-01-01 03:00:01'),
+        ('2018-01-01 23:59:59', '2018-01-02 00:00:01'),
+        ('2018-01-01 10:30', '2018-01-03 02:15'),
+    ]:
+        stamps = model.sample(1000, start, end, rng)
+        assert len(stamps) == 1000
+        assert (stamps >= np.datetime64(pd.Timestamp(start), 'ns')).all()
+        assert (stamps < np.datetime64(pd.Timestamp(end), 'ns')).all()
+        assert (np.diff(stamps) >= np.timedelta64(0)).all()
+
+def test_hours_follow_the_fitted_profile():
+    model = fitted_model()
+    stamps = model.sample(50000, '2018-01-01', '2018-03-01', np.random.default_rng(2))
+    afternoon = (pd.DatetimeIndex(stamps).hour >= 12).mean()
+    # About 3/4, less the smoothing of the fitted profiles
+    expected = model.hour_profiles[:, 12:].sum(axis=1).mean()
+    assert 0.7 < expected < 0.75
+    assert abs(afternoon - expected) < 0.01
+
+def test_empty_window():
+    model = fitted_model()
+    assert len(model.sample(0, '2018-01-01', '2018-01-02')) == 0
+    assert (model.sample(3, '2018-01-02', '2018-01-01') == np.datetime64('2018-01-02', 'ns')).all()
@@ -0,0 +1,54 @@
+from datetime import datetime
+from ordergen.backfill import Checkpoint, derive_seed, plan_shards
+
+START = datetime(2018, 1, 1)
+END = datetime(2018, 1, 11)
+
+def test_shards_cover_the_count_and_the_period():
+    shards = plan_shards(1003, START, END, workers=4, batch_size=100)
+    assert [s['count'] for s in shards] == [251, 251, 251, 250]
+    assert shards[0]['start_date'] == START and shards[-1]['end_date'] == END
+    # Contiguous windows, each shard's end the next one's start
+    for left, right in zip(shards, shards[1:]):
+        assert left['end_date'] == right['start_date']
+
+def test_batches_are_capped_and_numbered_globally():
+    shards = plan_shards(1003, START, END, workers=4, batch_size=100)
+    for shard in shards:
+        assert sum(b['count'] for b in shard['batches']) == shard['count']
+        assert all(b['count'] <= 100 for b in shard['batches'])
+    indices = [b['index'] for s in shards for b in s['batches']]
+    assert indices == list(range(len(indices)))
+
+def test_plan_is_stable_for_the_same_parameters():
+    assert plan_shards(500, START, END, 3, 64) == plan_shards(500, START, END, 3, 64)
+
+def test_no_more_shards_than_orders():
+    shards = plan_shards(2, START, END, workers=8, batch_size=10)
+    assert [s['count'] for s in shards] == [1, 1]
+
+def test_seeds_are_stable_and_distinct_per_batch():
+    assert derive_seed('run', 'batch', 3) == derive_seed('run', 'batch', 3)
+    assert derive_seed('run', 'batch', 3) != derive_seed('run', 'batch', 4)
+    assert derive_seed('run', 'batch', 3) != derive_seed('other', 'batch', 3)
+    assert 0 <= derive_seed('run') < 2 ** 64
+
+def test_checkpoint_round_trips_params_and_completed_batches(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path), 'run-1')
+    assert not checkpoint.exists() and checkpoint.completed() == set()
+    checkpoint.save_params({'count': 1003, 'workers': 4})
+    assert checkpoint.exists()
+    assert Checkpoint(str(tmp_path), 'run-1').load_params() == {'count': 1003, 'workers': 4}
+
+    checkpoint.mark_done(0, 0)
+    checkpoint.mark_done(1, 3)
+    checkpoint.mark_done(0, 1)
+    assert Checkpoint(str(tmp_path), 'run-1').completed() == {0, 1, 3}
+
+def test_checkpoint_ignores_a_torn_final_line(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path), 'run-1')
+    checkpoint.save_params({})
+    checkpoint.mark_done(0, 5)
+    with open(tmp_path / 'run-1' / 'shard-0.done', 'a') as f:
+        f.write('1')
+    assert checkpoint.completed() == {5}
@@ -0,0 +1,63 @@
+from collections import Counter
+from ordergen.utils import TOKEN_PATTERN, CompiledMarkovChain
+
+CORPUS = [
+    "the product arrived early and works well.",
+    "the product arrived broken, very sad!",
+    "the delivery was fast and the product works well.",
+    "very good seller, recommend.",
+]
+
+def transitions(texts, state_size=2):
+    seen = set()
+    for text in texts:
+        words = TOKEN_PATTERN.findall(text)
+        for i in range(len(words) - state_size):
+            seen.add((tuple(words[i:i + state_size]), words[i + state_size]))
+    return seen
+
+def test_a_single_sentence_is_reproduced_exactly():
+    chain = CompiledMarkovChain(seed=1)
+    chain.train(["arrived on time, thank you."])
+    assert chain.generate_batch(3) == ["arrived on time, thank you."] * 3
+
+def test_samples_only_follow_trained_transitions():
+    chain = CompiledMarkovChain(seed=7)
+    chain.train(CORPUS)
+    known = transitions(CORPUS)
+    starts = {tuple(TOKEN_PATTERN.findall(text)[:2]) for text in CORPUS}
+    for sentence in chain.generate_batch(500):
+        words = TOKEN_PATTERN.findall(sentence)
+        assert tuple(words[:2]) in starts
+        for i in range(len(words) - 2):
+            assert (tuple(words[i:i + 2]), words[i + 2]) in known
+
+def test_sentences_stop_at_an_end_mark_or_max_words():
+    chain = CompiledMarkovChain(seed=3)
+    chain.train(CORPUS + ["and so on and so on and so on and so on"])
+    for sentence in chain.generate_batch(200, max_words=5):
+        words = TOKEN_PATTERN.findall(sentence)
+        assert len(words) <= 2 + 5
+        assert not any(w in '.!?' for w in words[:-1])
+
+def test_start_states_are_weighted_by_frequency():
+    chain = CompiledMarkovChain(seed=11)
+    chain.train(["very good."] * 3 + ["too slow."])
+    counts = Counter(chain.generate_batch(4000))
+    assert set(counts) == {"very good.", "too slow."}
+    assert 0.7 < counts["very good."] / 4000 < 0.8
+
+def test_same_seed_same_sentences():
+    first, second = CompiledMarkovChain(seed=5), CompiledMarkovChain(seed=5)
+    first.train(CORPUS)
+    second.train(CORPUS)
+    assert first.generate_batch(50) == second.generate_batch(50)
+
+def test_untrained_or_retrained_chain():
+    chain = CompiledMarkovChain(seed=0)
+    chain.train([None, "one"])
+    assert chain.generate_batch(2) == ["Great product!"] * 2
+    assert chain.generate_batch(0) == []
+    # Training again replaces the model rather than adding to it
+    chain.train(["all good."])
+    assert chain.generate() == "all good."
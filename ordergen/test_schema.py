@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+from ordergen.schema import GENERATED_SCHEMA, build_frame, validate_generated
+
+def payments(**overrides):
+    record = {
+        'order_id': 'o1',
+        'payment_sequential': 1,
+        'payment_type': 'credit_card',
+        'payment_installments': 3,
+        'payment_value': 99.9,
+    }
+    return build_frame('order_payments', [{**record, **overrides}])
+
+def test_build_frame_matches_the_schema():
+    frame = payments()
+    assert list(frame.columns) == list(GENERATED_SCHEMA['order_payments'])
+    assert {col: str(dtype) for col, dtype in frame.dtypes.items()} == GENERATED_SCHEMA['order_payments']
+
+def test_valid_frames_pass_and_empty_ones_are_dropped():
+    frame = payments()
+    validated = validate_generated({'order_payments': frame, 'order_reviews': build_frame('order_reviews', []), 'orders': None})
+    assert list(validated) == ['order_payments']
+    # Frames are passed through, not copied
+    assert validated['order_payments'] is frame
+
+def test_reordered_or_missing_columns_are_rejected():
+    frame = payments()
+    with pytest.raises(ValueError, match="columns"):
+        validate_generated({'order_payments': frame[frame.columns[::-1]]})
+    with pytest.raises(ValueError, match="columns"):
+        validate_generated({'order_payments': frame.drop(columns=['payment_type'])})
+
+def test_wrong_dtype_is_rejected():
+    frame = payments()
+    frame['payment_value'] = frame['payment_value'].astype('string')
+    with pytest.raises(ValueError, match="payment_value has dtype"):
+        validate_generated({'order_payments': frame})
+
+def test_null_primary_key_is_rejected():
+    frame = payments(payment_sequential=pd.NA)
+    with pytest.raises(ValueError, match="payment_sequential contains null keys"):
+        validate_generated({'order_payments': frame})
@@ -1,55 +1,320 @@
+import contextvars
+import queue
 import random
 import re
-from collections import defaultdict
+import threading
+import numpy as np
+from faker import Faker
 
-class SimpleMarkovChain:
-    def __init__(self, state_size=2):
+TOKEN_PATTERN = re.compile(r'\w+|[.,!?;]')
+SENTENCE_END = {'.', '!', '?'}
+
+class CompiledMarkovChain:
+    """
+    Word-level Markov chain compiled into flat integer arrays.
+
+    Words are interned to integer IDs and every state (a tuple of
+    `state_size` word IDs) gets a row in a CSR-style transition table.
+    Each row stores its distinct next words with cumulative counts, so a
+    single `np.searchsorted` call samples the next word for a whole batch
+    of sentences at once.
+    """
+    def __init__(self, state_size=2, seed=None):
         self.state_size = state_size
-        self.chain = defaultdict(list)
-        self.start_words = []
+        self.rng = np.random.default_rng(seed)
+
+        # Vocabulary
+        self.vocab = []
+        self.is_terminal = np.zeros(0, dtype=bool)
+
+        # Compiled transition table
+        self.state_words = np.zeros((0, state_size), dtype=np.int32)
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.next_words = np.zeros(0, dtype=np.int32)
+        self.next_states = np.zeros(0, dtype=np.int32)
+        self.cumulative = np.zeros(0, dtype=np.int64)
+
+        # Start state distribution
+        self.start_states = np.zeros(0, dtype=np.int32)
+        self.start_cumulative = np.zeros(0, dtype=np.int64)
 
     def train(self, text_list):
         """
         Train the Markov Chain on a list of strings.
+        Calling train again replaces the previously compiled model.
         """
+        word_ids = {}
+        state_ids = {}
+        start_counts = {}
+        transition_counts = {}
+
+        def intern(word):
+            word_id = word_ids.get(word)
+            if word_id is None:
+                word_id = len(word_ids)
+                word_ids[word] = word_id
+            return word_id
+
+        def state_id(state):
+            sid = state_ids.get(state)
+            if sid is None:
+                sid = len(state_ids)
+                state_ids[state] = sid
+            return sid
+
         for text in text_list:
             if not isinstance(text, str):
                 continue
-            
+
             # Simple tokenization
-            words = re.findall(r'\w+|[.,!?;]', text)
+            words = [intern(w) for w in TOKEN_PATTERN.findall(text)]
             if len(words) < self.state_size:
                 continue
-                
-            self.start_words.append(tuple(words[:self.state_size]))
-            
+
+            start = state_id(tuple(words[:self.state_size]))
+            start_counts[start] = start_counts.get(start, 0) + 1
+
             for i in range(len(words) - self.state_size):
-                state = tuple(words[i:i + self.state_size])
-                next_word = words[i + self.state_size]
-                self.chain[state].append(next_word)
+                key = (state_id(tuple(words[i:i + self.state_size])), words[i + self.state_size])
+                transition_counts[key] = transition_counts.get(key, 0) + 1
+
+        self._compile(word_ids, state_ids, start_counts, transition_counts)
+
+    def _compile(self, word_ids, state_ids, start_counts, transition_counts):
+        """
+        Turn the counting dictionaries built by `train` into flat arrays.
+        """
+        self.vocab = list(word_ids)
+        self.is_terminal = np.array([w in SENTENCE_END for w in self.vocab], dtype=bool)
+
+        num_states = len(state_ids)
+        self.state_words = np.array(list(state_ids), dtype=np.int32).reshape(num_states, self.state_size)
+
+        # Transitions sorted by source state form contiguous rows
+        if transition_counts:
+            keys = np.array(list(transition_counts), dtype=np.int64)
+            counts = np.fromiter(transition_counts.values(), dtype=np.int64, count=len(transition_counts))
+        else:
+            keys = np.zeros((0, 2), dtype=np.int64)
+            counts = np.zeros(0, dtype=np.int64)
+        order = np.argsort(keys[:, 0], kind='stable')
+        sources = keys[order, 0]
+        self.next_words = keys[order, 1].astype(np.int32)
+        self.cumulative = np.cumsum(counts[order])
+        self.offsets = np.searchsorted(sources, np.arange(num_states + 1)).astype(np.int64)
+
+        # Resolve the state reached after each transition (-1 for dead ends)
+        sources_words = self.state_words[sources]
+        self.next_states = np.array([
+            state_ids.get(tuple(src[1:]) + (int(nxt),), -1)
+            for src, nxt in zip(sources_words.tolist(), self.next_words.tolist())
+        ], dtype=np.int32)
+
+        self.start_states = np.fromiter(start_counts.keys(), dtype=np.int32, count=len(start_counts))
+        self.start_cumulative = np.cumsum(np.fromiter(start_counts.values(), dtype=np.int64, count=len(start_counts)))
+
+    def generate_batch(self, n, max_words=50):
+        """
+        Generate `n` random sentences in one vectorized pass.
+        """
+        if n <= 0:
+            return []
+        if len(self.start_states) == 0:
+            return ["Great product!"] * n
+
+        # Pick start states weighted by how often they opened a comment
+        draws = self.rng.integers(0, self.start_cumulative[-1], size=n)
+        states = self.start_states[np.searchsorted(self.start_cumulative, draws, side='right')]
+
+        tokens = np.full((n, self.state_size + max_words), -1, dtype=np.int32)
+        tokens[:, :self.state_size] = self.state_words[states]
+
+        active = np.arange(n)
+        for step in range(max_words):
+            # Drop sentences whose state has no outgoing transitions
+            lo = self.offsets[states]
+            hi = self.offsets[states + 1]
+            alive = hi > lo
+            active, states, lo, hi = active[alive], states[alive], lo[alive], hi[alive]
+            if len(active) == 0:
+                break
+
+            # Sample within each row of the global cumulative table
+            base = np.where(lo > 0, self.cumulative[lo - 1], 0)
+            targets = base + self.rng.integers(0, self.cumulative[hi - 1] - base)
+            picks = np.searchsorted(self.cumulative, targets, side='right')
+
+            words = self.next_words[picks]
+            tokens[active, self.state_size + step] = words
+
+            keep = ~self.is_terminal[words] & (self.next_states[picks] >= 0)
+            active, states = active[keep], self.next_states[picks][keep]
+
+        vocab = self.vocab
+        return [
+            ' '.join(vocab[t] for t in row if t >= 0).replace(' .', '.').replace(' ,', ',')
+            for row in tokens.tolist()
+        ]
 
     def generate(self, max_words=50):
         """
         Generate a random sentence.
         """
-        if not self.start_words:
-            return "Great product!"
+        return self.generate_batch(1, max_words=max_words)[0]
+
+class ReviewTextPool:
+    """
+    Pre-generated pools of review titles and messages.
+
+    Titles come from Faker and messages from a `CompiledMarkovChain`, both
+    produced in a single batch call and deduplicated. Callers sample from the
+    pools with replacement; once enough samples have been drawn the pools are
+    rebuilt on a background thread and swapped in, so fresh text keeps
+    flowing without ever blocking the order loop.
+    """
+    def __init__(self, markov, size=2000, max_words=20, title_words=3,
+                 seed=None, background_refill=True, refill_after=None):
+        self.markov = markov
+        self.size = size
+        self.max_words = max_words
+        self.title_words = title_words
+        self.background_refill = background_refill
+        self.refill_after = refill_after or size * 5
+        self.rng = np.random.default_rng(seed)
+
+        # Dedicated Faker instance so background refills never share state
+        # with the generator's own Faker
+        self.fake = Faker('pt_BR')
+        if seed is not None:
+            self.fake.seed_instance(seed)
+
+        self.titles = []
+        self.messages = []
+        self._draws = 0
+        self._lock = threading.Lock()
+        self._refill_thread = None
+
+    def __getstate__(self):
+        # Locks and threads cannot cross process boundaries
+        state = self.__dict__.copy()
+        state['_lock'] = None
+        state['_refill_thread'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _build(self):
+        titles = [self.fake.sentence(nb_words=self.title_words) for _ in range(self.size)]
+        messages = self.markov.generate_batch(self.size, max_words=self.max_words)
+        return list(dict.fromkeys(titles)), list(dict.fromkeys(messages))
+
+    def fill(self):
+        """
+        Synchronously (re)build both pools.
+        """
+        titles, messages = self._build()
+        with self._lock:
+            self.titles, self.messages = titles, messages
+            self._draws = 0
+
+    def _refill_in_background(self):
+        titles, messages = self._build()
+        with self._lock:
+            self.titles, self.messages = titles, messages
+            self._draws = 0
+            self._refill_thread = None
+
+    def _sample(self, pool_name, n, rng):
+        if n <= 0:
+            return []
+        if not self.titles or not self.messages:
+            self.fill()
+
+        with self._lock:
+            pool = getattr(self, pool_name)
+            self._draws += n
+            if (self.background_refill and self._refill_thread is None
+                    and self._draws >= self.refill_after):
+                self._refill_thread = threading.Thread(target=self._refill_in_background, daemon=True)
+                self._refill_thread.start()
+
+        rng = rng if rng is not None else self.rng
+        return [pool[i] for i in rng.integers(0, len(pool), size=n)]
+
+    def sample_titles(self, n, rng=None):
+        """
+        Draw `n` review titles with replacement.
+        """
+        return self._sample('titles', n, rng)
+
+    def sample_messages(self, n, rng=None):
+        """
+        Draw `n` review messages with replacement.
+        """
+        return self._sample('messages', n, rng)
+
+def prefetch(iterable, maxsize=1, poll_seconds=0.1):
+    """
+    Consume `iterable` on a background thread, buffering at most `maxsize` items.
+
+    The caller can work on item N while item N+1 is being produced. Exceptions
+    raised by the producer are re-raised in the consumer. If the consumer
+    stops early (an exception, or the generator being closed), the producer
+    stops after its current item, and `iterable` is closed if it can be.
+    """
+    items = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    done = object()
+
+    def put(entry):
+        # A full queue is retried until the consumer takes the item or goes away
+        while not stop.is_set():
+            try:
+                items.put(entry, timeout=poll_seconds)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        iterator = iter(iterable)
+        try:
+            for item in iterator:
+                if not put((item, None)):
+                    return
+            put((done, None))
+        except Exception as e:
+            put((None, e))
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+
+    # The producer runs in a copy of the caller's context, so its work is
+    # traced as part of the caller's run
+    context = contextvars.copy_context()
+    producer = threading.Thread(target=context.run, args=(produce,), daemon=True)
+    producer.start()
 
-        state = random.choice(self.start_words)
-        result = list(state)
-        
-        for _ in range(max_words):
-            next_words = self.chain.get(state)
-            if not next_words:
+    try:
+        while True:
+            item, error = items.get()
+            if error is not None:
+                raise error
+            if item is done:
                 break
-            next_word = random.choice(next_words)
-            result.append(next_word)
-            state = tuple(result[-self.state_size:])
-            
-            if next_word in '.!?':
+            yield item
+    finally:
+        stop.set()
+        # Drop buffered items so they are freed without waiting for the producer
+        while True:
+            try:
+                items.get_nowait()
+            except queue.Empty:
                 break
-                
-        return ' '.join(result).replace(' .', '.').replace(' ,', ',')
+        producer.join()
 
 def get_random_subset(data_list, sample_size=1000):
     if len(data_list) > sample_size:
@@ -0,0 +1,143 @@
+-- KPI Rollup Reports
+-- The executive, sales, payment and satisfaction metrics read from the daily
+-- rollup tables maintained by db_schema/rollups.py instead of the raw tables.
+-- :start_date and :end_date (either may be NULL) bound the purchase days.
+
+-- 1. Daily KPIs
+SELECT
+    day,
+    SUM(order_count) as orders,
+    SUM(delivered_orders) as delivered_orders,
+    ROUND(SUM(revenue)::numeric, 2) as revenue,
+    ROUND((SUM(revenue) / NULLIF(SUM(delivered_orders), 0))::numeric, 2) as average_order_value,
+    ROUND((SUM(lead_time_days_sum) / NULLIF(SUM(lead_time_orders), 0))::numeric, 2) as avg_delivery_days,
+    ROUND((SUM(delayed_orders)::numeric / NULLIF(SUM(lead_time_orders), 0)) * 100, 2) as delayed_percentage,
+    ROUND((SUM(review_score_sum)::numeric / NULLIF(SUM(review_count), 0)), 2) as avg_review_score
+FROM rollup_daily_state
+WHERE (CAST(:start_date AS date) IS NULL OR day >= CAST(:start_date AS date))
+    AND (CAST(:end_date AS date) IS NULL OR day < CAST(:end_date AS date))
+GROUP BY day
+ORDER BY day;
+
+-- 2. Executive Overview
+SELECT
+    ROUND(SUM(revenue)::numeric, 2) as total_revenue,
+    ROUND((SUM(revenue) / NULLIF(SUM(delivered_orders), 0))::numeric, 2) as average_order_value,
+    SUM(delivered_orders) as total_orders,
+    ROUND((SUM(lead_time_days_sum) / NULLIF(SUM(lead_time_orders), 0))::numeric, 2) as avg_delivery_days,
+    ROUND((SUM(review_score_sum)::numeric / NULLIF(SUM(review_count), 0)), 2) as avg_review_score
+FROM rollup_daily_state
+WHERE (CAST(:start_date AS date) IS NULL OR day >= CAST(:start_date AS date))
+    AND (CAST(:end_date AS date) IS NULL OR day < CAST(:end_date AS date));
+
+-- 3. Revenue by State
+SELECT
+    customer_state,
+    SUM(delivered_orders) as delivered_orders,
+    ROUND(SUM(revenue)::numeric, 2) as total_revenue,
+    ROUND((SUM(revenue) / NULLIF(SUM(delivered_orders), 0))::numeric, 2) as average_order_value
+FROM rollup_daily_state
+WHERE (CAST(:start_date AS date) IS NULL OR day >= CAST(:start_date AS date))
+    AND (CAST(:end_date AS date) IS NULL OR day < CAST(:end_date AS date))
+GROUP BY customer_state
+ORDER BY total_revenue DESC;
+
+-- 4. Category Revenue Contribution
+SELECT
+    category,
+    ROUND(SUM(revenue)::numeric, 2) as category_revenue,
+    SUM(order_count) as orders_in_category,
+    SUM(items_sold) as items_sold,
+    ROUND((SUM(price_sum) / NULLIF(SUM(items_sold), 0))::numeric, 2) as avg_price
+FROM rollup_daily_category
+WHERE (CAST(:start_date AS date) IS NULL OR day >= CAST(:start_date AS date))
+    AND (CAST(:end_date AS date) IS NULL OR day < CAST(:end_date AS date))
+GROUP BY category
+ORDER BY category_revenue DESC;
+
+-- 5. Top Sellers
+SELECT
+    seller_id,
+    SUM(order_count) as order_count,
+    SUM(items_sold) as items_sold,
+    ROUND(SUM(revenue)::numeric, 2) as total_revenue
+FROM rollup_daily_seller
+WHERE (CAST(:start_date AS date) IS NULL OR day >= CAST(:start_date AS date))
+    AND (CAST(:end_date AS date) IS NULL OR day < CAST(:end_date AS date))
+GROUP BY seller_id
+ORDER BY total_revenue DESC
+LIMIT 20;
+
+-- 6. Payment Method Share
+SELECT
+    payment_type,
+    SUM(transaction_count) as transaction_count,
+    ROUND(SUM(payment_value_sum)::numeric, 2) as total_value,
+    ROUND((SUM(payment_value_sum) / SUM(transaction_count))::numeric, 2) as avg_payment_value,
+    ROUND((SUM(transaction_count)::numeric / SUM(SUM(transaction_count)) OVER ()) * 100, 2) as percentage_share
+FROM rollup_daily_payment
+WHERE (CAST(:start_date AS date) IS NULL OR day >= CAST(:start_date AS date))
+    AND (CAST(:end_date AS date) IS NULL OR day < CAST(:end_date AS date))
+GROUP BY payment_type
+ORDER BY total_value DESC;
+
+-- 7. Installment Count Distribution
+SELECT
+    payment_installments as installment_count,
+    SUM(transaction_count) as payment_count,
+    ROUND(SUM(payment_value_sum)::numeric, 2) as total_value,
+    ROUND((SUM(payment_value_sum) / SUM(transaction_count))::numeric, 2) as avg_payment_value,
+    ROUND((SUM(transaction_count)::numeric / SUM(SUM(transaction_count)) OVER ()) * 100, 2) as percentage
+FROM rollup_daily_payment
+WHERE (CAST(:start_date AS date) IS NULL OR day >= CAST(:start_date AS date))
+    AND (CAST(:end_date AS date) IS NULL OR day < CAST(:end_date AS date))
+GROUP BY payment_installments
+ORDER BY installment_count;
+
+-- 8. Payment Value Correlation to Method
+SELECT
+    payment_type,
+    payment_installments,
+    SUM(transaction_count) as transaction_count,
+    ROUND(MIN(payment_value_min)::numeric, 2) as min_payment,
+    ROUND((SUM(payment_value_sum) / SUM(transaction_count))::numeric, 2) as avg_payment,
+    ROUND(MAX(payment_value_max)::numeric, 2) as max_payment,
+    ROUND(SQRT(GREATEST(
+        (SUM(payment_value_sq_sum) - SUM(payment_value_sum) * SUM(payment_value_sum) / SUM(transaction_count))
+        / NULLIF(SUM(transaction_count) - 1, 0), 0))::numeric, 2) as std_dev_payment,
+    ROUND(SUM(payment_value_sum)::numeric, 2) as total_value
+FROM rollup_daily_payment
+WHERE (CAST(:start_date AS date) IS NULL OR day >= CAST(:start_date AS date))
+    AND (CAST(:end_date AS date) IS NULL OR day < CAST(:end_date AS date))
+GROUP BY payment_type, payment_installments
+ORDER BY payment_type, payment_installments;
+
+-- 9. Review Score Distribution
+SELECT
+    review_score,
+    SUM(review_count) as review_count,
+    ROUND((SUM(review_count)::numeric / SUM(SUM(review_count)) OVER ()) * 100, 2) as percentage
+FROM rollup_daily_reviews
+WHERE (CAST(:start_date AS date) IS NULL OR day >= CAST(:start_date AS date))
+    AND (CAST(:end_date AS date) IS NULL OR day < CAST(:end_date AS date))
+GROUP BY review_score
+ORDER BY review_score DESC;
+
+-- 10. Repeat Purchase Rate
+-- Over the customers whose first delivered order falls in the date range,
+-- counting all their delivered orders
+SELECT
+    ROUND((COUNT(*) FILTER (WHERE delivered_orders > 1))::numeric / NULLIF(COUNT(*), 0) * 100, 2) as repeat_purchase_rate_percentage
+FROM rollup_customer_orders
+WHERE (CAST(:start_date AS date) IS NULL OR first_order_day >= CAST(:start_date AS date))
+    AND (CAST(:end_date AS date) IS NULL OR first_order_day < CAST(:end_date AS date));
+
+-- 11. New Customers Over Time
+SELECT
+    DATE_TRUNC('month', first_order_day) as order_month,
+    COUNT(*) as new_customers
+FROM rollup_customer_orders
+WHERE (CAST(:start_date AS date) IS NULL OR first_order_day >= CAST(:start_date AS date))
+    AND (CAST(:end_date AS date) IS NULL OR first_order_day < CAST(:end_date AS date))
+GROUP BY DATE_TRUNC('month', first_order_day)
+ORDER BY order_month;